@@ -3,6 +3,7 @@ import { contributorsData } from "./data";
 // Contributors chart variables
 let contributorsChart = null;
 let currentMetric = 'commits';
+let currentGranularity = 'month';
 let timeRange = { start: 0, end: 100 };
 
 // Contributors Chart Functions
@@ -13,6 +14,7 @@ export function initializeContributorsChart() {
     setupContributorsChart();
     setupTimeSliders();
     setupMetricToggle();
+    setupGranularitySelect();
     setupContributorControls();
     populateContributorsList();
     updateChartData(); // Initial chart render after all setup is complete
@@ -106,16 +108,6 @@ function setupContributorsChart() {
 function setupTimeSliders() {
   const startSlider = document.getElementById('startTimeSlider');
   const endSlider = document.getElementById('endTimeSlider');
-  const startLabel = document.getElementById('startTimeLabel');
-  const endLabel = document.getElementById('endTimeLabel');
-
-  function updateTimeLabels() {
-    const startIndex = Math.floor((timeRange.start / 100) * (contributorsData.timePoints.length - 1));
-    const endIndex = Math.floor((timeRange.end / 100) * (contributorsData.timePoints.length - 1));
-
-    startLabel.textContent = contributorsData.timePoints[startIndex];
-    endLabel.textContent = contributorsData.timePoints[endIndex];
-  }
 
   startSlider.addEventListener('input', function () {
     timeRange.start = Math.min(parseInt(this.value), timeRange.end - 1);
@@ -134,6 +126,15 @@ function setupTimeSliders() {
   updateTimeLabels();
 }
 
+function updateTimeLabels() {
+  const { timePoints } = contributorsData.rollups[currentGranularity];
+  const startIndex = Math.floor((timeRange.start / 100) * (timePoints.length - 1));
+  const endIndex = Math.floor((timeRange.end / 100) * (timePoints.length - 1));
+
+  document.getElementById('startTimeLabel').textContent = timePoints[startIndex];
+  document.getElementById('endTimeLabel').textContent = timePoints[endIndex];
+}
+
 function setupMetricToggle() {
   const metricToggle = document.getElementById('metricToggle');
   const currentMetricLabel = document.getElementById('currentMetric');
@@ -150,6 +151,25 @@ function setupMetricToggle() {
   });
 }
 
+function setupGranularitySelect() {
+  const granularitySelect = document.getElementById('contributorsGranularity');
+
+  // Only offer the granularities in the data file; one written without
+  // --rollups only has months, and then the selector is not shown at all
+  for (const option of [...granularitySelect.options]) {
+    if (!(option.value in contributorsData.rollups)) option.remove();
+  }
+  if (granularitySelect.options.length < 2) {
+    granularitySelect.closest('.granularity-control').hidden = true;
+  }
+
+  granularitySelect.addEventListener('change', function () {
+    currentGranularity = this.value;
+    updateTimeLabels();
+    updateChartData();
+  });
+}
+
 function setupContributorControls() {
   const selectAllBtn = document.getElementById('selectAllBtn');
   const deselectAllBtn = document.getElementById('deselectAllBtn');
@@ -209,10 +229,11 @@ function populateContributorsList() {
 function updateChartData() {
   if (!contributorsChart || !contributorsData) return;
 
-  const startIndex = Math.floor((timeRange.start / 100) * (contributorsData.timePoints.length - 1));
-  const endIndex = Math.floor((timeRange.end / 100) * (contributorsData.timePoints.length - 1));
+  const { timePoints: allTimePoints, series } = contributorsData.rollups[currentGranularity];
+  const startIndex = Math.floor((timeRange.start / 100) * (allTimePoints.length - 1));
+  const endIndex = Math.floor((timeRange.end / 100) * (allTimePoints.length - 1));
 
-  const timePoints = contributorsData.timePoints.slice(startIndex, endIndex + 1);
+  const timePoints = allTimePoints.slice(startIndex, endIndex + 1);
   const datasets = [];
 
   // Get selected contributors
@@ -221,7 +242,7 @@ function updateChartData() {
   checkboxes.forEach((checkbox, index) => {
     if (checkbox.checked) {
       const contributor = contributorsData.contributors[index];
-      const data = contributor.data.slice(startIndex, endIndex + 1).map(point => {
+      const data = series[index].slice(startIndex, endIndex + 1).map(point => {
         return currentMetric === 'commits' ? point.commits : point.linesChanged;
       });
 
@@ -1,70 +1,128 @@
-import ref_3_6_4 from "../data/references/3.6.4.csv"
-import ref_3_6_3 from "../data/references/3.6.3.csv"
-import ref_3_6_2 from "../data/references/3.6.2.csv"
-import ref_3_5_2 from "../data/references/3.5.2.csv"
-import ref_3_5_1 from "../data/references/3.5.1.csv"
-import ref_3_5_0 from "../data/references/3.5.0.csv"
-import ref_3_4_3 from "../data/references/3.4.3.csv"
-import ref_3_4_2 from "../data/references/3.4.2.csv"
-import ref_3_4_1 from "../data/references/3.4.1.csv"
-import ref_3_4_0 from "../data/references/3.4.0.csv"
-import ref_3_3_6 from "../data/references/3.3.6.csv"
-import ref_3_3_5 from "../data/references/3.3.5.csv"
-import ref_3_3_4 from "../data/references/3.3.4.csv"
-import ref_3_3_3 from "../data/references/3.3.3.csv"
-import ref_3_3_1 from "../data/references/3.3.1.csv"
-import ref_3_3_0 from "../data/references/3.3.0.csv"
-import ref_3_2_2 from "../data/references/3.2.2.csv"
-import ref_3_2_1 from "../data/references/3.2.1.csv"
-import ref_3_2_0 from "../data/references/3.2.0.csv"
-import ref_3_1_3 from "../data/references/3.1.3.csv"
-import ref_3_1_2 from "../data/references/3.1.2.csv"
-import ref_3_1_1 from "../data/references/3.1.1.csv"
-import ref_3_1_0 from "../data/references/3.1.0.csv"
-import ref_3_0_2 from "../data/references/3.0.2.csv"
-import ref_3_0_1 from "../data/references/3.0.1.csv"
-import ref_3_0_0 from "../data/references/3.0.0.csv"
+import referenceBase from "../data/references/graph/base.json"
+import referenceDeltas from "../data/references/graph/deltas.json"
+import referencePyramid from "../data/references/graph/pyramid.json"
 
 import contributors from "../data/contributors/contributors_data.json"
 
-import visualizationTimeline from "../data/timeline/visualization_timeline.json"
+import visualizationIssues from "../data/timeline/visualization_issues.json"
+import visualizationBacklog from "../data/timeline/visualization_backlog.json"
 
-function transformCSVWithHeaders(rows) {
-    const headers = rows[0];
-    return rows.slice(1).map(row => Object.fromEntries(row.map((cell, index) => [headers[index], cell])))
+// Reference graphs are stored as the oldest version (CSR over a shared node
+// table) plus the added/removed/reweighted edges of every later version, see
+// git-scripts/reference_graph.py. A version is rebuilt the first time it is read.
+function referenceVersions({ nodes, versions, indptr, indices, weights }, deltas) {
+    const key = (from, to) => from * nodes.length + to
+    const states = []
+    const rebuild = i => {
+        if (states[i]) return states[i]
+        let edges
+        if (i === 0) {
+            edges = new Map()
+            for (let from = 0; from + 1 < indptr.length; ++from) {
+                for (let k = indptr[from]; k < indptr[from + 1]; ++k) edges.set(key(from, indices[k]), weights[k])
+            }
+        } else {
+            edges = new Map(rebuild(i - 1))
+            const { added, removed, reweighted } = deltas[versions[i]]
+            for (let k = 0; k < removed.length; k += 2) edges.delete(key(removed[k], removed[k + 1]))
+            for (const changes of [added, reweighted]) {
+                for (let k = 0; k < changes.length; k += 3) edges.set(key(changes[k], changes[k + 1]), changes[k + 2])
+            }
+        }
+        return states[i] = edges
+    }
+    // Same rows as the CSVs: sorted by (from, to), weights as strings
+    const toRows = edges => [...edges.entries()]
+        .sort((a, b) => a[0] - b[0])
+        .map(([k, weight]) => ({
+            from: nodes[Math.floor(k / nodes.length)],
+            to: nodes[k % nodes.length],
+            weight: String(weight)
+        }))
+
+    // Newest version first, like the version selector
+    const references = {}
+    for (let i = versions.length - 1; i >= 0; --i) {
+        let rows
+        Object.defineProperty(references, versions[i], { enumerable: true, get: () => rows ??= toRows(rebuild(i)) })
+    }
+    return references
 }
 
-export const contributorsData = contributors;
+// Edges of the directory tree under `root` collapsed to every directory level,
+// see ReferenceGraphStore.pyramid. Directory ids follow the node table. An
+// edge belongs to the level of its deeper end; it is listed as outgoing of
+// its source if that end is at the edge's level and as incoming of its target
+// if that one is, so a node's edges at its own level are one lookup away.
+// A version is indexed the first time it is read.
+function referenceLevels({ nodes }, { root, dirs, versions }, references) {
+    const paths = nodes.concat(dirs)
+    const ids = new Map(paths.map((path, id) => [path, id]))
+    const depth = paths.map(path => path.split("/").length)
+    const parent = paths.map(path => ids.get(path.slice(0, path.lastIndexOf("/"))))
+    const inRoot = path => path.startsWith(root + "/")
 
-export const timelineData = {
-    visualizationTimeline,
+    const indexes = {}
+    const index = version => {
+        const outgoing = new Map(), incoming = new Map()
+        const add = (from, to, weight) => {
+            const level = Math.max(depth[from], depth[to])
+            if (depth[from] === level) (outgoing.get(from) ?? outgoing.set(from, []).get(from)).push([to, weight])
+            if (depth[to] === level) (incoming.get(to) ?? incoming.set(to, []).get(to)).push([from, weight])
+        }
+        for (const level of versions[version]) {
+            for (let k = 0; k < level.length; k += 3) add(level[k], level[k + 1], level[k + 2])
+        }
+        // Edges between two files are only in the file-level graph
+        for (const { from, to, weight } of references[version]) {
+            if (inRoot(from) && inRoot(to)) add(ids.get(from), ids.get(to), +weight)
+        }
+        return { outgoing, incoming }
+    }
+    return { root, paths, ids, depth, parent, edges: version => indexes[version] ??= index(version) }
+}
+
+// Contributor series may be stored sparsely: only the active months of each
+// contributor, as positions into the shared timePoints with parallel values.
+function expandPoints(timePoints, { index, commits, linesChanged }) {
+    const points = timePoints.map(time => ({ time, commits: 0, linesChanged: 0 }))
+    index.forEach((i, k) => {
+        points[i].commits = commits[k]
+        points[i].linesChanged = linesChanged[k]
+    })
+    return points
 }
 
-export const references = {
-    "3.6.4": transformCSVWithHeaders(ref_3_6_4),
-    "3.6.3": transformCSVWithHeaders(ref_3_6_3),
-    "3.6.2": transformCSVWithHeaders(ref_3_6_2),
-    "3.5.2": transformCSVWithHeaders(ref_3_5_2),
-    "3.5.1": transformCSVWithHeaders(ref_3_5_1),
-    "3.5.0": transformCSVWithHeaders(ref_3_5_0),
-    "3.4.3": transformCSVWithHeaders(ref_3_4_3),
-    "3.4.2": transformCSVWithHeaders(ref_3_4_2),
-    "3.4.1": transformCSVWithHeaders(ref_3_4_1),
-    "3.4.0": transformCSVWithHeaders(ref_3_4_0),
-    "3.3.6": transformCSVWithHeaders(ref_3_3_6),
-    "3.3.5": transformCSVWithHeaders(ref_3_3_5),
-    "3.3.4": transformCSVWithHeaders(ref_3_3_4),
-    "3.3.3": transformCSVWithHeaders(ref_3_3_3),
-    "3.3.1": transformCSVWithHeaders(ref_3_3_1),
-    "3.3.0": transformCSVWithHeaders(ref_3_3_0),
-    "3.2.2": transformCSVWithHeaders(ref_3_2_2),
-    "3.2.1": transformCSVWithHeaders(ref_3_2_1),
-    "3.2.0": transformCSVWithHeaders(ref_3_2_0),
-    "3.1.3": transformCSVWithHeaders(ref_3_1_3),
-    "3.1.2": transformCSVWithHeaders(ref_3_1_2),
-    "3.1.1": transformCSVWithHeaders(ref_3_1_1),
-    "3.1.0": transformCSVWithHeaders(ref_3_1_0),
-    "3.0.2": transformCSVWithHeaders(ref_3_0_2),
-    "3.0.1": transformCSVWithHeaders(ref_3_0_1),
-    "3.0.0": transformCSVWithHeaders(ref_3_0_0),
+function expandSparseContributors(data) {
+    if (data.format !== "sparse") return data
+    const { format, ...rest } = data
+    return {
+        ...rest,
+        contributors: data.contributors.map(({ index, commits, linesChanged, ...contributor }) =>
+            ({ ...contributor, data: expandPoints(data.timePoints, { index, commits, linesChanged }) })),
+    }
 }
+
+// Weekly and quarterly rollups are always sparse, one series per contributor
+// in the order of `contributors`; months are the main series.
+function expandRollups(data) {
+    const rollups = { month: { timePoints: data.timePoints, series: data.contributors.map(c => c.data) } }
+    for (const [granularity, { timePoints, contributors }] of Object.entries(data.rollups ?? {})) {
+        rollups[granularity] = { timePoints, series: contributors.map(points => expandPoints(timePoints, points)) }
+    }
+    return { ...data, rollups }
+}
+
+export const contributorsData = expandRollups(expandSparseContributors(contributors));
+
+export const timelineData = {
+    visualizationIssues,
+    visualizationBacklog,
+}
+
+export const references = referenceVersions(referenceBase, referenceDeltas)
+
+// Every path referenced in any version
+export const referenceNodes = referenceBase.nodes
+
+export const referenceTree = referenceLevels(referenceBase, referencePyramid, references)
@@ -2,7 +2,11 @@ import * as d3 from "d3";
 import * as data from "./data";
 
 export class ScalaFileMap {
-    constructor(rootid) {
+    // With `collapsedAsNodes`, an unchecked directory is drawn as one node
+    // carrying the summed edges of everything below it. Without it (the
+    // default) the graph only has the files of checked directories.
+    constructor(rootid, { collapsedAsNodes = false } = {}) {
+        this.collapsedAsNodes = collapsedAsNodes;
         this.buildPathTree();
         this.version = "3.6.4";
         this.graph = new ForceDirectedGraph(rootid, data.references[this.version]);
@@ -26,9 +30,7 @@ export class ScalaFileMap {
     }
 
     draw() {
-        this.graph.render(
-            this.filteredDataFromPathTree(data.references[this.version])
-        );
+        this.graph.render(this.filteredDataFromPathTree(this.version));
     }
 
     handleVersionChange(newVersion) {
@@ -36,17 +38,80 @@ export class ScalaFileMap {
         this.draw();
     }
 
-    filteredDataFromPathTree(data) {
-        const filterPath = path => {
-            const parts = path.split("/");
-            let current = this.paths;
-            for (let i = 0; i + 1 < parts.length; ++i) {
-                if (!current) return false;
-                current = current.children[parts[i]];
+    // Graph of the currently visible nodes: the files of checked directories
+    // and, with collapsedAsNodes, the collapsed (unchecked) directories directly
+    // inside expanded (checked) ones. Edges come pre-aggregated per directory
+    // level (data.referenceTree), so only the edges of visible nodes are looked
+    // at: every file-level edge is counted once, at the outgoing edges of its
+    // visible source if that is at least as deep as its visible target and at
+    // the incoming edges of its target otherwise.
+    filteredDataFromPathTree(version) {
+        const { paths, depth, edges } = data.referenceTree;
+        const { outgoing, incoming } = edges(version);
+        const { nodes, visible } = this.collapsedAsNodes ? this.visibleTree() : this.visibleFiles();
+
+        const weights = new Map();
+        const add = (from, to, weight) => {
+            const key = from * paths.length + to;
+            weights.set(key, (weights.get(key) ?? 0) + weight);
+        };
+        nodes.forEach(from => (outgoing.get(from) ?? []).forEach(([target, weight]) => {
+            const to = visible(target);
+            if (to !== null && to !== from) add(from, to, weight);
+        }));
+        nodes.forEach(to => (incoming.get(to) ?? []).forEach(([source, weight]) => {
+            const from = visible(source);
+            if (from !== null && depth[from] < depth[to]) add(from, to, weight);
+        }));
+
+        return [...weights.entries()].map(([key, weight]) => ({
+            from: paths[Math.floor(key / paths.length)],
+            to: paths[key % paths.length],
+            weight: String(weight)
+        }));
+    }
+
+    // Files whose directory is checked, each drawn as itself
+    visibleFiles() {
+        const nodes = [...this.dirs.values()].filter(dir => dir.elem.checked).flatMap(dir => dir.files);
+        const shown = new Set(nodes);
+        return { nodes, visible: id => shown.has(id) ? id : null };
+    }
+
+    // Files and collapsed directories inside expanded directories; every path
+    // is drawn as its visible node, or not at all inside an expanded directory
+    visibleTree() {
+        const { parent } = data.referenceTree;
+        const expandedNodes = new Map();
+        const expanded = node => {
+            if (!expandedNodes.has(node)) {
+                expandedNodes.set(node, node.elem.checked && (node.parent === null || expanded(node.parent)));
+            }
+            return expandedNodes.get(node);
+        };
+        // The visible node a path is drawn as, null inside an expanded directory or a collapsed root
+        const visibleNodes = new Map();
+        const visible = id => {
+            if (!visibleNodes.has(id)) {
+                const dir = this.dirs.get(id);
+                const parentNode = parent[id] === undefined ? this.paths : this.dirs.get(parent[id]);
+                let node = null;
+                if (!(dir && expanded(dir))) {
+                    if (expanded(parentNode)) node = id;
+                    else if (parent[id] !== undefined) node = visible(parent[id]);
+                }
+                visibleNodes.set(id, node);
             }
-            return current.elem.checked;
+            return visibleNodes.get(id);
         };
-        return data.filter(({ from, to }) => filterPath(from) && filterPath(to))
+
+        const nodes = [];
+        const collect = node => {
+            Object.values(node.children).forEach(child => expanded(child) ? collect(child) : nodes.push(child.id));
+            nodes.push(...node.files);
+        };
+        if (expanded(this.paths)) collect(this.paths);
+        return { nodes, visible };
     }
 
     renderPathTree() {
@@ -93,26 +158,28 @@ export class ScalaFileMap {
         signal(elem.treeNode.parent);
     }
 
-    // Build a list of paths to form a path tree
+    // Build the directory tree under the reference root; every directory
+    // keeps its id and the ids of the files directly inside it
     buildPathTree() {
-        const makeNode = (parent, part) => ({ name: part, children: {}, parent: parent });
-        const root = makeNode(null, ".");
-        const handlePath = path => {
-            if (!path.startsWith("compiler")) return;
+        const { root: top, ids } = data.referenceTree;
+        const makeNode = (parent, part, path) => ({ name: part, id: ids.get(path), children: {}, files: [], parent: parent });
+        const root = makeNode(null, ".", "");
+        this.dirs = new Map();
+        const handlePath = (path, id) => {
+            if (!path.startsWith(top + "/")) return;
             const parts = path.split("/");
             let current = root;
             for (let i = 0; i + 1 < parts.length; ++i) {
-                current.children[parts[i]] ??= makeNode(current, parts[i]);
+                if (!current.children[parts[i]]) {
+                    const child = current.children[parts[i]] = makeNode(current, parts[i], parts.slice(0, i + 1).join("/"));
+                    this.dirs.set(child.id, child);
+                }
                 current = current.children[parts[i]];
             }
+            current.files.push(id);
         };
         
-        for (const ref of Object.values(data.references)) {
-            for (const { from, to } of ref) {
-                handlePath(from);
-                handlePath(to);
-            }
-        }
+        data.referenceNodes.forEach(handlePath);
         
         this.paths = root;
     }
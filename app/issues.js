@@ -1,39 +1,21 @@
 import { timelineData } from "./data";
 
 /**
- * Load real GitHub Issues data from timeline visualization data
- * Processes timeline events to reconstruct issue lifecycles
- * @returns {Promise<Array>} Real issues data with creation, closure times, and metadata
+ * Load real GitHub Issues data from the per-issue visualization data
+ * (visualization_issues.json: creation date, closing date and labels of every issue)
+ * @returns {Array} Real issues data with creation, closure times, and metadata
  */
 function loadRealIssuesData() {
-  const timeline = timelineData.visualizationTimeline;
-
-  // Group timeline events by issue number
-  const issueMap = new Map();
-
-  timeline.forEach(event => {
-    const number = event.number;
-    if (!issueMap.has(number)) {
-      issueMap.set(number, {
-        number: number,
-        events: [],
-        labels: new Set()
-      });
-    }
-
-    const issue = issueMap.get(number);
-    issue.events.push(event);
-
-    // Collect all labels that were ever associated with this issue
-    if (event.labels) {
-      event.labels.forEach(label => issue.labels.add(label));
-    }
-  });
+  const { labels, number, created, closed, issueLabels } = timelineData.visualizationIssues;
 
-  // Convert to issue objects
   const allIssues = [];
-  issueMap.forEach((issueData, number) => {
-    const processedIssue = processTimelineIssue(issueData);
+  number.forEach((issueNumber, i) => {
+    const processedIssue = processTimelineIssue({
+      number: issueNumber,
+      created: created[i],
+      closed: closed[i],
+      labels: issueLabels[i].map(id => labels[id])
+    });
     if (processedIssue) {
       allIssues.push(processedIssue);
     }
@@ -43,25 +25,20 @@ function loadRealIssuesData() {
 }
 
 /**
- * Process timeline data for a single issue
- * Reconstructs issue lifecycle from timeline events
- * @param {Object} issueData - Issue data with events and labels
+ * Process the data of a single issue
+ * @param {Object} issueData - Issue number, creation and closing dates and labels
  * @returns {Object} Processed issue data for visualization
  */
 function processTimelineIssue(issueData) {
-  const { number, events, labels } = issueData;
-
-  // Find creation and closure events
-  const createdEvent = events.find(e => e.type === 'created');
-  const closedEvent = events.find(e => e.type === 'closed');
+  const { number, created, closed, labels: labelsArray } = issueData;
 
-  if (!createdEvent) {
-    // Skip issues without creation event
+  if (!created) {
+    // Skip issues without creation date
     return null;
   }
 
-  const createdAt = new Date(createdEvent.date);
-  const closedAt = closedEvent ? new Date(closedEvent.date) : null;
+  const createdAt = new Date(created);
+  const closedAt = closed ? new Date(closed) : null;
   const isOpen = !closedAt;
 
   // Calculate duration for closed issues
@@ -74,7 +51,6 @@ function processTimelineIssue(issueData) {
   }
 
   // Determine issue type and color based on labels
-  const labelsArray = Array.from(labels);
   const { type, color } = determineIssueType(labelsArray);
 
   return {
@@ -1,9 +1,17 @@
 const { timelineData } = require("./data");
 
+const PERIOD_NAMES = {
+    day: 'daily',
+    week: 'weekly',
+    month: 'monthly',
+    quarter: 'quarterly',
+    year: 'yearly'
+};
+
 // Timeline visualization for issues status over time
 export class TimelineVisualization {
     constructor() {
-        this.timelineData = [];
+        this.backlog = null;
         this.chart = null;
         this.aggregation = 'month';
         this.showTotalIssues = true;
@@ -13,7 +21,7 @@ export class TimelineVisualization {
     }
 
     loadData() {
-        this.timelineData = timelineData.visualizationTimeline;
+        this.backlog = timelineData.visualizationBacklog;
         this.processTimelineData();
     }
 
@@ -38,92 +46,39 @@ export class TimelineVisualization {
     }
 
     processTimelineData() {
-        if (!this.timelineData || this.timelineData.length === 0) {
+        const series = this.backlog && this.backlog.series[this.aggregation];
+        if (!series || series.periods.length === 0) {
             return;
         }
 
-        // Sort data by date
-        const sortedData = [...this.timelineData].sort((a, b) => new Date(a.date) - new Date(b.date));
-
-        // Track issue states over time
-        const issueStates = new Map(); // issue number -> current state
-        const timelineMap = new Map(); // date -> {open, closed, totalOpen, totalClosed}
-
-        // Process each event
-        sortedData.forEach(event => {
-            const date = new Date(event.date);
-            const periodKey = this.getPeriodKey(date);
-
-            if (!timelineMap.has(periodKey)) {
-                timelineMap.set(periodKey, {
-                    date: periodKey,
-                    created: 0,
-                    closed: 0,
-                    totalOpen: 0,
-                    totalClosed: 0
-                });
-            }
-
-            const periodData = timelineMap.get(periodKey);
-
-            if (event.type === 'created') {
-                issueStates.set(event.number, 'open');
-                periodData.created++;
-            } else if (event.type === 'closed') {
-                issueStates.set(event.number, 'closed');
-                periodData.closed++;
-            }
-        });
-
-        // Calculate cumulative counts and percentages
-        let cumulativeOpen = 0;
+        // Created/closed counts and the open backlog per period are computed
+        // by analyze_data.py; only running totals and percentages are left
         let cumulativeClosed = 0;
 
-        const processedData = Array.from(timelineMap.values())
-            .sort((a, b) => new Date(a.date) - new Date(b.date))
-            .map(period => {
-                cumulativeOpen += period.created - period.closed;
-                cumulativeClosed += period.closed;
-
-                // Ensure we don't have negative open issues
-                if (cumulativeOpen < 0) cumulativeOpen = 0;
-
-                const totalIssues = cumulativeOpen + cumulativeClosed;
-                const openPercentage = totalIssues > 0 ? (cumulativeOpen / totalIssues) * 100 : 0;
-                const closedPercentage = totalIssues > 0 ? (cumulativeClosed / totalIssues) * 100 : 0;
-
-                return {
-                    ...period,
-                    cumulativeOpen,
-                    cumulativeClosed,
-                    totalIssues,
-                    openPercentage,
-                    closedPercentage
-                };
-            });
+        this.aggregatedData = series.periods.map((date, i) => {
+            const cumulativeOpen = series.open[i];
+            cumulativeClosed += series.closed[i];
+
+            const totalIssues = cumulativeOpen + cumulativeClosed;
+            const openPercentage = totalIssues > 0 ? (cumulativeOpen / totalIssues) * 100 : 0;
+            const closedPercentage = totalIssues > 0 ? (cumulativeClosed / totalIssues) * 100 : 0;
+
+            return {
+                date,
+                created: series.created[i],
+                closed: series.closed[i],
+                cumulativeOpen,
+                cumulativeClosed,
+                totalIssues,
+                openPercentage,
+                closedPercentage
+            };
+        });
 
-        this.aggregatedData = processedData;
         this.updateChart();
         this.updateStatistics();
     }
 
-    getPeriodKey(date) {
-        const year = date.getFullYear();
-        const month = date.getMonth();
-
-        switch (this.aggregation) {
-            case 'month':
-                return `${year}-${String(month + 1).padStart(2, '0')}`;
-            case 'quarter':
-                const quarter = Math.floor(month / 3) + 1;
-                return `${year}-Q${quarter}`;
-            case 'year':
-                return `${year}`;
-            default:
-                return `${year}-${String(month + 1).padStart(2, '0')}`;
-        }
-    }
-
     updateChart() {
         if (!this.aggregatedData || this.aggregatedData.length === 0) {
             return;
@@ -225,7 +180,7 @@ export class TimelineVisualization {
                 plugins: {
                     title: {
                         display: true,
-                        text: `Issues Status Over Time (${this.aggregation}ly)`
+                        text: `Issues Status Over Time (${PERIOD_NAMES[this.aggregation]})`
                     },
                     legend: {
                         display: true,
@@ -255,8 +210,8 @@ export class TimelineVisualization {
         }
 
         const latest = this.aggregatedData[this.aggregatedData.length - 1];
-        const totalCreated = this.timelineData.filter(d => d.type === 'created').length;
-        const totalClosed = this.timelineData.filter(d => d.type === 'closed').length;
+        const totalCreated = this.aggregatedData.reduce((sum, d) => sum + d.created, 0);
+        const totalClosed = this.aggregatedData.reduce((sum, d) => sum + d.closed, 0);
 
         // Calculate peak open issues
         const peakOpen = Math.max(...this.aggregatedData.map(d => d.cumulativeOpen));
@@ -4,287 +4,692 @@ Data Explorer for Scala 3 GitHub Data
 Analyzes the fetched data and provides insights for visualization.
 """
 
+import argparse
 import json
 import os
-from datetime import datetime
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
 from collections import Counter, defaultdict
-from typing import Dict, List, Any
+from itertools import chain
+from typing import Dict, List, Any, Iterable
+
+from fetch_github_data import find_dataset, read_dataset, iter_dataset, read_dataset_key
+import issue_columns
+from issue_columns import IssueColumnsBuilder
+from instrumentation import add_profile_argument, phase, start_profile
+from label_index import LabelIndex
+
+DATASETS = {
+    "repo_info": "scala3_repo_info.json",
+    "open_issues": "scala3_open_issues.json",
+    "closed_issues": "scala3_closed_issues.json",
+    "open_prs": "scala3_open_prs.json",
+    "closed_prs": "scala3_closed_prs.json",
+    "contributors": "scala3_contributors.json",
+    "releases": "scala3_releases.json",
+    "labels": "scala3_labels.json",
+    "data_summary": "scala3_data_summary.json"
+}
+
+ISSUES = [("open_issues", "issues"), ("closed_issues", "issues")]
+PRS = [("open_prs", None), ("closed_prs", None)]
+LABEL_CATEGORIES = ['area', 'itype', 'stat', 'cc']
+
+class RecordCounter:
+    def __init__(self):
+        self.count = 0
+    
+    def add(self, record: Dict):
+        self.count += 1
+    
+    def result(self) -> int:
+        return self.count
+
+class MonthlyCounter:
+    """Count records per YYYY-MM month of a date field."""
+    
+    def __init__(self, field: str):
+        self.field = field
+        self.counts = defaultdict(int)
+    
+    def add(self, record: Dict):
+        if record.get(self.field):
+            self.counts[record[self.field][:7]] += 1
+    
+    def result(self) -> Dict[str, int]:
+        return self.counts
+
+class ValueCounter:
+    """Count the values `values(record)` returns for every record, in first-seen order."""
+    
+    def __init__(self, values):
+        self.values = values
+        self.counts = Counter()
+    
+    def add(self, record: Dict):
+        self.counts.update(self.values(record))
+    
+    def result(self) -> Counter:
+        return self.counts
+
+class RecordCollector:
+    """Keep (at most `limit`) records as they are scanned."""
+    
+    def __init__(self, transform=None, limit: int = None):
+        self.transform = transform
+        self.limit = limit
+        self.records = []
+    
+    def add(self, record: Dict):
+        if self.limit is None or len(self.records) < self.limit:
+            self.records.append(self.transform(record) if self.transform else record)
+    
+    def result(self) -> List[Any]:
+        return self.records
+
+class TimelineEvents:
+    """Collect the created/closed events of issues."""
+    
+    def __init__(self):
+        self.events = []
+    
+    def add(self, issue: Dict):
+        for event_type in ('created', 'closed'):
+            date = issue.get(f'{event_type}_at')
+            if date:
+                self.events.append({
+                    'date': date[:10],
+                    'type': event_type,
+                    'state': issue.get('state', 'unknown'),
+                    'number': issue.get('number'),
+                    'labels': issue.get('labels', [])
+                })
+    
+    def result(self) -> List[Dict]:
+        # Sort by date
+        return sorted(self.events, key=lambda x: x['date'])
+
+class IssueSpans:
+    """Creation date, closing date and labels of every issue, in parallel arrays.
+    
+    This is what the issues page rebuilds from the timeline events, without
+    the per-event copies of the labels.
+    """
+    
+    def __init__(self):
+        self.issues = {}
+    
+    def add(self, issue: Dict):
+        number = issue.get('number')
+        created, closed = ((issue.get(f'{event_type}_at') or '')[:10] or None for event_type in ('created', 'closed'))
+        if number in self.issues:
+            # An issue listed twice keeps its earliest dates and all of its labels, like the timeline replay
+            known_created, known_closed, labels = self.issues[number]
+            created = min(filter(None, (created, known_created)), default=None)
+            closed = min(filter(None, (closed, known_closed)), default=None)
+            labels.update(dict.fromkeys(issue.get('labels', [])))
+        else:
+            labels = dict.fromkeys(issue.get('labels', []))
+        self.issues[number] = (created, closed, labels)
+    
+    def result(self) -> Dict:
+        label_names = sorted({label for _, _, labels in self.issues.values() for label in labels})
+        label_ids = {label: i for i, label in enumerate(label_names)}
+        numbers = sorted(self.issues, key=lambda number: (self.issues[number][0] or '', number))
+        return {
+            'labels': label_names,
+            'number': numbers,
+            'created': [self.issues[number][0] for number in numbers],
+            'closed': [self.issues[number][1] for number in numbers],
+            'issueLabels': [[label_ids[label] for label in self.issues[number][2]] for number in numbers]
+        }
+
+BACKLOG_PERIODS = {
+    'day': lambda day: day.isoformat(),
+    'week': lambda day: (day - timedelta(days=day.weekday())).isoformat(),  # Monday of the week
+    'month': lambda day: f"{day.year}-{day.month:02d}",
+    'quarter': lambda day: f"{day.year}-Q{(day.month - 1) // 3 + 1}",
+    'year': lambda day: str(day.year)
+}
+
+def backlog_series(created: Dict[str, int], closed: Dict[str, int], first: date, last: date,
+                   period: str) -> Dict[str, List]:
+    """Sweep daily created/closed counts from `first` to `last` into contiguous periods.
+    
+    Every period gets its created and closed counts and the open backlog at
+    its end; periods without events carry the backlog forward.
+    """
+    period_key = BACKLOG_PERIODS[period]
+    series = {'periods': [], 'created': [], 'closed': [], 'open': []}
+    backlog = 0
+    day = first
+    while day <= last:
+        key = period_key(day)
+        if not series['periods'] or series['periods'][-1] != key:
+            for name, value in (('periods', key), ('created', 0), ('closed', 0), ('open', backlog)):
+                series[name].append(value)
+        iso_day = day.isoformat()
+        series['created'][-1] += created.get(iso_day, 0)
+        series['closed'][-1] += closed.get(iso_day, 0)
+        backlog = max(0, backlog + created.get(iso_day, 0) - closed.get(iso_day, 0))
+        series['open'][-1] = backlog
+        day += timedelta(days=1)
+    return series
+
+class BacklogSeries:
+    """Daily created/closed issue counts, overall and per label, rolled up into backlog series."""
+    
+    def __init__(self, periods: List[str] = ('day', 'week', 'month', 'quarter', 'year'),
+                 label_periods: List[str] = ()):
+        self.periods = periods
+        self.label_periods = label_periods
+        self.created = Counter()
+        self.closed = Counter()
+        self.label_created = defaultdict(Counter)
+        self.label_closed = defaultdict(Counter)
+    
+    def add(self, issue: Dict):
+        for counts, label_counts, field in ((self.created, self.label_created, 'created_at'),
+                                            (self.closed, self.label_closed, 'closed_at')):
+            if issue.get(field):
+                day = issue[field][:10]
+                counts[day] += 1
+                if self.label_periods:
+                    for label in issue.get('labels', []):
+                        label_counts[label][day] += 1
+    
+    def result(self) -> Dict:
+        days = sorted(set(self.created) | set(self.closed))
+        if not days:
+            return {'start': None, 'end': None, 'series': {}, 'labels': {}}
+        first, last = date.fromisoformat(days[0]), date.fromisoformat(days[-1])
+        labels = sorted(set(self.label_created) | set(self.label_closed))
+        return {
+            'start': days[0],
+            'end': days[-1],
+            'series': {
+                period: backlog_series(self.created, self.closed, first, last, period)
+                for period in self.periods
+            },
+            # Per-label series share the periods of the overall series
+            'labels': {
+                period: {
+                    label: {
+                        name: values
+                        for name, values in backlog_series(
+                            self.label_created[label], self.label_closed[label], first, last, period
+                        ).items()
+                        if name != 'periods'
+                    }
+                    for label in labels
+                }
+                for period in self.label_periods
+            }
+        }
+
+class AggregationEngine:
+    """Feed every registered accumulator from a single scan of each dataset.
+    
+    An accumulator is any object with `add(record)`, called for each record
+    of the datasets it is registered for, and `result()`, read after the scan.
+    """
+    
+    def __init__(self, explorer: "DataExplorer"):
+        self.explorer = explorer
+        self.scans = {}
+        self.shared = {}
+        self.startup = 0.0
+    
+    def register(self, datasets: List[tuple], accumulator: Any) -> Any:
+        """Subscribe `accumulator` to the records of each (dataset, field) in `datasets`."""
+        for dataset in datasets:
+            self.scans.setdefault(dataset, []).append(accumulator)
+        return accumulator
+    
+    def register_shared(self, name: str, datasets: List[tuple], factory) -> Any:
+        """Register the accumulator `name` once and hand the same instance to every analysis asking for it."""
+        if name not in self.shared:
+            self.shared[name] = self.register(datasets, factory())
+        return self.shared[name]
+    
+    def scan(self, dataset: tuple):
+        """Feed one dataset to its accumulators; the time until its first record is added to `startup`."""
+        key, field = dataset
+        accumulators = self.scans[dataset]
+        start = time.perf_counter()
+        records = iter(self.explorer.records(key, field))
+        first = next(records, None)
+        self.startup += time.perf_counter() - start
+        if first is None:
+            return
+        for record in chain([first], records):
+            for accumulator in accumulators:
+                accumulator.add(record)
+    
+    def run(self):
+        for dataset in self.scans:
+            self.scan(dataset)
+
+ANALYSES = {
+    "timeline": "issues_timeline_analysis",
+    "labels": "labels_analysis",
+    "contributors": "contributors_analysis",
+    "releases": "releases_analysis",
+    "prs": "pull_requests_analysis",
+    "resolution": "resolution_analysis",
+    "visualization": "visualization_data_analysis"
+}
 
 class DataExplorer:
-    def __init__(self, data_dir: str = "app"):
+    def __init__(self, data_dir: str = "app", stream: bool = False, columnar: bool = False,
+                 backlog_label_periods: List[str] = ()):
         self.data_dir = data_dir
+        self.stream = stream
+        self.columnar = columnar
+        self.backlog_label_periods = backlog_label_periods
         self.data = {}
-        self.load_all_data()
+    
+    def dataset_path(self, key: str):
+        # Raw datasets may also be stored as (gzip/xz compressed) NDJSON
+        return find_dataset(os.path.join(self.data_dir, DATASETS[key]))
+    
+    def load_dataset(self, key: str) -> Any:
+        """Parse one data file, or return None when it is missing or unreadable."""
+        filepath = self.dataset_path(key)
+        if not filepath:
+            print(f"✗ File not found: {DATASETS[key]}")
+            return None
+        try:
+            data = read_dataset(filepath)
+            print(f"✓ Loaded {os.path.basename(filepath)}")
+            return data
+        except Exception as e:
+            print(f"✗ Error loading {os.path.basename(filepath)}: {e}")
+            return None
+    
+    def dataset(self, key: str, default: Any = None) -> Any:
+        """Return a dataset, parsing its file on first access."""
+        if key not in self.data:
+            self.data[key] = self.load_dataset(key)
+        return default if self.data[key] is None else self.data[key]
     
     def load_all_data(self):
         """Load all JSON data files."""
-        files_to_load = [
-            "scala3_repo_info.json",
-            "scala3_open_issues.json",
-            "scala3_closed_issues.json",
-            "scala3_open_prs.json",
-            "scala3_closed_prs.json",
-            "scala3_contributors.json",
-            "scala3_releases.json",
-            "scala3_labels.json",
-            "scala3_data_summary.json"
-        ]
-        
-        for filename in files_to_load:
-            filepath = os.path.join(self.data_dir, filename)
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        key = filename.replace('scala3_', '').replace('.json', '')
-                        self.data[key] = json.load(f)
-                    print(f"✓ Loaded {filename}")
-                except Exception as e:
-                    print(f"✗ Error loading {filename}: {e}")
-            else:
-                print(f"✗ File not found: {filename}")
+        for key in DATASETS:
+            self.dataset(key)
     
-    def analyze_issues_timeline(self):
+    def records(self, key: str, field: str = None) -> Iterable[Dict]:
+        """Iterate over the records of a dataset (or over its `field` list).
+        
+        In streaming mode uncached files are decoded record by record instead
+        of being loaded, so large issue and PR files are never held in memory.
+        """
+        if self.stream and key not in self.data:
+            filepath = self.dataset_path(key)
+            return iter_dataset(filepath, field) if filepath else iter(())
+        data = self.dataset(key, {} if field else [])
+        return data.get(field, []) if field else data
+    
+    def dataset_field(self, key: str, field: str, default: Any = None) -> Any:
+        """Return one top-level field of a dataset stored as a JSON object."""
+        if self.stream and key not in self.data:
+            filepath = self.dataset_path(key)
+            if not filepath:
+                return default
+            return read_dataset_key(filepath, field, default)
+        return self.dataset(key, {}).get(field, default)
+    
+    def issues_timeline_analysis(self, engine: AggregationEngine):
         """Analyze issues creation timeline."""
-        print("\n" + "="*60)
-        print("ISSUES TIMELINE ANALYSIS")
-        print("="*60)
-        
-        open_issues = self.data.get('open_issues', {}).get('issues', [])
-        closed_issues = self.data.get('closed_issues', {}).get('issues', [])
-        
-        all_issues = open_issues + closed_issues
-        
+        open_count = engine.register(ISSUES[:1], RecordCounter())
+        closed_count = engine.register(ISSUES[1:], RecordCounter())
         # Monthly creation stats
-        monthly_created = defaultdict(int)
-        monthly_closed = defaultdict(int)
-        
-        for issue in all_issues:
-            if issue.get('created_at'):
-                month = issue['created_at'][:7]  # YYYY-MM
-                monthly_created[month] += 1
+        if self.columnar:
+            columns = engine.register_shared('issue_columns', ISSUES, IssueColumnsBuilder)
+            monthly = lambda: (columns.result().monthly_created(), columns.result().monthly_closed())
+        else:
+            created_counter = engine.register(ISSUES, MonthlyCounter('created_at'))
+            closed_counter = engine.register(ISSUES, MonthlyCounter('closed_at'))
+            monthly = lambda: (created_counter.result(), closed_counter.result())
+        
+        def report():
+            print("\n" + "="*60)
+            print("ISSUES TIMELINE ANALYSIS")
+            print("="*60)
             
-            if issue.get('closed_at'):
-                month = issue['closed_at'][:7]  # YYYY-MM
-                monthly_closed[month] += 1
-        
-        print(f"Total issues analyzed: {len(all_issues)}")
-        print(f"Open issues: {len(open_issues)}")
-        print(f"Closed issues: {len(closed_issues)}")
-        
-        # Recent months activity
-        recent_months = sorted(monthly_created.keys())[-12:]
-        print(f"\nRecent 12 months activity:")
-        for month in recent_months:
-            created = monthly_created[month]
-            closed = monthly_closed[month]
-            print(f"  {month}: {created:3d} created, {closed:3d} closed")
+            print(f"Total issues analyzed: {open_count.result() + closed_count.result()}")
+            print(f"Open issues: {open_count.result()}")
+            print(f"Closed issues: {closed_count.result()}")
+            
+            # Recent months activity
+            created_counts, closed_counts = monthly()
+            recent_months = sorted(created_counts.keys())[-12:]
+            print(f"\nRecent 12 months activity:")
+            for month in recent_months:
+                created = created_counts[month]
+                closed = closed_counts.get(month, 0)
+                print(f"  {month}: {created:3d} created, {closed:3d} closed")
+        return report
     
-    def analyze_labels(self):
+    def labels_analysis(self, engine: AggregationEngine):
         """Analyze issue labels."""
-        print("\n" + "="*60)
-        print("LABELS ANALYSIS")
-        print("="*60)
-        
-        open_issues = self.data.get('open_issues', {}).get('issues', [])
-        closed_issues = self.data.get('closed_issues', {}).get('issues', [])
-        
-        all_labels = []
-        for issue in open_issues + closed_issues:
-            all_labels.extend(issue.get('labels', []))
-        
-        label_counts = Counter(all_labels)
+        index = engine.register_shared('label_index', ISSUES, LabelIndex)
         
-        print(f"Total unique labels: {len(label_counts)}")
-        print(f"Most common labels:")
-        for label, count in label_counts.most_common(15):
-            print(f"  {label:30} {count:4d}")
-        
-        # Category analysis
-        categories = {
-            'area': [l for l in label_counts.keys() if l.startswith('area:')],
-            'itype': [l for l in label_counts.keys() if l.startswith('itype:')],
-            'stat': [l for l in label_counts.keys() if l.startswith('stat:')],
-            'cc': [l for l in label_counts.keys() if l.startswith('cc:')]
-        }
-        
-        print(f"\nLabel categories:")
-        for category, labels in categories.items():
-            print(f"  {category}: {len(labels)} labels")
+        def report():
+            print("\n" + "="*60)
+            print("LABELS ANALYSIS")
+            print("="*60)
+            
+            label_counts = index.result().totals()
+            
+            print(f"Total unique labels: {len(label_counts)}")
+            print(f"Most common labels:")
+            for label, count in label_counts.most_common(15):
+                print(f"  {label:30} {count:4d}")
+            
+            # Category analysis
+            rollup = index.result().category_rollup()
+            print(f"\nLabel categories:")
+            for category in LABEL_CATEGORIES:
+                totals = rollup.get(category, {'labels': 0, 'issues': 0})
+                print(f"  {category}: {totals['labels']} labels on {totals['issues']} issues")
+            
+            print(f"\nMost frequent label pairs:")
+            for first, second, count in index.result().top_pairs(10):
+                print(f"  {first + ' + ' + second:50} {count:4d}")
+        return report
     
-    def analyze_contributors(self):
+    def contributors_analysis(self, engine: AggregationEngine):
         """Analyze contributors data."""
-        print("\n" + "="*60)
-        print("CONTRIBUTORS ANALYSIS")
-        print("="*60)
+        collected = engine.register([("contributors", None)], RecordCollector())
         
-        contributors = self.data.get('contributors', [])
-        
-        if not contributors:
-            print("No contributors data available")
-            return
-        
-        print(f"Total contributors: {len(contributors)}")
-        
-        # Top contributors by commits
-        top_contributors = sorted(contributors, key=lambda x: x.get('contributions', 0), reverse=True)[:10]
-        print(f"\nTop 10 contributors by commits:")
-        for i, contributor in enumerate(top_contributors, 1):
-            login = contributor.get('login', 'unknown')
-            contributions = contributor.get('contributions', 0)
-            print(f"  {i:2d}. {login:20} {contributions:4d} commits")
-        
-        # Contribution distribution
-        contributions = [c.get('contributions', 0) for c in contributors]
-        total_contributions = sum(contributions)
-        print(f"\nContribution statistics:")
-        print(f"  Total commits: {total_contributions}")
-        print(f"  Average per contributor: {total_contributions / len(contributors):.1f}")
-        print(f"  Median contributions: {sorted(contributions)[len(contributions)//2]}")
+        def report():
+            print("\n" + "="*60)
+            print("CONTRIBUTORS ANALYSIS")
+            print("="*60)
+            
+            contributors = collected.result()
+            
+            if not contributors:
+                print("No contributors data available")
+                return
+            
+            print(f"Total contributors: {len(contributors)}")
+            
+            # Top contributors by commits
+            top_contributors = sorted(contributors, key=lambda x: x.get('contributions', 0), reverse=True)[:10]
+            print(f"\nTop 10 contributors by commits:")
+            for i, contributor in enumerate(top_contributors, 1):
+                login = contributor.get('login', 'unknown')
+                contributions = contributor.get('contributions', 0)
+                print(f"  {i:2d}. {login:20} {contributions:4d} commits")
+            
+            # Contribution distribution
+            contributions = [c.get('contributions', 0) for c in contributors]
+            total_contributions = sum(contributions)
+            print(f"\nContribution statistics:")
+            print(f"  Total commits: {total_contributions}")
+            print(f"  Average per contributor: {total_contributions / len(contributors):.1f}")
+            print(f"  Median contributions: {sorted(contributions)[len(contributions)//2]}")
+        return report
     
-    def analyze_releases(self):
+    def releases_analysis(self, engine: AggregationEngine):
         """Analyze releases data."""
-        print("\n" + "="*60)
-        print("RELEASES ANALYSIS")
-        print("="*60)
-        
-        releases = self.data.get('releases', [])
-        
-        if not releases:
-            print("No releases data available")
-            return
+        collected = engine.register([("releases", None)], RecordCollector())
         
-        print(f"Total releases: {len(releases)}")
-        
-        # Recent releases
-        recent_releases = sorted(releases, key=lambda x: x.get('published_at', ''), reverse=True)[:10]
-        print(f"\nRecent 10 releases:")
-        for release in recent_releases:
-            name = release.get('name', release.get('tag_name', 'Unknown'))
-            published = release.get('published_at', 'Unknown')[:10]  # YYYY-MM-DD
-            prerelease = " (pre)" if release.get('prerelease') else ""
-            print(f"  {name:20} {published}{prerelease}")
-        
-        # Release frequency
-        yearly_releases = defaultdict(int)
-        for release in releases:
-            if release.get('published_at'):
-                year = release['published_at'][:4]
-                yearly_releases[year] += 1
-        
-        print(f"\nReleases by year:")
-        for year in sorted(yearly_releases.keys()):
-            print(f"  {year}: {yearly_releases[year]} releases")
+        def report():
+            print("\n" + "="*60)
+            print("RELEASES ANALYSIS")
+            print("="*60)
+            
+            releases = collected.result()
+            
+            if not releases:
+                print("No releases data available")
+                return
+            
+            print(f"Total releases: {len(releases)}")
+            
+            # Recent releases
+            recent_releases = sorted(releases, key=lambda x: x.get('published_at', ''), reverse=True)[:10]
+            print(f"\nRecent 10 releases:")
+            for release in recent_releases:
+                name = release.get('name', release.get('tag_name', 'Unknown'))
+                published = release.get('published_at', 'Unknown')[:10]  # YYYY-MM-DD
+                prerelease = " (pre)" if release.get('prerelease') else ""
+                print(f"  {name:20} {published}{prerelease}")
+            
+            # Release frequency
+            yearly_releases = defaultdict(int)
+            for release in releases:
+                if release.get('published_at'):
+                    year = release['published_at'][:4]
+                    yearly_releases[year] += 1
+            
+            print(f"\nReleases by year:")
+            for year in sorted(yearly_releases.keys()):
+                print(f"  {year}: {yearly_releases[year]} releases")
+        return report
     
-    def analyze_pull_requests(self):
+    def pull_requests_analysis(self, engine: AggregationEngine):
         """Analyze pull requests data."""
-        print("\n" + "="*60)
-        print("PULL REQUESTS ANALYSIS")
-        print("="*60)
-        
-        open_prs = self.data.get('open_prs', [])
-        closed_prs = self.data.get('closed_prs', [])
-        
-        print(f"Open PRs: {len(open_prs)}")
-        print(f"Recently closed PRs: {len(closed_prs)}")
-        
+        open_count = engine.register(PRS[:1], RecordCounter())
+        closed_count = engine.register(PRS[1:], RecordCounter())
         # PR authors
-        all_authors = []
-        for pr in open_prs + closed_prs:
-            author = pr.get('user', {}).get('login')
-            if author:
-                all_authors.append(author)
-        
-        author_counts = Counter(all_authors)
-        print(f"\nTop PR authors:")
-        for author, count in author_counts.most_common(10):
-            print(f"  {author:20} {count:3d} PRs")
+        if self.columnar:
+            columns = engine.register_shared('pr_columns', PRS, IssueColumnsBuilder)
+            top_authors = lambda: [
+                (author, count)
+                for author, count in columns.result().ranked(columns.result().author_counts(),
+                                                            columns.result().author_names)
+                if author is not None
+            ][:10]
+        else:
+            authors = engine.register(PRS, ValueCounter(
+                lambda pr: [login] if (login := (pr.get('user') or {}).get('login')) else []))
+            top_authors = lambda: authors.result().most_common(10)
+        
+        def report():
+            print("\n" + "="*60)
+            print("PULL REQUESTS ANALYSIS")
+            print("="*60)
+            
+            print(f"Open PRs: {open_count.result()}")
+            print(f"Recently closed PRs: {closed_count.result()}")
+            
+            print(f"\nTop PR authors:")
+            for author, count in top_authors():
+                print(f"  {author:20} {count:3d} PRs")
+        return report
     
-    def generate_visualization_data(self):
-        """Generate processed data files for visualization."""
-        print("\n" + "="*60)
-        print("GENERATING VISUALIZATION DATA")
-        print("="*60)
-        
-        # Issues timeline data
-        open_issues = self.data.get('open_issues', {}).get('issues', [])
-        closed_issues = self.data.get('closed_issues', {}).get('issues', [])
-        
-        timeline_data = []
-        for issue in open_issues + closed_issues:
-            if issue.get('created_at'):
-                timeline_data.append({
-                    'date': issue['created_at'][:10],
-                    'type': 'created',
-                    'state': issue.get('state', 'unknown'),
-                    'number': issue.get('number'),
-                    'labels': issue.get('labels', [])
-                })
+    def resolution_analysis(self, engine: AggregationEngine):
+        """Analyze how long issues take to close, overall and per label (columnar backend only)."""
+        columns = None
+        if issue_columns.available():
+            columns = engine.register_shared('issue_columns', ISSUES, IssueColumnsBuilder)
+        
+        def report():
+            print("\n" + "="*60)
+            print("ISSUE RESOLUTION ANALYSIS")
+            print("="*60)
             
-            if issue.get('closed_at'):
-                timeline_data.append({
-                    'date': issue['closed_at'][:10],
-                    'type': 'closed',
-                    'state': issue.get('state', 'unknown'),
-                    'number': issue.get('number'),
-                    'labels': issue.get('labels', [])
-                })
-        
-        # Sort by date
-        timeline_data.sort(key=lambda x: x['date'])
-        
-        # Save timeline data
-        timeline_file = os.path.join(self.data_dir, 'visualization_timeline.json')
-        with open(timeline_file, 'w', encoding='utf-8') as f:
-            json.dump(timeline_data, f, indent=2)
-        print(f"✓ Generated {timeline_file}")
-        
-        # Labels summary
-        labels_summary = self.data.get('open_issues', {}).get('labels_stats', {})
-        labels_summary.update(self.data.get('closed_issues', {}).get('labels_stats', {}))
-        
-        labels_file = os.path.join(self.data_dir, 'visualization_labels.json')
-        with open(labels_file, 'w', encoding='utf-8') as f:
-            json.dump(labels_summary, f, indent=2)
-        print(f"✓ Generated {labels_file}")
-        
+            if columns is None:
+                print("NumPy is required for the resolution analysis")
+                return
+            
+            percentiles = columns.result().close_time_percentiles()
+            if not percentiles:
+                print("No closed issues available")
+                return
+            
+            print(f"Days to close:")
+            for percentile, days in percentiles.items():
+                print(f"  p{percentile:<3d} {days:8.1f}")
+            
+            breakdown = sorted(columns.result().label_breakdown(), key=lambda x: x['count'], reverse=True)
+            print(f"\nMost common labels:")
+            print(f"  {'Label':30} {'Issues':>6} {'Closed':>6} {'Median days':>11}")
+            for entry in breakdown[:15]:
+                median = f"{entry['days_to_close']:11.1f}" if entry['days_to_close'] is not None else f"{'-':>11}"
+                print(f"  {entry['label']:30} {entry['count']:6d} {entry['closed']:6d} {median}")
+        return report
+    
+    def visualization_data_analysis(self, engine: AggregationEngine):
+        """Generate processed data files for visualization."""
+        timeline = engine.register(ISSUES, TimelineEvents())
+        spans = engine.register(ISSUES, IssueSpans())
+        backlog = engine.register(ISSUES, BacklogSeries(label_periods=self.backlog_label_periods))
+        labels = engine.register_shared('label_index', ISSUES, LabelIndex)
         # Contributors summary
-        contributors = self.data.get('contributors', [])
-        contributors_viz = [
-            {
+        contributors = engine.register([("contributors", None)], RecordCollector(
+            lambda c: {
                 'login': c.get('login'),
                 'contributions': c.get('contributions', 0),
                 'avatar_url': c.get('avatar_url')
-            }
-            for c in contributors[:50]  # Top 50 contributors
-        ]
-        
-        contributors_file = os.path.join(self.data_dir, 'visualization_contributors.json')
-        with open(contributors_file, 'w', encoding='utf-8') as f:
-            json.dump(contributors_viz, f, indent=2)
-        print(f"✓ Generated {contributors_file}")
+            },
+            limit=50  # Top 50 contributors
+        ))
+        
+        def report():
+            print("\n" + "="*60)
+            print("GENERATING VISUALIZATION DATA")
+            print("="*60)
+            
+            # Save timeline data
+            timeline_file = os.path.join(self.data_dir, 'visualization_timeline.json')
+            with open(timeline_file, 'w', encoding='utf-8') as f:
+                json.dump(timeline.result(), f, indent=2)
+            print(f"✓ Generated {timeline_file}")
+            
+            # One entry per issue for the issues page, which does not need the events
+            issues_file = os.path.join(self.data_dir, 'visualization_issues.json')
+            with open(issues_file, 'w', encoding='utf-8') as f:
+                json.dump(spans.result(), f, separators=(',', ':'))
+            print(f"✓ Generated {issues_file}")
+            
+            # Backlog series, ready to chart without replaying the timeline
+            backlog_file = os.path.join(self.data_dir, 'visualization_backlog.json')
+            with open(backlog_file, 'w', encoding='utf-8') as f:
+                json.dump(backlog.result(), f, separators=(',', ':'))
+            print(f"✓ Generated {backlog_file}")
+            
+            # Labels summary: open and closed issues per label added up
+            labels_summary = dict(labels.result().totals())
+            
+            labels_file = os.path.join(self.data_dir, 'visualization_labels.json')
+            with open(labels_file, 'w', encoding='utf-8') as f:
+                json.dump(labels_summary, f, indent=2)
+            print(f"✓ Generated {labels_file}")
+            
+            contributors_file = os.path.join(self.data_dir, 'visualization_contributors.json')
+            with open(contributors_file, 'w', encoding='utf-8') as f:
+                json.dump(contributors.result(), f, indent=2)
+            print(f"✓ Generated {contributors_file}")
+        return report
+    
+    def analyze(self, analyses: List[str], report: bool = False) -> List[tuple]:
+        """Scan each dataset the selected analyses need once, then print their reports.
+        
+        With `report` (tracemalloc must be tracing) every analysis instead
+        runs on its own, starting from no loaded datasets, so that its cost is
+        not shared with the others. Returns (analysis, startup seconds, total
+        seconds, peak traced bytes) per analysis; startup is the time until
+        its datasets are opened (parsed unless streaming) and yield a record.
+        """
+        if not report:
+            engine = AggregationEngine(self)
+            reports = [getattr(self, ANALYSES[name])(engine) for name in analyses]
+            for key, field in engine.scans:
+                with phase(f"scan {key}"):
+                    engine.scan((key, field))
+            for name, analysis_report in zip(analyses, reports):
+                with phase(name):
+                    analysis_report()
+            return []
+        
+        measurements = []
+        for name in analyses:
+            self.data = {}
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            with phase(name):
+                engine = AggregationEngine(self)
+                analysis_report = getattr(self, ANALYSES[name])(engine)
+                engine.run()
+                analysis_report()
+            elapsed = time.perf_counter() - start
+            measurements.append((name, engine.startup, elapsed, tracemalloc.get_traced_memory()[1] - baseline))
+        self.data = {}
+        return measurements
+    
+    def analyze_issues_timeline(self):
+        self.analyze(["timeline"])
+    
+    def analyze_labels(self):
+        self.analyze(["labels"])
     
-    def run_analysis(self):
-        """Run complete data analysis."""
+    def analyze_contributors(self):
+        self.analyze(["contributors"])
+    
+    def analyze_releases(self):
+        self.analyze(["releases"])
+    
+    def analyze_pull_requests(self):
+        self.analyze(["prs"])
+    
+    def generate_visualization_data(self):
+        self.analyze(["visualization"])
+    
+    def run_analysis(self, analyses: List[str] = None, report: bool = False):
+        """Run the selected analyses (all by default), optionally reporting startup, time and peak memory of each."""
         print("SCALA 3 GITHUB DATA ANALYSIS")
         print("="*60)
         print(f"Data directory: {os.path.abspath(self.data_dir)}")
         print(f"Analysis date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
-        self.analyze_issues_timeline()
-        self.analyze_labels()
-        self.analyze_contributors()
-        self.analyze_releases()
-        self.analyze_pull_requests()
-        self.generate_visualization_data()
+        measurements = self.analyze(analyses or list(ANALYSES), report)
         
         print("\n" + "="*60)
         print("ANALYSIS COMPLETE")
         print("="*60)
+        
+        if report:
+            print(f"\n{'Analysis':15} {'Startup (s)':>12} {'Time (s)':>10} {'Peak memory (MB)':>18}")
+            for name, startup, elapsed, peak in measurements:
+                print(f"{name:15} {startup:12.3f} {elapsed:10.3f} {peak / 2**20:18.1f}")
 
 def main():
     """Main function."""
-    explorer = DataExplorer()
-    explorer.run_analysis()
+    parser = argparse.ArgumentParser(description="Analyze the fetched Scala 3 GitHub data")
+    parser.add_argument("analyses", nargs="*", metavar="ANALYSIS",
+                        help=f"Analyses to run: {', '.join(ANALYSES)} (default: all); "
+                             "only the data files they read are loaded")
+    parser.add_argument("--data-dir", default="app", help="Directory holding the fetched data")
+    parser.add_argument("--stream", action="store_true",
+                        help="Decode issue, PR and other list files record by record instead of loading them")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Compute issue and PR statistics on NumPy columns (requires NumPy)")
+    parser.add_argument("--backlog-labels", nargs="+", choices=list(BACKLOG_PERIODS), default=[],
+                        metavar="PERIOD",
+                        help=f"Also write per-label backlog series for these periods ({', '.join(BACKLOG_PERIODS)})")
+    parser.add_argument("--report", action="store_true",
+                        help="Run each analysis on its own and report its startup time, time and peak traced memory")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile(args, "analyze_data")
+    unknown = [name for name in args.analyses if name not in ANALYSES]
+    if unknown:
+        parser.error(f"unknown analysis: {', '.join(unknown)}")
+    if args.columnar and not issue_columns.available():
+        parser.error("--columnar requires NumPy")
+    
+    if args.report:
+        tracemalloc.start()
+    explorer = DataExplorer(args.data_dir, stream=args.stream, columnar=args.columnar,
+                            backlog_label_periods=args.backlog_labels)
+    explorer.run_analysis(args.analyses, report=args.report)
 
 if __name__ == "__main__":
     main()
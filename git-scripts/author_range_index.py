@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Author Range Index
+Prefix sums of per-author commit and line counts over the first-parent
+history of a branch, so the author statistics of any range between two of
+its commits, or of any date window, are answered without running git.
+
+Every commit reachable from the tip is assigned to the first-parent commit
+that brought it in: the first-parent commit itself plus whatever its merge
+added. For first-parent commits A and B, the commits assigned to the
+positions after A up to B are exactly `git log A..B`. Per author the index
+keeps the sorted positions of its commits and the running sum of their
+changed lines, so a range costs two bisections per author.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+from commit_index import iter_numstat_log
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
+
+FORMAT_VERSION = 1
+
+def parse_date(value):
+    """Epoch seconds of an ISO date or date-time; dates without a timezone are UTC"""
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return int(date.timestamp())
+
+class AuthorRangeIndex:
+    def __init__(self, path):
+        self.path = path
+        self._reset()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == FORMAT_VERSION:
+                for key in ('tip', 'commits', 'times', 'authors', 'positions', 'lines'):
+                    setattr(self, key, data[key])
+        self._finish()
+
+    def _reset(self):
+        self.tip = None
+        self.commits = []  # First-parent commits, oldest first
+        self.times = []  # Committer date of each, when it landed on the branch
+        self.authors = []
+        self.positions = []  # Per author: position of each of its commits, ascending
+        self.lines = []  # Per author: lines changed by its first k commits, starting at 0
+
+    def _finish(self):
+        self.position = {commit: i for i, commit in enumerate(self.commits)}
+        self.author_ids = {author: i for i, author in enumerate(self.authors)}
+        # Landing dates are not monotonic when committer clocks disagree; bisect on the running maximum
+        self.landed = []
+        latest = None
+        for timestamp in self.times:
+            latest = timestamp if latest is None else max(latest, timestamp)
+            self.landed.append(latest)
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': FORMAT_VERSION,
+                'tip': self.tip,
+                'commits': self.commits,
+                'times': self.times,
+                'authors': self.authors,
+                'positions': self.positions,
+                'lines': self.lines
+            }, f, separators=(',', ':'))
+
+    def __len__(self):
+        return len(self.commits)
+
+    def update(self, tip='HEAD'):
+        """Extend the index to the first-parent history of `tip`; rebuild it if the old tip is not on it.
+
+        Returns the number of first-parent commits added.
+        """
+        with GitSession() as git:
+            if self.tip and git.resolve(self.tip) is None:
+                self._reset()  # The old tip is gone: history was rewritten
+        exclude = [self.tip] if self.tip else []
+        chain = [line.split() for line in subprocess.check_output(
+            ['git', 'log', '--first-parent', '--reverse', '--format=%H %ct %P', tip, '--not', *exclude],
+            text=True
+        ).splitlines()]
+        if self.tip and chain and chain[0][2:3] != [self.tip]:
+            # History was rewritten or the tip moved to another branch
+            self._reset()
+            return self.update(tip)
+        if not chain:
+            return 0
+
+        with phase('read commits'):
+            commits = {
+                record['hash']: (record['parents'], record['author'], record['insertions'] + record['deletions'])
+                for record in iter_numstat_log([tip], exclude=exclude)
+            }
+        with phase('assign positions'):
+            for position, (commit, timestamp, *_) in enumerate(chain, len(self.commits)):
+                self.commits.append(commit)
+                self.times.append(int(timestamp))
+                # The commit itself and what it merged; commits known to the old tip are not in `commits`
+                stack = [commit]
+                while stack:
+                    parents, author, lines = commits.pop(stack.pop(), (None, None, None))
+                    if parents is None:
+                        continue
+                    stack.extend(parents)
+                    if not author:
+                        continue
+                    if author not in self.author_ids:
+                        self.author_ids[author] = len(self.authors)
+                        self.authors.append(author)
+                        self.positions.append([])
+                        self.lines.append([0])
+                    author_id = self.author_ids[author]
+                    self.positions[author_id].append(position)
+                    self.lines[author_id].append(self.lines[author_id][-1] + lines)
+        self.tip = chain[-1][0]
+        self._finish()
+        return len(chain)
+
+    def span(self, commit1, commit2):
+        """Positions (after, upto) of commit1..commit2, or None unless both are indexed first-parent commits in order"""
+        after, upto = self.position.get(commit1), self.position.get(commit2)
+        if after is None or upto is None or after > upto:
+            return None
+        return after, upto
+
+    def date_span(self, since=None, until=None):
+        """Positions (after, upto) of the commits that landed in [since, until), as epoch seconds"""
+        after = bisect_left(self.landed, since) - 1 if since is not None else -1
+        upto = bisect_left(self.landed, until) - 1 if until is not None else len(self.landed) - 1
+        return after, max(after, upto)
+
+    def stats(self, after, upto):
+        """{author: (commits, lines)} of the commits assigned to positions after..upto"""
+        result = {}
+        for author, positions, lines in zip(self.authors, self.positions, self.lines):
+            start, end = bisect_right(positions, after), bisect_right(positions, upto)
+            if end > start:
+                result[author] = (end - start, lines[end] - lines[start])
+        return result
+
+def open_index(path, tip='HEAD'):
+    """Load the index at `path` and bring it up to date with `tip`, saving it if it changed"""
+    index = AuthorRangeIndex(path)
+    if index.update(tip):
+        index.save()
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or update the author range index of a branch')
+    parser.add_argument('tip', nargs='?', default='HEAD', help='Branch whose first-parent history to index')
+    parser.add_argument('--index', default='author_range_index.json', help='Index file')
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+    start_profile(args, 'author_range_index')
+
+    existed = os.path.exists(args.index)
+    index = AuthorRangeIndex(args.index)
+    try:
+        added = index.update(args.tip)
+    except subprocess.CalledProcessError as e:
+        print(f"Error updating index: {e}")
+        sys.exit(1)
+    if added:
+        with phase('save'):
+            index.save()
+    print(f"{'Updated' if existed else 'Built'} {args.index}: {added} new first-parent commits, "
+          f"{len(index)} total, {len(index.authors)} authors")
+
+if __name__ == "__main__":
+    main()
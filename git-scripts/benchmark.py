@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for the git-scripts
+Generates a synthetic git repository (via `git fast-import`, no network) and
+synthetic GitHub JSON data, runs every entry point against them and records
+wall time, the number of git processes spawned and the peak RSS of each run.
+Results can be checked against a thresholds file to catch regressions, and
+the output of the git entry points is compared with a reference read one
+commit at a time, the way the original scripts did.
+
+Wall time and peak RSS depend on the machine, so every invocation first
+runs a fixed calibration workload (one `git log --numstat` over the range,
+parsed in Python) and thresholds apply to each run's time and peak RSS
+relative to it. Only the git process count is compared as is.
+
+git processes are counted by putting a wrapper `git` first on PATH that logs
+every invocation before handing over to the real git. Peak RSS is the largest
+resident set of any single process in the run's process tree (os.wait4).
+Linux carries the parent's peak RSS over into a child until it execs, so the
+synthetic data is generated in a separate process to keep that floor low.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from fetch_github_data import GitHubDataFetcher
+from git_contributor_viz import create_visualization_data
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+START_TAG = 'bench-start'
+BRANCH = 'main'
+THRESHOLDS_FILE = os.path.join(SCRIPTS_DIR, 'benchmark_thresholds.json')
+# Slack allowed over the recorded values when writing a thresholds file;
+# git process counts are deterministic and must not grow at all. Short runs
+# also get RELATIVE_SECONDS_SLACK (in calibration runs) so that timer noise
+# alone does not fail them.
+MARGINS = {'relative_seconds': 1.5, 'relative_peak_rss': 1.25, 'git_processes': 1.0}
+RELATIVE_SECONDS_SLACK = 0.25
+# Calibration workload: the diff statistics of the range, read by one git
+# process and summed in Python, like the scripts do
+CALIBRATION = '\n'.join([
+    'import subprocess, sys',
+    "out = subprocess.run(['git', 'log', '-z', '--numstat', '--format=%H', sys.argv[1]],",
+    '                     capture_output=True, check=True).stdout',
+    "print(sum(int(field) for field in out.replace(b'\\t', b'\\0').split(b'\\0') if field.isdigit()))",
+])
+# Options that change the workload; thresholds only apply to the same ones
+CONFIG_KEYS = ('commits', 'authors', 'files', 'depth', 'merge_every', 'tie_every', 'issues', 'jobs')
+# Entry points printing `name : count` listings, checked against the reference
+COUNT_OUTPUTS = ('git_author_stats', 'git_file_changes', 'git_author_file_stats')
+
+def synthetic_paths(files, depth, rng):
+    """`files` Scala file paths spread over a directory tree `depth` levels deep"""
+    fanout = max(2, round(files ** (1 / (depth + 1))))
+    paths = set()
+    while len(paths) < files:
+        dirs = [f'dir{rng.randrange(fanout)}' for _ in range(depth)]
+        paths.add('/'.join(['src'] + dirs + [f'File{rng.randrange(files * 4)}.scala']))
+    return sorted(paths)
+
+def file_content(rng):
+    return ''.join(f'val x{rng.randrange(1000)} = {rng.randrange(10 ** 6)}\n' for _ in range(rng.randint(5, 40)))
+
+def data_command(text):
+    data = text.encode()
+    return b'data %d\n%s\n' % (len(data), data)
+
+def fast_import_stream(commits, authors, files, depth, merge_every, seed, tie_every=0):
+    """Yield `git fast-import` input for a history of `commits` commits on BRANCH.
+
+    Every commit rewrites one to five files. Every `merge_every` commits a
+    side-branch commit forked a few commits back is merged in, so the history
+    also has merges. Every `tie_every` commits two authors of their own commit
+    one after the other, so they tie on commit totals. START_TAG points at the
+    first commit.
+    """
+    rng = random.Random(seed)
+    paths = synthetic_paths(files, depth, rng)
+    people = [(f'Author {i}', f'author{i}@example.com') for i in range(authors)]
+    timezones = ['+0000', '+0100', '+0200', '-0500', '-0800', '+0530', '+0900']
+    timestamp = 1514764800  # 2018-01-01
+    # Commits land up to three days after they are authored, in history order; a separate
+    # random stream keeps the rest of the history unchanged
+    landing = random.Random(seed + 1)
+    landed = timestamp
+
+    def commit(ref, mark, parents, message, person=None):
+        nonlocal timestamp, landed
+        timestamp += rng.randrange(4 * 3600, 2 * 86400)
+        landed = max(landed, timestamp + landing.randrange(3 * 86400))
+        name, email = person or people[min(int(rng.paretovariate(1.2)) - 1, authors - 1)]
+        tz = rng.choice(timezones)
+        author = f'{name} <{email}> {timestamp} {tz}'
+        committer = f'{name} <{email}> {landed} {tz}'
+        chunks = [f'commit {ref}\nmark :{mark}\nauthor {author}\ncommitter {committer}\n'.encode(),
+                  data_command(message)]
+        if parents:
+            chunks.append(f'from :{parents[0]}\n'.encode())
+            chunks.extend(f'merge :{parent}\n'.encode() for parent in parents[1:])
+        for path in rng.sample(paths, rng.randint(1, 5)):
+            chunks.append(f'M 100644 inline {path}\n'.encode() + data_command(file_content(rng)))
+        return b''.join(chunks) + b'\n'
+
+    # The first commit adds every file
+    ident = f'{people[0][0]} <{people[0][1]}> {timestamp} +0000'
+    yield f'commit refs/heads/{BRANCH}\nmark :1\nauthor {ident}\ncommitter {ident}\n'.encode() + data_command('Initial commit')
+    for path in paths:
+        yield f'M 100644 inline {path}\n'.encode() + data_command(file_content(rng))
+    yield f'\nreset refs/tags/{START_TAG}\nfrom :1\n\n'.encode()
+
+    marks = [1]
+    while len(marks) < commits:
+        mark = len(marks) + 1
+        if merge_every and len(marks) % merge_every == 0 and len(marks) + 1 < commits:
+            fork = marks[-min(len(marks), 5)]
+            yield commit('refs/heads/side', mark, [fork], f'Side change {mark}')
+            marks.append(mark)
+            yield commit(f'refs/heads/{BRANCH}', mark + 1, [marks[-2], mark], f'Merge side change {mark}')
+            marks.append(mark + 1)
+        elif tie_every and len(marks) % tie_every == 0 and len(marks) + 1 < commits:
+            pair = [('Tied Author A', 'tied-a@example.com'), ('Tied Author B', 'tied-b@example.com')]
+            # Alternate who goes first, so neither is always seen first
+            for i, person in enumerate(pair if len(marks) // tie_every % 2 else pair[::-1]):
+                yield commit(f'refs/heads/{BRANCH}', mark + i, [marks[-1]], f'Change {mark + i}', person)
+                marks.append(mark + i)
+        else:
+            yield commit(f'refs/heads/{BRANCH}', mark, [marks[-1]], f'Change {mark}')
+            marks.append(mark)
+
+def generate_repo(path, commits, authors, files, depth, merge_every=50, seed=0, tie_every=0):
+    """Create a git repository at `path` with a synthetic history"""
+    subprocess.run(['git', 'init', '-q', path], check=True)
+    proc = subprocess.Popen(['git', '-C', path, 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    try:
+        for chunk in fast_import_stream(commits, authors, files, depth, merge_every, seed, tie_every):
+            proc.stdin.write(chunk)
+    finally:
+        proc.stdin.close()
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, 'git fast-import')
+    subprocess.run(['git', '-C', path, 'symbolic-ref', 'HEAD', f'refs/heads/{BRANCH}'], check=True)
+
+def synthetic_issue(number, state, rng):
+    created = 1514764800 + rng.randrange(7 * 365 * 86400)
+    closed = created + int(rng.expovariate(1 / (30 * 86400))) if state == 'closed' else None
+    iso = lambda t: time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(t)) if t else None
+    labels = [f'area:{i}' for i in range(40)] + [f'itype:{i}' for i in range(10)] + ['stat:needs triage']
+    return {
+        'number': number,
+        'title': f'Issue {number}',
+        'state': state,
+        'created_at': iso(created),
+        'updated_at': iso(closed or created),
+        'closed_at': iso(closed),
+        'labels': [{'name': name} for name in rng.sample(labels, rng.randrange(4))],
+        'assignees': [{'login': f'user{rng.randrange(300)}'}] if rng.random() < 0.3 else [],
+        'user': {'login': f'user{rng.randrange(2000)}'},
+        'comments': rng.randrange(20),
+        'body': 'x' * rng.randrange(100, 2000)
+    }
+
+def generate_github_data(data_dir, issues, seed=0):
+    """Write synthetic issue, PR, contributor and release files in the layout fetch_github_data produces"""
+    rng = random.Random(seed)
+    fetcher = GitHubDataFetcher(output_dir=data_dir)
+    open_count = issues // 4
+    datasets = {
+        'scala3_open_issues.json': fetcher.process_issues_for_visualization(
+            synthetic_issue(i, 'open', rng) for i in range(open_count)),
+        'scala3_closed_issues.json': fetcher.process_issues_for_visualization(
+            synthetic_issue(i, 'closed', rng) for i in range(open_count, issues)),
+        'scala3_open_prs.json': [synthetic_issue(i, 'open', rng) | {'merged_at': None} for i in range(issues // 10)],
+        'scala3_closed_prs.json': [
+            synthetic_issue(i, 'closed', rng) | {'merged_at': None if rng.random() < 0.2 else '2024-01-01T00:00:00Z'}
+            for i in range(issues // 2)
+        ],
+        'scala3_contributors.json': [{'login': f'user{i}', 'contributions': rng.randint(1, 5000)} for i in range(500)],
+        'scala3_releases.json': [
+            {'name': f'3.{i}', 'tag_name': f'3.{i}', 'published_at': '2024-01-01T00:00:00Z', 'prerelease': i % 3 == 0}
+            for i in range(100)
+        ]
+    }
+    for filename, data in datasets.items():
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+def install_git_wrapper(bin_dir):
+    """Put a `git` into `bin_dir` that appends its subcommand to $BENCH_GIT_LOG, then runs the real git"""
+    real_git = shutil.which('git')
+    if real_git is None:
+        raise FileNotFoundError('git not found on PATH')
+    os.makedirs(bin_dir, exist_ok=True)
+    wrapper = os.path.join(bin_dir, 'git')
+    with open(wrapper, 'w') as f:
+        f.write(f'#!/bin/sh\necho "$*" >> "$BENCH_GIT_LOG"\nexec "{real_git}" "$@"\n')
+    os.chmod(wrapper, 0o755)
+
+def entry_points(repo, data_dir, output_dir, jobs):
+    """Name -> (script, arguments) of every benchmarked run"""
+    commit_range = [START_TAG, BRANCH]
+    return {
+        'git_author_stats': ('git_author_stats.py', commit_range),
+        'git_file_changes': ('git_file_changes.py', commit_range),
+        'git_author_file_stats': ('git_author_file_stats.py', commit_range),
+        'git_contributor_viz': ('git_contributor_viz.py',
+                                commit_range + ['-o', os.path.join(output_dir, 'contributors_serial.json')]),
+        f'git_contributor_viz -j {jobs}': ('git_contributor_viz.py',
+                                           commit_range + ['-j', str(jobs), '-o', os.path.join(output_dir, 'contributors_parallel.json')]),
+        'analyze_data': ('analyze_data.py', ['--data-dir', data_dir])
+    }
+
+def run_entry_point(command, cwd, env, git_log, output):
+    """Run one Python command; return its exit code, wall time, git process count and peak RSS"""
+    open(git_log, 'w').close()
+    # stderr (e.g. the --profile notice) goes next to the output, which is compared with the reference
+    with open(output, 'w') as out, open(os.path.splitext(output)[0] + '.err', 'w') as err:
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, *command], cwd=cwd, env=env, stdout=out, stderr=err)
+        _, status, usage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    with open(git_log) as f:
+        git_processes = sum(1 for _ in f)
+    return {
+        'exit_code': proc.returncode,
+        'seconds': round(seconds, 4),
+        'git_processes': git_processes,
+        'peak_rss_kb': usage.ru_maxrss
+    }
+
+def format_counts(counts):
+    """The `name : count` listing of the count scripts, largest count first"""
+    max_width = max(len(name) for name in counts) if counts else 0
+    return ''.join(f"{name:<{max_width}} : {count}\n"
+                   for name, count in sorted(counts.items(), key=lambda x: (-x[1], x[0])))
+
+def reference_outputs(repo, env):
+    """Expected output of the git entry points on START_TAG..BRANCH.
+
+    Every commit is read with its own `git show` and `git diff-tree`, like
+    the original per-commit scripts: authors (mailmapped for the author
+    counts), the files `git show` lists for the modules per author, the
+    files `git diff-tree -r` lists for the file counts, and numstat lines for
+    the contributor statistics, in months of the author's local time.
+    """
+    def git(*args):
+        return subprocess.check_output(['git', *args], cwd=repo, env=env, text=True)
+
+    author_counts = defaultdict(int)
+    file_counts = defaultdict(int)
+    author_modules = defaultdict(set)
+    monthly_stats = defaultdict(lambda: defaultdict(lambda: {'commits': 0, 'lines_changed': 0}))
+    for commit in git('rev-list', f'{START_TAG}..{BRANCH}').split():
+        header, *files = git('show', commit, '--pretty=format:%aN%x00%an%x00%aI', '--name-only').splitlines()
+        mailmapped, author, date = (field.strip() for field in header.split('\0'))
+        author_counts[mailmapped] += 1
+        for file in filter(None, files):
+            parts = file.split('/')
+            author_modules[author].add(parts[3] if len(parts) > 3 else parts[-1])
+        lines_changed = 0
+        for line in git('diff-tree', '--no-commit-id', '--numstat', '-r', commit).splitlines():
+            added, deleted, path = line.split('\t', 2)
+            file_counts[path] += 1
+            lines_changed += sum(int(n) for n in (added, deleted) if n != '-')
+        month_stats = monthly_stats[date[:7]][mailmapped]
+        month_stats['commits'] += 1
+        month_stats['lines_changed'] += lines_changed
+
+    viz_data = create_visualization_data(monthly_stats)
+    return {
+        'git_author_stats': format_counts(author_counts),
+        'git_file_changes': format_counts(file_counts),
+        'git_author_file_stats': format_counts({author: len(modules) for author, modules in author_modules.items()}),
+        'git_contributor_viz': {key: viz_data[key] for key in ('timePoints', 'contributors')}
+    }
+
+def check_outputs(references, results, output_dir, jobs):
+    """Return a message for every entry point whose output differs from the reference"""
+    failures = []
+    for name in COUNT_OUTPUTS:
+        if name in results:
+            with open(os.path.join(output_dir, name + '.out')) as f:
+                if f.read() != references[name]:
+                    failures.append(f"{name}: output differs from the per-commit reference")
+    for name, output in (('git_contributor_viz', 'contributors_serial.json'),
+                         (f'git_contributor_viz -j {jobs}', 'contributors_parallel.json')):
+        if name in results:
+            with open(os.path.join(output_dir, output)) as f:
+                viz_data = json.load(f)
+            if {key: viz_data.get(key) for key in ('timePoints', 'contributors')} != references['git_contributor_viz']:
+                failures.append(f"{name}: output differs from the per-commit reference")
+    return failures
+
+def check_thresholds(results, thresholds):
+    """Return a message for every recorded metric above its threshold"""
+    failures = []
+    for name, limits in thresholds.items():
+        if name not in results:
+            failures.append(f"{name}: no result")
+            continue
+        for metric, limit in limits.items():
+            value = results[name][metric]
+            if value > limit:
+                failures.append(f"{name}: {metric} {value} exceeds threshold {limit}")
+    return failures
+
+def add_relative_metrics(results, calibration):
+    """Add each run's wall time and peak RSS as multiples of the calibration run's"""
+    for result in results.values():
+        result['relative_seconds'] = round(result['seconds'] / calibration['seconds'], 3)
+        result['relative_peak_rss'] = round(result['peak_rss_kb'] / calibration['peak_rss_kb'], 3)
+
+def make_thresholds(results):
+    return {
+        name: {
+            'relative_seconds': round(max(result['relative_seconds'] * MARGINS['relative_seconds'],
+                                          result['relative_seconds'] + RELATIVE_SECONDS_SLACK), 3),
+            'relative_peak_rss': round(result['relative_peak_rss'] * MARGINS['relative_peak_rss'], 3),
+            'git_processes': int(result['git_processes'] * MARGINS['git_processes'])
+        }
+        for name, result in results.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the git-scripts on a synthetic repository and data set')
+    parser.add_argument('--commits', type=int, default=2000, help='Number of commits in the synthetic repository')
+    parser.add_argument('--authors', type=int, default=50, help='Number of distinct authors')
+    parser.add_argument('--files', type=int, default=500, help='Number of files')
+    parser.add_argument('--depth', type=int, default=4, help='Directory depth of the files')
+    parser.add_argument('--merge-every', type=int, default=50, help='Merge a side branch every N commits (0: linear)')
+    parser.add_argument('--tie-every', type=int, default=25,
+                        help='Add a commit by each of two tied authors every N commits (0: none)')
+    parser.add_argument('--issues', type=int, default=20000, help='Number of synthetic issues for analyze_data')
+    parser.add_argument('--jobs', '-j', type=int, default=4, help='Processes for the parallel contributor run')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per entry point; the fastest one is kept')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Only run entry points whose name starts with NAME')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        help="Run every entry point with --profile and keep the reports in DIR")
+    parser.add_argument('--workdir', help='Directory for the generated repository and data (default: temporary)')
+    parser.add_argument('--results', '-o', default='benchmark_results.json', help='Results file')
+    parser.add_argument('--thresholds', default=THRESHOLDS_FILE, help='Thresholds file to check the results against')
+    parser.add_argument('--no-check', action='store_true', help='Do not check the results against the thresholds')
+    parser.add_argument('--no-verify', action='store_true',
+                        help='Do not compare the outputs with the per-commit reference')
+    parser.add_argument('--update-thresholds', action='store_true',
+                        help='Write the thresholds file from these results instead of checking them')
+
+    args = parser.parse_args()
+
+    if args.commits < 2 or args.authors < 1 or args.files < 1 or args.depth < 0:
+        print("Error: need at least 2 commits, 1 author, 1 file and a depth of 0 or more")
+        sys.exit(1)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='git-scripts-bench-')
+    repo = os.path.join(workdir, 'repo')
+    data_dir = os.path.join(workdir, 'data')
+    output_dir = os.path.join(workdir, 'output')
+    bin_dir = os.path.join(workdir, 'bin')
+    git_log = os.path.join(workdir, 'git.log')
+    try:
+        for path in (repo, data_dir, output_dir):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+        os.makedirs(output_dir)
+
+        start = time.perf_counter()
+        generate_repo(repo, args.commits, args.authors, args.files, args.depth, args.merge_every,
+                      tie_every=args.tie_every)
+        generator = multiprocessing.get_context('spawn').Process(target=generate_github_data, args=(data_dir, args.issues))
+        generator.start()
+        generator.join()
+        if generator.exitcode:
+            print("Error: generating the synthetic GitHub data failed")
+            sys.exit(1)
+        install_git_wrapper(bin_dir)
+        print(f"Generated {args.commits} commits, {args.files} files and {args.issues} issues "
+              f"in {time.perf_counter() - start:.1f} s ({workdir})")
+
+        env = dict(os.environ, PATH=bin_dir + os.pathsep + os.environ.get('PATH', ''), BENCH_GIT_LOG=git_log,
+                   GIT_CONFIG_GLOBAL=os.devnull, GIT_CONFIG_NOSYSTEM='1')
+        runs = [run_entry_point(['-c', CALIBRATION, f'{START_TAG}..{BRANCH}'], repo, env, git_log,
+                                os.path.join(output_dir, 'calibration.out')) for _ in range(args.repeat)]
+        calibration = min(runs, key=lambda run: run['seconds'])
+        if calibration['exit_code']:
+            print("Error: the calibration run failed")
+            sys.exit(1)
+        print(f"  {'calibration':30} {calibration['seconds']:8.3f} s {calibration['git_processes']:6d} git "
+              f"{calibration['peak_rss_kb'] / 1024:8.1f} MB")
+
+        results = {}
+        for name, (script, arguments) in entry_points(repo, data_dir, output_dir, args.jobs).items():
+            if args.only and not any(name.startswith(prefix) for prefix in args.only):
+                continue
+            output = os.path.join(output_dir, name.replace(' ', '_') + '.out')
+            if args.profile_dir:
+                os.makedirs(args.profile_dir, exist_ok=True)
+                arguments = arguments + ['--profile', os.path.join(os.path.abspath(args.profile_dir),
+                                                                   name.replace(' ', '_') + '.profile.json')]
+            command = [os.path.join(SCRIPTS_DIR, script), *arguments]
+            runs = [run_entry_point(command, repo, env, git_log, output) for _ in range(args.repeat)]
+            results[name] = min(runs, key=lambda run: run['seconds'])
+            result = results[name]
+            print(f"  {name:30} {result['seconds']:8.3f} s {result['git_processes']:6d} git "
+                  f"{result['peak_rss_kb'] / 1024:8.1f} MB" + (f"  (exit {result['exit_code']})" if result['exit_code'] else ""))
+        add_relative_metrics(results, calibration)
+
+        failures = [f"{name}: exited with {result['exit_code']}" for name, result in results.items() if result['exit_code']]
+
+        serial = os.path.join(output_dir, 'contributors_serial.json')
+        parallel = os.path.join(output_dir, 'contributors_parallel.json')
+        if os.path.exists(serial) and os.path.exists(parallel):
+            with open(serial) as f, open(parallel) as g:
+                if json.load(f) != json.load(g):
+                    failures.append(f"git_contributor_viz: -j {args.jobs} output differs from the serial output")
+
+        verified = [name for name in results if name in COUNT_OUTPUTS or name.startswith('git_contributor_viz')]
+        if not args.no_verify and verified:
+            start = time.perf_counter()
+            # The real git: reading the reference is not part of any measurement
+            references = reference_outputs(repo, dict(env, PATH=os.environ.get('PATH', '')))
+            failures += check_outputs(references, results, output_dir, args.jobs)
+            print(f"Compared outputs with the per-commit reference in {time.perf_counter() - start:.1f} s")
+
+        config = {key: getattr(args, key) for key in CONFIG_KEYS}
+        with open(args.results, 'w') as f:
+            json.dump({
+                'config': config,
+                'environment': {
+                    'python': platform.python_version(),
+                    'git': subprocess.check_output(['git', '--version'], text=True).strip(),
+                    'platform': platform.platform(),
+                    'cpus': os.cpu_count()
+                },
+                'calibration': calibration,
+                'results': results
+            }, f, indent=2)
+        print(f"Results saved to {args.results}")
+
+        if args.update_thresholds:
+            with open(args.thresholds, 'w') as f:
+                json.dump({'config': config, 'thresholds': make_thresholds(results)}, f, indent=2)
+            print(f"Thresholds saved to {args.thresholds}")
+        elif not args.no_check and os.path.exists(args.thresholds):
+            with open(args.thresholds) as f:
+                thresholds = json.load(f)
+            if thresholds['config'] != config:
+                print(f"Not checking thresholds: {args.thresholds} was recorded with {thresholds['config']}")
+            else:
+                failures += check_thresholds(results, {
+                    name: limits for name, limits in thresholds['thresholds'].items() if name in results
+                })
+
+        if failures:
+            print("\nRegressions:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Persistent Commit Index for the git-scripts
+Keeps hash, author, author and commit dates, line stats and touched paths of every
+ingested commit in a local SQLite file, so repeated range reports can be
+answered without walking the history again.
+
+The index follows `git log` defaults: renames are detected (both the old and
+new path are recorded), root commits list their files and merge commits
+carry no diff.
+"""
+
+import argparse
+import os
+import sqlite3
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from git_file_changes import iter_nul_fields
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    id INTEGER PRIMARY KEY,
+    hash TEXT UNIQUE NOT NULL,
+    author TEXT NOT NULL,
+    author_name TEXT NOT NULL,
+    author_date INTEGER NOT NULL,
+    author_tz INTEGER NOT NULL,
+    commit_date INTEGER NOT NULL,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parents (
+    child TEXT NOT NULL,
+    parent TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parents_child ON parents(child);
+CREATE TABLE IF NOT EXISTS paths (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commit_files (
+    commit_id INTEGER NOT NULL,
+    path_id INTEGER NOT NULL,
+    old_path_id INTEGER,
+    insertions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commit_files_commit ON commit_files(commit_id);
+CREATE TABLE IF NOT EXISTS tips (
+    hash TEXT PRIMARY KEY
+);
+"""
+
+# Bumped when the tables change; an index with another version is rebuilt
+SCHEMA_VERSION = 2
+TABLES = ('commits', 'parents', 'paths', 'commit_files', 'tips')
+
+LOG_FORMAT = '--format=%x00%H%x00%P%x00%aN%x00%an%x00%at%x00%aI%x00%ct'
+
+def parse_tz(iso_date):
+    """Return the UTC offset in minutes of a strict ISO 8601 date"""
+    if iso_date.endswith('Z'):
+        return 0
+    sign = -1 if iso_date[-6] == '-' else 1
+    return sign * (int(iso_date[-5:-3]) * 60 + int(iso_date[-2:]))
+
+def parse_numstat(value):
+    """Binary files are reported as '-' and count as zero lines"""
+    return 0 if value == b'-' else int(value)
+
+def iter_numstat_log(revs, exclude=()):
+    """Yield one commit record per commit of a `git log -z --numstat` stream"""
+    cmd = ['git', 'log', '-z', '--numstat', LOG_FORMAT, *revs]
+    if exclude:
+        cmd += ['--not', *exclude]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        record = None
+        fields = iter_nul_fields(proc.stdout)
+        for field in fields:
+            if not field:
+                if record is not None:
+                    yield record
+                    record = None
+                while not field:
+                    field = next(fields, None)
+                if field is None:
+                    break
+                header = [field.decode()] + [next(fields).decode() for _ in range(6)]
+                commit_hash, parents, author, author_name, timestamp, iso_date, commit_timestamp = header
+                record = {
+                    'hash': commit_hash,
+                    'parents': parents.split(),
+                    'author': author.strip(),
+                    'author_name': author_name.strip(),
+                    'author_date': int(timestamp),
+                    'author_tz': parse_tz(iso_date),
+                    'commit_date': int(commit_timestamp),
+                    'insertions': 0,
+                    'deletions': 0,
+                    'files': []
+                }
+            else:
+                if not record['files'] and field.startswith(b'\n'):
+                    field = field[1:]
+                added, deleted, path = field.split(b'\t', 2)
+                old_path = None
+                if not path:  # rename or copy: "added\tdeleted\t\0old\0new"
+                    old_path = next(fields).decode()
+                    path = next(fields)
+                added, deleted = parse_numstat(added), parse_numstat(deleted)
+                record['insertions'] += added
+                record['deletions'] += deleted
+                record['files'].append((path.decode(), old_path, added, deleted))
+        if record is not None:
+            yield record
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+def commit_datetime(timestamp, tz_minutes):
+    """Rebuild the author date in the author's own timezone"""
+    return datetime.fromtimestamp(timestamp, timezone(timedelta(minutes=tz_minutes)))
+
+class CommitIndex:
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        if self.db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            # The index only caches git data, so an old layout is dropped rather than migrated
+            self.db.executescript(''.join(f'DROP TABLE IF EXISTS {table};' for table in TABLES))
+            self.db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.db.executescript(SCHEMA)
+        self._path_ids = None
+        self._resolved = {}
+        self.git = GitSession()
+
+    def close(self):
+        self.db.close()
+        self.git.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM commits').fetchone()[0]
+
+    def lookup(self, commit):
+        """Return the full hash of an indexed commit, or None"""
+        row = self.db.execute('SELECT hash FROM commits WHERE hash = ?', (commit,)).fetchone()
+        return row[0] if row else None
+
+    def resolve(self, commit):
+        """Resolve a revision to a full hash, skipping git when the hash is already indexed"""
+        if commit not in self._resolved:
+            resolved = self.lookup(commit) or self.git.resolve(commit)
+            if resolved is None:
+                raise ValueError(f"unknown revision '{commit}'")
+            self._resolved[commit] = resolved
+        return self._resolved[commit]
+
+    def _live_tips(self):
+        """Indexed tips that still exist in the repository (history may have been rewritten)"""
+        tips = [row[0] for row in self.db.execute('SELECT hash FROM tips')]
+        if not tips:
+            return []
+        return [info.oid for info in self.git.info(tips) if info and info.type == 'commit']
+
+    def _path_id(self, path):
+        if self._path_ids is None:
+            self._path_ids = dict(self.db.execute('SELECT path, id FROM paths'))
+        path_id = self._path_ids.get(path)
+        if path_id is None:
+            path_id = self.db.execute('INSERT INTO paths (path) VALUES (?)', (path,)).lastrowid
+            self._path_ids[path] = path_id
+        return path_id
+
+    def update(self, revs=('HEAD',)):
+        """Ingest every commit reachable from `revs` that is not indexed yet"""
+        hashes = [self.resolve(rev) for rev in revs]
+        missing = [h for h in hashes if not self.lookup(h)]
+        if not missing:
+            return 0
+
+        count = 0
+        with phase('ingest commits'), self.db:
+            for record in iter_numstat_log(missing, exclude=self._live_tips()):
+                if self.lookup(record['hash']):
+                    continue
+                commit_id = self.db.execute(
+                    'INSERT INTO commits (hash, author, author_name, author_date, author_tz, commit_date, '
+                    'insertions, deletions) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (record['hash'], record['author'], record['author_name'], record['author_date'],
+                     record['author_tz'], record['commit_date'], record['insertions'], record['deletions'])
+                ).lastrowid
+                self.db.executemany(
+                    'INSERT INTO parents (child, parent) VALUES (?, ?)',
+                    [(record['hash'], parent) for parent in record['parents']]
+                )
+                self.db.executemany(
+                    'INSERT INTO commit_files (commit_id, path_id, old_path_id, insertions, deletions) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(commit_id, self._path_id(path), self._path_id(old) if old else None, added, deleted)
+                     for path, old, added, deleted in record['files']]
+                )
+                count += 1
+            self.db.executemany('INSERT OR IGNORE INTO tips (hash) VALUES (?)', [(h,) for h in missing])
+        return count
+
+    def _select_range(self, commit1, commit2):
+        """Fill the temporary `range_commits` table with the ids of commit1..commit2"""
+        with phase('select range'):
+            commit1, commit2 = self.resolve(commit1), self.resolve(commit2)
+            self.db.execute('DROP TABLE IF EXISTS temp.range_commits')
+            # Both ancestor sets are walked by SQLite over the parents table; UNION visits each commit once
+            self.db.execute("""
+                CREATE TEMP TABLE range_commits AS
+                WITH RECURSIVE
+                    included(hash) AS (
+                        VALUES (:commit2)
+                        UNION SELECT parents.parent FROM parents JOIN included ON parents.child = included.hash
+                    ),
+                    excluded(hash) AS (
+                        VALUES (:commit1)
+                        UNION SELECT parents.parent FROM parents JOIN excluded ON parents.child = excluded.hash
+                    )
+                SELECT commits.id AS id FROM commits
+                WHERE commits.hash IN (SELECT hash FROM included EXCEPT SELECT hash FROM excluded)
+            """, {'commit1': commit1, 'commit2': commit2})
+
+    def commits_in_range(self, commit1, commit2):
+        """Return the commits of commit1..commit2, newest first, as dicts; `commit_date` is in epoch seconds"""
+        self._select_range(commit1, commit2)
+        rows = self.db.execute("""
+            SELECT hash, author, author_name, author_date, author_tz, commit_date, insertions, deletions
+            FROM commits WHERE id IN (SELECT id FROM range_commits)
+            ORDER BY author_date DESC, id
+        """)
+        return [
+            {
+                'hash': commit_hash,
+                'author': author,
+                'author_name': author_name,
+                'date': commit_datetime(timestamp, tz),
+                'commit_date': commit_date,
+                'insertions': insertions,
+                'deletions': deletions
+            }
+            for commit_hash, author, author_name, timestamp, tz, commit_date, insertions, deletions in rows
+        ]
+
+    def author_counts(self, commit1, commit2):
+        """Number of commits per author (mailmap applied) in commit1..commit2"""
+        self._select_range(commit1, commit2)
+        return dict(self.db.execute("""
+            SELECT author, COUNT(*) FROM commits
+            WHERE id IN (SELECT id FROM range_commits) GROUP BY author
+        """))
+
+    def file_counts(self, commit1, commit2):
+        """Number of commits touching each path in commit1..commit2, counting both sides of renames"""
+        self._select_range(commit1, commit2)
+        file_counts = defaultdict(int)
+        for path, count in self.db.execute("""
+            SELECT paths.path, COUNT(*) FROM (
+                SELECT commit_id, path_id FROM commit_files
+                UNION SELECT commit_id, old_path_id FROM commit_files WHERE old_path_id IS NOT NULL
+            ) AS touched
+            JOIN paths ON paths.id = touched.path_id
+            WHERE touched.commit_id IN (SELECT id FROM range_commits)
+            GROUP BY paths.path
+        """):
+            file_counts[path] = count
+        return file_counts
+
+    def iter_author_files(self, commit1, commit2):
+        """Yield (author name, files) for every commit in commit1..commit2"""
+        self._select_range(commit1, commit2)
+        files = defaultdict(list)
+        for commit_id, path in self.db.execute("""
+            SELECT commit_id, paths.path FROM commit_files
+            JOIN paths ON paths.id = commit_files.path_id
+            WHERE commit_id IN (SELECT id FROM range_commits)
+        """):
+            files[commit_id].append(path)
+        for commit_id, author_name in self.db.execute("""
+            SELECT id, author_name FROM commits WHERE id IN (SELECT id FROM range_commits)
+        """):
+            yield author_name, files.get(commit_id, [])
+
+def open_index(path, *revs):
+    """Open the index at `path` and make sure `revs` are ingested"""
+    index = CommitIndex(path)
+    index.update(revs)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or update the shared commit index')
+    parser.add_argument('revs', nargs='*', default=['HEAD'], help='Revisions whose history to ingest')
+    parser.add_argument('--index', default='commit_index.sqlite', help='Index file')
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+    start_profile(args, 'commit_index')
+
+    existed = os.path.exists(args.index)
+    with CommitIndex(args.index) as index:
+        try:
+            added = index.update(args.revs)
+        except (subprocess.CalledProcessError, ValueError) as e:
+            print(f"Error updating index: {e}")
+            sys.exit(1)
+        print(f"{'Updated' if existed else 'Built'} {args.index}: {added} new commits, {len(index)} total")
+
+if __name__ == "__main__":
+    main()
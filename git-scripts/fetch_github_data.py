@@ -4,17 +4,223 @@ GitHub Data Fetcher for Scala 3 (Dotty) Repository
 Fetches comprehensive data using GitHub CLI for visualization purposes.
 """
 
+import argparse
+import codecs
+import gzip
+import lzma
 import subprocess
 import json
 import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator
+
+from instrumentation import add_profile_argument, phase, start_profile
+
+SYNC_STATE_FILE = "scala3_sync_state.json"
+
+DATASET_SUFFIXES = [".json", ".ndjson", ".ndjson.gz", ".ndjson.xz"]
+COMPRESSED_OPENERS = {".gz": gzip.open, ".xz": lzma.open}
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "xz": ".xz"}
+
+def find_dataset(filepath: str):
+    """Return the newest stored variant (.json, .ndjson, .ndjson.gz, .ndjson.xz) of a dataset, or None."""
+    base = filepath[:-len(".json")] if filepath.endswith(".json") else filepath
+    candidates = [base + suffix for suffix in DATASET_SUFFIXES if os.path.exists(base + suffix)]
+    return max(candidates, key=os.path.getmtime, default=None)
+
+def open_text(path: str, mode: str = "r"):
+    """Open a possibly gzip/xz compressed text file."""
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(path)[1])
+    if opener:
+        return opener(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def iter_ndjson(path: str) -> Iterator[Dict]:
+    """Yield the records of a possibly compressed NDJSON file one at a time."""
+    with open_text(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def read_dataset(path: str) -> Any:
+    """Read a dataset written either as JSON or as (compressed) NDJSON."""
+    if path.endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return list(iter_ndjson(path))
+
+class JSONStream:
+    """Decode a large JSON document from a text file piece by piece.
+
+    Array elements and object members are decoded one at a time from a
+    buffer that only grows while the current value is incomplete.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size: int) -> bool:
+        chunk = self.f.read(size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read(self.chunk_size):
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number ending at the buffer boundary may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Doubling the pending text keeps decoding large values linear
+            self._read(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def skip(self):
+        """Skip the next value, dropping array elements as they are decoded."""
+        if self.peek() == "[":
+            for _ in self.iter_array():
+                pass
+        else:
+            self.value()
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+    def find_key(self, key: str) -> bool:
+        """Advance to the value of `key` in the object starting at the current position."""
+        self.expect("{")
+        if self.peek() == "}":
+            return False
+        while True:
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.skip()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return False
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self.buffer, self.pos - 1)
+
+def iter_dataset(path: str, key: str = None) -> Iterator[Any]:
+    """Yield the records of a dataset one at a time.
+
+    NDJSON is read line by line; for JSON the top-level array (or the array
+    stored under `key` of the top-level object) is decoded element by element.
+    """
+    if not path.endswith(".json"):
+        yield from iter_ndjson(path)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JSONStream(f)
+        if key is None or stream.find_key(key):
+            yield from stream.iter_array()
+
+def read_dataset_key(path: str, key: str, default: Any = None) -> Any:
+    """Read the value of one top-level key of a JSON object without decoding the rest."""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JSONStream(f)
+        return stream.value() if stream.find_key(key) else default
+
+def project_login(user: Dict) -> Dict:
+    return {"login": user.get("login")} if user else None
+
+def project_issue(issue: Dict) -> Dict:
+    """Keep the issue fields read by process_issues_for_visualization and DataExplorer."""
+    return {
+        "id": issue.get("id"),
+        "number": issue.get("number"),
+        "title": issue.get("title"),
+        "state": issue.get("state"),
+        "created_at": issue.get("created_at"),
+        "updated_at": issue.get("updated_at"),
+        "closed_at": issue.get("closed_at"),
+        "labels": [{"name": label.get("name")} for label in issue.get("labels", [])],
+        "assignees": [project_login(assignee) for assignee in issue.get("assignees", [])],
+        "comments": issue.get("comments", 0),
+        "user": project_login(issue.get("user")),
+        "body_length": issue.get("body_length", len(issue.get("body") or "")),
+        "milestone": {"title": issue["milestone"].get("title")} if issue.get("milestone") else None
+    }
+
+def project_pull_request(pr: Dict) -> Dict:
+    return {
+        "id": pr.get("id"),
+        "number": pr.get("number"),
+        "title": pr.get("title"),
+        "state": pr.get("state"),
+        "created_at": pr.get("created_at"),
+        "updated_at": pr.get("updated_at"),
+        "closed_at": pr.get("closed_at"),
+        "merged_at": pr.get("merged_at"),
+        "user": project_login(pr.get("user")),
+        "labels": [{"name": label.get("name")} for label in pr.get("labels", [])]
+    }
+
+PROJECTIONS = {
+    "issues": project_issue,
+    "prs": project_pull_request,
+    "contributors": lambda c: {key: c.get(key) for key in ("login", "contributions", "avatar_url")},
+    "releases": lambda r: {key: r.get(key) for key in ("name", "tag_name", "published_at", "prerelease")},
+    "labels": lambda l: {key: l.get(key) for key in ("name", "color", "description")}
+}
 
 class GitHubDataFetcher:
-    def __init__(self, repo: str = "scala/scala3", output_dir: str = "app"):
+    def __init__(self, repo: str = "scala/scala3", output_dir: str = "app",
+                 concurrency: int = 4, gh: str = "gh", stream: bool = False, sync: bool = False,
+                 project: bool = False, compression: str = None):
         self.repo = repo
         self.output_dir = output_dir
+        self.concurrency = concurrency
+        self.gh = gh
+        self.stream = stream
+        self.sync = sync
+        self.project = project
+        self.compression = compression
         self.ensure_output_dir()
     
     def ensure_output_dir(self):
@@ -22,27 +228,72 @@ class GitHubDataFetcher:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
     
+    def build_url(self, api_path: str, params: Dict[str, Any] = None) -> str:
+        """Build the API URL for a repository endpoint."""
+        url = f"repos/{self.repo}/{api_path}"
+        if params:
+            param_str = "&".join([f"{k}={v}" for k, v in params.items()])
+            url += f"?{param_str}"
+        return url
+    
+    def iter_gh_command(self, api_path: str, params: Dict[str, Any] = None) -> Iterator[Dict]:
+        """Run a paginated GitHub CLI command and yield records page by page.
+        
+        `gh api --paginate` writes the pages back to back, which is not a
+        single JSON document, so each page is decoded as soon as it has fully
+        arrived and only one page is held in memory at a time.
+        """
+        url = self.build_url(api_path, params)
+        print(f"Fetching: {url}")
+        
+        cmd = [self.gh, "api", url, "--paginate"]
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8")()
+        
+        with tempfile.TemporaryFile() as stderr:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+            try:
+                buffer = ""
+                next_attempt = 0  # buffer size at which to try decoding again
+                eof = False
+                while not eof:
+                    chunk = proc.stdout.read1(1 << 16)
+                    eof = not chunk
+                    buffer += text_decoder.decode(chunk, final=eof)
+                    # Retrying only after the buffer doubled keeps large pages linear to decode
+                    while buffer and (eof or len(buffer) >= next_attempt):
+                        start = len(buffer) - len(buffer.lstrip())
+                        if start == len(buffer):
+                            buffer = ""
+                            break
+                        try:
+                            page, end = decoder.raw_decode(buffer, start)
+                        except json.JSONDecodeError:
+                            if eof and proc.wait() == 0:
+                                raise
+                            next_attempt = 2 * len(buffer)
+                            break
+                        buffer = buffer[end:]
+                        next_attempt = 0
+                        if isinstance(page, list):
+                            yield from page
+                        else:
+                            yield page
+                if proc.wait() != 0:
+                    stderr.seek(0)
+                    raise subprocess.CalledProcessError(
+                        proc.returncode, cmd, stderr=stderr.read().decode(errors="replace")
+                    )
+            finally:
+                proc.stdout.close()
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
+    
     def run_gh_command(self, api_path: str, params: Dict[str, Any] = None) -> List[Dict]:
         """Run GitHub CLI command and return parsed JSON data."""
         try:
-            # Build the API URL
-            url = f"repos/{self.repo}/{api_path}"
-            if params:
-                param_str = "&".join([f"{k}={v}" for k, v in params.items()])
-                url += f"?{param_str}"
-            
-            print(f"Fetching: {url}")
-            
-            # Run the gh command
-            result = subprocess.run(
-                ["gh", "api", url, "--paginate"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Parse JSON response
-            return json.loads(result.stdout)
+            return list(self.iter_gh_command(api_path, params))
         
         except subprocess.CalledProcessError as e:
             print(f"Error running gh command: {e}")
@@ -52,8 +303,8 @@ class GitHubDataFetcher:
             print(f"Error parsing JSON: {e}")
             return []
     
-    def fetch_issues(self, state: str = "open") -> List[Dict]:
-        """Fetch issues with specified state."""
+    def fetch_issues(self, state: str = "open", stream: bool = False) -> List[Dict]:
+        """Fetch issues with specified state (as a record iterator when streaming)."""
         print(f"Fetching {state} issues...")
         
         params = {
@@ -63,13 +314,16 @@ class GitHubDataFetcher:
             "direction": "desc"
         }
         
+        if stream:
+            return self.iter_gh_command("issues", params)
+        
         issues = self.run_gh_command("issues", params)
         
         print(f"Fetched {len(issues)} {state} issues")
         return issues
     
-    def fetch_pull_requests(self, state: str = "open") -> List[Dict]:
-        """Fetch pull requests with specified state."""
+    def fetch_pull_requests(self, state: str = "open", stream: bool = False) -> List[Dict]:
+        """Fetch pull requests with specified state (as a record iterator when streaming)."""
         print(f"Fetching {state} pull requests...")
         
         params = {
@@ -79,19 +333,25 @@ class GitHubDataFetcher:
             "direction": "desc"
         }
         
+        if stream:
+            return self.iter_gh_command("pulls", params)
+        
         prs = self.run_gh_command("pulls", params)
         
         print(f"Fetched {len(prs)} {state} pull requests")
         return prs
     
-    def fetch_contributors(self) -> List[Dict]:
-        """Fetch repository contributors."""
+    def fetch_contributors(self, stream: bool = False) -> List[Dict]:
+        """Fetch repository contributors (as a record iterator when streaming)."""
         print("Fetching contributors...")
         
         params = {
             "per_page": 100
         }
         
+        if stream:
+            return self.iter_gh_command("contributors", params)
+        
         contributors = self.run_gh_command("contributors", params)
         
         print(f"Fetched {len(contributors)} contributors")
@@ -103,7 +363,7 @@ class GitHubDataFetcher:
         
         try:
             result = subprocess.run(
-                ["gh", "api", f"repos/{self.repo}"],
+                [self.gh, "api", f"repos/{self.repo}"],
                 capture_output=True,
                 text=True,
                 check=True
@@ -117,27 +377,33 @@ class GitHubDataFetcher:
             print(f"Error fetching repository info: {e}")
             return {}
     
-    def fetch_releases(self) -> List[Dict]:
-        """Fetch repository releases."""
+    def fetch_releases(self, stream: bool = False) -> List[Dict]:
+        """Fetch repository releases (as a record iterator when streaming)."""
         print("Fetching releases...")
         
         params = {
             "per_page": 100
         }
         
+        if stream:
+            return self.iter_gh_command("releases", params)
+        
         releases = self.run_gh_command("releases", params)
         
         print(f"Fetched {len(releases)} releases")
         return releases
     
-    def fetch_labels(self) -> List[Dict]:
-        """Fetch repository labels."""
+    def fetch_labels(self, stream: bool = False) -> List[Dict]:
+        """Fetch repository labels (as a record iterator when streaming)."""
         print("Fetching labels...")
         
         params = {
             "per_page": 100
         }
         
+        if stream:
+            return self.iter_gh_command("labels", params)
+        
         labels = self.run_gh_command("labels", params)
         print(f"Fetched {len(labels)} labels")
         return labels
@@ -147,119 +413,414 @@ class GitHubDataFetcher:
         filepath = os.path.join(self.output_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with phase("save"), open(filepath, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             print(f"Saved data to {filepath}")
         except Exception as e:
             print(f"Error saving data to {filepath}: {e}")
     
-    def process_issues_for_visualization(self, issues: List[Dict]) -> Dict:
+    def stream_ndjson(self, records: Iterable[Dict], filename: str, kind: str = None) -> Iterator[Dict]:
+        """Write records to an NDJSON file as they pass through.
+        
+        With projection enabled only the fields of `kind` that are read later
+        are written; the file is compressed according to `self.compression`.
+        Records go to a temporary file in the same directory that replaces
+        the dataset only once all of them are written, so a failed fetch
+        leaves the last complete dataset in place.
+        """
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        filepath = os.path.join(self.output_dir, filename + suffix)
+        projection = PROJECTIONS.get(kind) if self.project else None
+        
+        temppath = os.path.join(self.output_dir, f".{filename}.part{suffix}")
+        try:
+            with open_text(temppath, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(projection(record) if projection else record, ensure_ascii=False))
+                    f.write("\n")
+                    yield record
+            os.replace(temppath, filepath)
+        except BaseException:
+            if os.path.exists(temppath):
+                os.unlink(temppath)
+            raise
+        print(f"Saved data to {filepath}")
+    
+    def save_ndjson(self, records: Iterable[Dict], filename: str, kind: str = None) -> int:
+        """Stream records to an NDJSON file and return how many were written."""
+        try:
+            return sum(1 for _ in self.stream_ndjson(records, filename, kind))
+        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            print(f"Error streaming {filename}: {e}")
+            return 0
+    
+    def stream_issues(self, state: str) -> int:
+        """Stream issues to raw NDJSON while processing them for visualization."""
+        try:
+            raw = self.stream_ndjson(
+                self.fetch_issues(state, stream=True), f"scala3_{state}_issues_raw.ndjson", "issues")
+            processed = self.process_issues_for_visualization(raw)
+        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+            print(f"Error streaming {state} issues: {e}")
+            return 0
+        
+        if processed["total_count"]:
+            self.save_data(processed, f"scala3_{state}_issues.json")
+        return processed["total_count"]
+    
+    def process_issues_for_visualization(self, issues: Iterable[Dict]) -> Dict:
         """Process issues data for visualization."""
         processed = {
-            "total_count": len(issues),
+            "total_count": 0,
             "issues": [],
             "labels_stats": {},
             "monthly_stats": {},
             "assignee_stats": {}
         }
         
-        for issue in issues:
-            # Extract relevant fields
-            issue_data = {
-                "id": issue.get("id"),
-                "number": issue.get("number"),
-                "title": issue.get("title", "")[:100],  # Truncate long titles
-                "state": issue.get("state"),
-                "created_at": issue.get("created_at"),
-                "updated_at": issue.get("updated_at"),
-                "closed_at": issue.get("closed_at"),
-                "labels": [label.get("name") for label in issue.get("labels", [])],
-                "assignees": [assignee.get("login") for assignee in issue.get("assignees", [])],
-                "comments": issue.get("comments", 0),
-                "author": issue.get("user", {}).get("login", "unknown"),
-                "body_length": len(issue.get("body") or ""),
-                "milestone": issue.get("milestone", {}).get("title") if issue.get("milestone") else None
-            }
+        with phase("process issues"):
+            for issue in issues:
+                # Extract relevant fields
+                issue_data = {
+                    "id": issue.get("id"),
+                    "number": issue.get("number"),
+                    "title": issue.get("title", "")[:100],  # Truncate long titles
+                    "state": issue.get("state"),
+                    "created_at": issue.get("created_at"),
+                    "updated_at": issue.get("updated_at"),
+                    "closed_at": issue.get("closed_at"),
+                    "labels": [label.get("name") for label in issue.get("labels", [])],
+                    "assignees": [assignee.get("login") for assignee in issue.get("assignees", [])],
+                    "comments": issue.get("comments", 0),
+                    "author": (issue.get("user") or {}).get("login", "unknown"),
+                    "body_length": issue.get("body_length", len(issue.get("body") or "")),
+                    "milestone": issue.get("milestone", {}).get("title") if issue.get("milestone") else None
+                }
             
-            processed["issues"].append(issue_data)
+                processed["issues"].append(issue_data)
             
-            # Collect label statistics
-            for label in issue_data["labels"]:
-                processed["labels_stats"][label] = processed["labels_stats"].get(label, 0) + 1
+                # Collect label statistics
+                for label in issue_data["labels"]:
+                    processed["labels_stats"][label] = processed["labels_stats"].get(label, 0) + 1
             
-            # Collect monthly statistics
-            if issue_data["created_at"]:
-                month = issue_data["created_at"][:7]  # YYYY-MM format
-                processed["monthly_stats"][month] = processed["monthly_stats"].get(month, 0) + 1
+                # Collect monthly statistics
+                if issue_data["created_at"]:
+                    month = issue_data["created_at"][:7]  # YYYY-MM format
+                    processed["monthly_stats"][month] = processed["monthly_stats"].get(month, 0) + 1
             
-            # Collect assignee statistics
-            for assignee in issue_data["assignees"]:
-                processed["assignee_stats"][assignee] = processed["assignee_stats"].get(assignee, 0) + 1
+                # Collect assignee statistics
+                for assignee in issue_data["assignees"]:
+                    processed["assignee_stats"][assignee] = processed["assignee_stats"].get(assignee, 0) + 1
         
+        processed["total_count"] = len(processed["issues"])
         return processed
     
-    def fetch_all_data(self):
-        """Fetch all data types and save to files."""
-        print(f"Starting data fetch for repository: {self.repo}")
-        print("=" * 50)
+    def fetch_all_buffered(self) -> Dict[str, int]:
+        """Download every endpoint into memory, save JSON files and return record counts."""
+        # Every endpoint is an independent `gh api` call, so download them concurrently
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                "repo_info": executor.submit(self.fetch_repository_info),
+                "open_issues": executor.submit(self.fetch_issues, "open"),
+                "closed_issues": executor.submit(self.fetch_issues, "closed"),
+                "open_prs": executor.submit(self.fetch_pull_requests, "open"),
+                "closed_prs": executor.submit(self.fetch_pull_requests, "closed"),
+                "contributors": executor.submit(self.fetch_contributors),
+                "releases": executor.submit(self.fetch_releases),
+                "labels": executor.submit(self.fetch_labels)
+            }
+            results = {name: future.result() for name, future in futures.items()}
         
-        # Fetch repository information
-        repo_info = self.fetch_repository_info()
+        repo_info = results["repo_info"]
         if repo_info:
             self.save_data(repo_info, "scala3_repo_info.json")
         
-        # Fetch open issues
-        open_issues = self.fetch_issues("open")
+        open_issues = results["open_issues"]
         if open_issues:
             processed_open = self.process_issues_for_visualization(open_issues)
-            self.save_data(open_issues, "scala3_open_issues_raw.json")
+            self.save_records(open_issues, "scala3_open_issues_raw.json", "issues")
             self.save_data(processed_open, "scala3_open_issues.json")
         
-        # Fetch closed issues
-        closed_issues = self.fetch_issues("closed")
+        closed_issues = results["closed_issues"]
         if closed_issues:
             processed_closed = self.process_issues_for_visualization(closed_issues)
-            self.save_data(closed_issues, "scala3_closed_issues_raw.json")
+            self.save_records(closed_issues, "scala3_closed_issues_raw.json", "issues")
             self.save_data(processed_closed, "scala3_closed_issues.json")
         
-        # Fetch open pull requests
-        open_prs = self.fetch_pull_requests("open")
+        open_prs = results["open_prs"]
         if open_prs:
-            self.save_data(open_prs, "scala3_open_prs.json")
+            self.save_records(open_prs, "scala3_open_prs.json", "prs")
         
-        # Fetch closed pull requests
-        closed_prs = self.fetch_pull_requests("closed")
+        closed_prs = results["closed_prs"]
         if closed_prs:
-            self.save_data(closed_prs, "scala3_closed_prs.json")
+            self.save_records(closed_prs, "scala3_closed_prs.json", "prs")
         
-        # Fetch contributors
-        contributors = self.fetch_contributors()
+        contributors = results["contributors"]
         if contributors:
-            self.save_data(contributors, "scala3_contributors.json")
+            self.save_records(contributors, "scala3_contributors.json", "contributors")
         
-        # Fetch releases
-        releases = self.fetch_releases()
+        releases = results["releases"]
         if releases:
-            self.save_data(releases, "scala3_releases.json")
+            self.save_records(releases, "scala3_releases.json", "releases")
         
-        # Fetch labels
-        labels = self.fetch_labels()
+        labels = results["labels"]
         if labels:
-            self.save_data(labels, "scala3_labels.json")
+            self.save_records(labels, "scala3_labels.json", "labels")
+        
+        return {
+            "open_issues": len(open_issues) if open_issues else 0,
+            "closed_issues": len(closed_issues) if closed_issues else 0,
+            "open_prs": len(open_prs) if open_prs else 0,
+            "closed_prs": len(closed_prs) if closed_prs else 0,
+            "contributors": len(contributors) if contributors else 0,
+            "releases": len(releases) if releases else 0,
+            "labels": len(labels) if labels else 0
+        }
+    
+    def fetch_all_streaming(self) -> Dict[str, int]:
+        """Stream every paginated endpoint to NDJSON page by page and return record counts."""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            repo_info = executor.submit(self.fetch_repository_info)
+            futures = {
+                "open_issues": executor.submit(self.stream_issues, "open"),
+                "closed_issues": executor.submit(self.stream_issues, "closed"),
+                "open_prs": executor.submit(
+                    self.save_ndjson, self.fetch_pull_requests("open", stream=True),
+                    "scala3_open_prs.ndjson", "prs"),
+                "closed_prs": executor.submit(
+                    self.save_ndjson, self.fetch_pull_requests("closed", stream=True),
+                    "scala3_closed_prs.ndjson", "prs"),
+                "contributors": executor.submit(
+                    self.save_ndjson, self.fetch_contributors(stream=True),
+                    "scala3_contributors.ndjson", "contributors"),
+                "releases": executor.submit(
+                    self.save_ndjson, self.fetch_releases(stream=True),
+                    "scala3_releases.ndjson", "releases"),
+                "labels": executor.submit(
+                    self.save_ndjson, self.fetch_labels(stream=True),
+                    "scala3_labels.ndjson", "labels")
+            }
+            counts = {name: future.result() for name, future in futures.items()}
+            if repo_info.result():
+                self.save_data(repo_info.result(), "scala3_repo_info.json")
+        
+        return counts
+    
+    def load_records(self, filename: str) -> List[Dict]:
+        """Load a stored list of records from its JSON or (compressed) NDJSON file."""
+        filepath = find_dataset(os.path.join(self.output_dir, filename))
+        if filepath is None:
+            return []
+        try:
+            return read_dataset(filepath)
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            print(f"Error loading {filepath}: {e}")
+            return []
+    
+    def save_records(self, records: List[Dict], filename: str, kind: str = None):
+        """Save a list of raw records as JSON, or as NDJSON when streaming, projecting or compressing."""
+        if self.stream or self.project or self.compression:
+            self.save_ndjson(records, filename.replace(".json", ".ndjson"), kind)
+        else:
+            self.save_data(records, filename)
+    
+    def load_sync_state(self) -> Dict:
+        """Load the per-endpoint sync state (latest updated_at, validators)."""
+        filepath = os.path.join(self.output_dir, SYNC_STATE_FILE)
+        if not os.path.exists(filepath):
+            return {}
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def run_conditional_request(self, url: str, validators: Dict[str, str]) -> tuple:
+        """Run a single-page `gh api` request with If-None-Match / If-Modified-Since.
+        
+        Returns (status, headers, body); the body is None for 304 responses.
+        """
+        cmd = [self.gh, "api", url, "--include"]
+        if validators.get("etag"):
+            cmd += ["-H", f"If-None-Match: {validators['etag']}"]
+        elif validators.get("last_modified"):
+            cmd += ["-H", f"If-Modified-Since: {validators['last_modified']}"]
+        
+        print(f"Fetching (conditional): {url}")
+        # gh exits with an error on 304, so read the status line instead of trusting the exit code
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        head, _, body = result.stdout.replace("\r\n", "\n").partition("\n\n")
+        lines = head.split("\n")
+        if not lines[0].startswith("HTTP/"):
+            raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if status == 304:
+            return status, headers, None
+        if status >= 400:
+            raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+        return status, headers, json.loads(body)
+    
+    @staticmethod
+    def next_page_url(headers: Dict[str, str]) -> str:
+        """URL of the next page from a Link header, or None on the last page."""
+        for link in headers.get("link", "").split(","):
+            target, _, rel = link.partition(";")
+            if rel.strip() == 'rel="next"':
+                return target.strip().strip("<>")
+        return None
+    
+    def sync_conditional(self, name: str, url: str, filename: str, state: Dict) -> tuple:
+        """Refresh a small endpoint only if one of its pages changed since the stored validators.
+        
+        Returns (data, changed). Every page is requested with the validators
+        it had on the previous sync; pages answering 304 are taken from the
+        stored data, whose per-page record counts are kept with the validators.
+        Pages are followed through their Link headers like `--paginate` does.
+        """
+        conditional = state.setdefault("conditional", {})
+        stored = self.load_records(filename)
+        # Without stored data a 304 would leave nothing to fall back on
+        previous = conditional.get(name, {}).get("pages", []) if stored else []
+        pages = []
+        data = None
+        offset = 0  # Position of the current page in the stored data
+        while url:
+            validators = previous[len(pages)] if len(pages) < len(previous) else {}
+            try:
+                status, headers, body = self.run_conditional_request(url, validators)
+                if status == 304:
+                    count = validators.get("count")
+                    body = stored if count is None else stored[offset:offset + count]
+                    if count is not None and len(body) != count:
+                        # The stored data does not match its validators
+                        status, headers, body = self.run_conditional_request(url, {})
+            except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+                print(f"Error fetching {name}: {e}")
+                return stored, False
+            
+            offset += validators.get("count") or 0
+            if status != 304:
+                validators = {
+                    "etag": headers.get("etag"),
+                    "last_modified": headers.get("last-modified"),
+                    "count": len(body) if isinstance(body, list) else None,
+                    # 304 responses need not repeat the Link header
+                    "next": self.next_page_url(headers)
+                }
+            pages.append(validators)
+            if isinstance(body, list):
+                data = data if isinstance(data, list) else []
+                data.extend(body)
+            else:
+                data = body
+            url = validators["next"]
+        
+        if pages == previous:
+            print(f"{name}: not modified")
+            return stored, False
+        conditional[name] = {"pages": pages}
+        return data, True
+    
+    def sync_updated(self, api_path: str, since: str, stop_at_since: bool) -> List[Dict]:
+        """Fetch the items of an endpoint updated since `since` (all items without it).
+        
+        Endpoints without a `since` parameter are read newest-updated first and
+        the download stops at the first item older than `since`.
+        """
+        params = {"state": "all", "per_page": 100, "sort": "updated", "direction": "desc"}
+        if since and not stop_at_since:
+            params["since"] = since
+        
+        updated = []
+        for item in self.iter_gh_command(api_path, params):
+            if since and stop_at_since and item.get("updated_at", "") < since:
+                break
+            updated.append(item)
+        return updated
+    
+    @staticmethod
+    def merge_by_id(stored: List[Dict], updated: List[Dict]) -> tuple:
+        """Merge updated items into stored ones by id and split them by state."""
+        merged = {item["id"]: item for item in stored}
+        for item in updated:
+            merged[item["id"]] = item
+        
+        items = sorted(merged.values(), key=lambda item: item.get("updated_at") or "", reverse=True)
+        open_items = [item for item in items if item.get("state") == "open"]
+        closed_items = [item for item in items if item.get("state") != "open"]
+        return open_items, closed_items
+    
+    @staticmethod
+    def latest_updated_at(items: Iterable[Dict]) -> str:
+        return max((item.get("updated_at") or "" for item in items), default="")
+    
+    def sync_all(self) -> Dict[str, int]:
+        """Refresh stored datasets with only the items changed since the last sync."""
+        state = self.load_sync_state()
+        counts = {}
+        
+        for name, api_path, stop_at_since in [("issues", "issues", False), ("prs", "pulls", True)]:
+            raw_name = "issues_raw" if name == "issues" else "prs"
+            stored = (self.load_records(f"scala3_open_{raw_name}.json")
+                      + self.load_records(f"scala3_closed_{raw_name}.json"))
+            since = state.get(name, {}).get("updated_at") or self.latest_updated_at(stored)
+            
+            print(f"Syncing {name} updated since {since or 'the beginning'}...")
+            try:
+                updated = self.sync_updated(api_path, since, stop_at_since)
+            except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+                print(f"Error fetching updated {name}: {e}")
+                counts[f"open_{name}"] = counts[f"closed_{name}"] = 0
+                continue
+            print(f"Fetched {len(updated)} updated {name}")
+            
+            open_items, closed_items = self.merge_by_id(stored, updated)
+            state[name] = {"updated_at": self.latest_updated_at(open_items + closed_items)}
+            counts[f"open_{name}"], counts[f"closed_{name}"] = len(open_items), len(closed_items)
+            
+            if updated or not stored:
+                for item_state, items in [("open", open_items), ("closed", closed_items)]:
+                    self.save_records(items, f"scala3_{item_state}_{raw_name}.json", name)
+                    if name == "issues":
+                        self.save_data(self.process_issues_for_visualization(items),
+                                       f"scala3_{item_state}_issues.json")
+        
+        repo_info, changed = self.sync_conditional(
+            "repo_info", f"repos/{self.repo}", "scala3_repo_info.json", state)
+        if changed and repo_info:
+            self.save_data(repo_info, "scala3_repo_info.json")
+        
+        for name in ["contributors", "releases", "labels"]:
+            filename = f"scala3_{name}.json"
+            data, changed = self.sync_conditional(
+                name, self.build_url(name, {"per_page": 100}), filename, state)
+            if changed and data:
+                self.save_records(data, filename, name)
+            counts[name] = len(data or [])
+        
+        self.save_data(state, SYNC_STATE_FILE)
+        return counts
+    
+    def fetch_all_data(self):
+        """Fetch all data types and save to files."""
+        print(f"Starting data fetch for repository: {self.repo}")
+        print("=" * 50)
+        
+        if self.sync:
+            data_summary = self.sync_all()
+        elif self.stream:
+            data_summary = self.fetch_all_streaming()
+        else:
+            data_summary = self.fetch_all_buffered()
         
         # Create summary statistics
         summary = {
             "repository": self.repo,
             "fetch_date": datetime.now().isoformat(),
-            "data_summary": {
-                "open_issues": len(open_issues) if open_issues else 0,
-                "closed_issues": len(closed_issues) if closed_issues else 0,
-                "open_prs": len(open_prs) if open_prs else 0,
-                "closed_prs": len(closed_prs) if closed_prs else 0,
-                "contributors": len(contributors) if contributors else 0,
-                "releases": len(releases) if releases else 0,
-                "labels": len(labels) if labels else 0
-            }
+            "data_summary": data_summary
         }
         
         self.save_data(summary, "scala3_data_summary.json")
@@ -273,9 +834,26 @@ class GitHubDataFetcher:
 
 def main():
     """Main function to run the data fetcher."""
+    parser = argparse.ArgumentParser(description="Fetch Scala 3 repository data with the GitHub CLI")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Maximum number of gh api calls running at the same time")
+    parser.add_argument("--gh", default=os.environ.get("GH_BIN", "gh"),
+                        help="GitHub CLI executable (defaults to $GH_BIN or gh)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Decode pages as they arrive and write raw records as NDJSON")
+    parser.add_argument("--project", action="store_true",
+                        help="Only keep the raw fields used by the analysis when saving datasets")
+    parser.add_argument("--compression", choices=["gzip", "xz"],
+                        help="Save raw datasets as compressed NDJSON")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only fetch items changed since the last run and merge them into the stored data")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile(args, "fetch_github_data")
+    
     # Check if GitHub CLI is available
     try:
-        subprocess.run(["gh", "--version"], capture_output=True, check=True)
+        subprocess.run([args.gh, "--version"], capture_output=True, check=True)
         print("GitHub CLI found ✓")
     except (subprocess.CalledProcessError, FileNotFoundError):
         print("Error: GitHub CLI (gh) is not installed or not in PATH")
@@ -284,7 +862,7 @@ def main():
     
     # Check if user is authenticated
     try:
-        result = subprocess.run(["gh", "auth", "status"], capture_output=True, check=True)
+        result = subprocess.run([args.gh, "auth", "status"], capture_output=True, check=True)
         print("GitHub CLI authenticated ✓")
     except subprocess.CalledProcessError:
         print("Error: Not authenticated with GitHub CLI")
@@ -292,8 +870,10 @@ def main():
         sys.exit(1)
     
     # Create fetcher and run
-    fetcher = GitHubDataFetcher()
-    fetcher.fetch_all_data()
+    fetcher = GitHubDataFetcher(concurrency=args.concurrency, gh=args.gh, stream=args.stream, sync=args.sync,
+                                project=args.project, compression=args.compression)
+    with phase("fetch"):
+        fetcher.fetch_all_data()
 
 if __name__ == "__main__":
     main()
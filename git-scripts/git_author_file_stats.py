@@ -1,57 +1,60 @@
-import subprocess
+import argparse
 import sys
 from collections import defaultdict
 
-def check_commit_exists(commit):
-    try:
-        subprocess.check_output(
-            ['git', 'cat-file', '-e', f'{commit}^{{commit}}'],
-            stderr=subprocess.STDOUT
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
+from commit_index import open_index
+from git_file_changes import iter_log_records
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
 
-def get_commit_author_files(commit):
-    lines = subprocess.check_output(
-        ['git', 'show', commit, '--pretty=format:%an', '--name-only'],
-        text=True
-    ).splitlines()
-    author = lines[0].strip()
-    files = [f.strip() for f in lines[1:] if f.strip()]
-    return author, files
+def iter_commit_author_files(commit1, commit2):
+    """Yield (author, files) for every commit in commit1..commit2 from a single git log stream.
 
-def get_intermediate_commits(commit1, commit2):
-    revs = subprocess.check_output(
-        ['git', 'rev-list', f'{commit1}..{commit2}'],
-        text=True
-    ).splitlines()
-    return revs
+    Mirrors `git show <commit> --pretty=format:%an --name-only`: renames report
+    the new path, root commits list all their files and merges use the dense
+    combined diff.
+    """
+    cmd = [
+        'git', 'log', '-z', '--cc', '--name-only',
+        '--format=%x00%H%x00%an%x00%P', f'{commit1}..{commit2}'
+    ]
+    for (_, author, _), files in iter_log_records(cmd, 3, parents_field=2):
+        yield author.strip(), files
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python git_author_stats.py commit1 commit2")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Count modules touched by each author between two commits')
+    parser.add_argument('commit1')
+    parser.add_argument('commit2')
+    parser.add_argument('--index', help='Answer from the shared commit index at this path')
+    add_profile_argument(parser)
 
-    commit1, commit2 = sys.argv[1], sys.argv[2]
+    args = parser.parse_args()
+    start_profile(args, 'git_author_file_stats')
+    commit1, commit2 = args.commit1, args.commit2
 
-    for commit in [commit1, commit2]:
-        if not check_commit_exists(commit):
-            print(f"Error: Commit '{commit}' does not exist.")
-            sys.exit(1)
+    with phase('check commits'), GitSession() as git:
+        for commit, resolved in zip([commit1, commit2], git.resolve_all([commit1, commit2])):
+            if resolved is None:
+                print(f"Error: Commit '{commit}' does not exist.")
+                sys.exit(1)
 
     def get_module(file):
         tmp = file.split("/")
         return tmp[3] if len(tmp) > 3 else tmp[-1]
     
     author_modules = defaultdict(set)
-    commits = get_intermediate_commits(commit1, commit2)
 
-    for commit in commits:
-        author, files = get_commit_author_files(commit)
-        for file in files:
-            module = get_module(file)
-            author_modules[author].add(module)
+    with phase('collect modules'):
+        if args.index:
+            with open_index(args.index, commit1, commit2) as index:
+                records = list(index.iter_author_files(commit1, commit2))
+        else:
+            records = iter_commit_author_files(commit1, commit2)
+
+        for author, files in records:
+            for file in files:
+                module = get_module(file)
+                author_modules[author].add(module)
 
     author_counts = {author: len(modules) for author, modules in author_modules.items()}
     sorted_authors = sorted(author_counts.items(), key=lambda x: (-x[1], x[0]))
@@ -1,16 +1,13 @@
+import argparse
+import re
 import subprocess
 import sys
 from collections import defaultdict
 
-def check_commit_exists(commit):
-    try:
-        subprocess.check_output(
-            ['git', 'cat-file', '-e', f'{commit}^{{commit}}'],
-            stderr=subprocess.STDOUT
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
+from author_range_index import open_index as open_range_index, parse_date
+from commit_index import iter_numstat_log, open_index
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
 
 def get_commit_authors(commit1, commit2):
     authors = subprocess.check_output(
@@ -19,28 +16,108 @@ def get_commit_authors(commit1, commit2):
     ).splitlines()
     return [a.strip() for a in authors if a.strip()]
 
+def get_author_line_stats(commit1, commit2):
+    """{author: (commits, lines)} of commit1..commit2 from git"""
+    stats = defaultdict(lambda: (0, 0))
+    for record in iter_numstat_log([commit2], exclude=[commit1]):
+        if record['author']:
+            commits, lines = stats[record['author']]
+            stats[record['author']] = (commits + 1, lines + record['insertions'] + record['deletions'])
+    return dict(stats)
+
+def is_date(value):
+    return re.match(r'\d{4}-\d{2}-\d{2}', value) is not None
+
+def read_batch(path):
+    """(from, to) pairs of a batch file: two revisions or two ISO dates per line, '#' starts a comment"""
+    with (sys.stdin if path == '-' else open(path)) as f:
+        lines = [line.split('#', 1)[0].split() for line in f]
+    return [tuple(line) for line in lines if line]
+
+def print_author_stats(stats, with_lines):
+    sorted_authors = sorted(stats.items(), key=lambda x: (-x[1][0], x[0]))
+    max_width = max(len(a) for a in stats.keys()) if stats else 0
+
+    for author, (count, lines) in sorted_authors:
+        print(f"{author:<{max_width}} : {count}" + (f" ({lines} lines)" if with_lines else ""))
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python git_author_stats.py commit1 commit2")
+    parser = argparse.ArgumentParser(description='Count commits per author between two commits')
+    parser.add_argument('commit1', nargs='?')
+    parser.add_argument('commit2', nargs='?')
+    parser.add_argument('--index', help='Answer from the shared commit index at this path')
+    parser.add_argument('--range-index', help='Answer from the author range index at this path, '
+                                              'updated to --tip first (see author_range_index.py)')
+    parser.add_argument('--tip', default='HEAD', help='Branch the range index follows')
+    parser.add_argument('--since', help='Count the commits that landed on --tip from this date (needs --range-index)')
+    parser.add_argument('--until', help='... up to, not including, this date')
+    parser.add_argument('--batch', metavar='FILE',
+                        help="Answer every range in FILE ('-' for stdin): two commits or two dates per line")
+    parser.add_argument('--lines', action='store_true', help='Also show the lines each author changed')
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+    start_profile(args, 'git_author_stats')
+
+    if args.batch:
+        ranges = read_batch(args.batch)
+        for bounds in ranges:
+            if len(bounds) != 2:
+                print(f"Error: Invalid range '{' '.join(bounds)}' in {args.batch}")
+                sys.exit(1)
+    elif args.since or args.until:
+        ranges = [(args.since, args.until)]
+    elif args.commit2:
+        ranges = [(args.commit1, args.commit2)]
+    else:
+        parser.error('give two commits, --since/--until or --batch')
+
+    date_ranges = [bounds for bounds in ranges if all(b is None or is_date(b) for b in bounds)]
+    if date_ranges and not args.range_index:
+        print("Error: Date windows need --range-index")
         sys.exit(1)
+    commits = [b for bounds in ranges if bounds not in date_ranges for b in bounds]
 
-    commit1, commit2 = sys.argv[1], sys.argv[2]
+    with phase('check commits'), GitSession() as git:
+        resolved = dict(zip(commits, git.resolve_all(commits)))
+        for commit in commits:
+            if resolved[commit] is None:
+                print(f"Error: Commit '{commit}' does not exist.")
+                sys.exit(1)
 
-    for commit in [commit1, commit2]:
-        if not check_commit_exists(commit):
-            print(f"Error: Commit '{commit}' does not exist.")
-            sys.exit(1)
+    index = None
+    if args.range_index:
+        with phase('update range index'):
+            index = open_range_index(args.range_index, args.tip)
 
-    authors = get_commit_authors(commit1, commit2)
-    author_counts = defaultdict(int)
-    for author in authors:
-        author_counts[author] += 1
+    for i, (start, end) in enumerate(ranges):
+        with phase('count authors'):
+            if (start, end) in date_ranges:
+                span = index.date_span(start and parse_date(start), end and parse_date(end))
+            else:
+                span = index and index.span(resolved[start], resolved[end])
+                if index and span is None:
+                    print(f"{start}..{end} is not a range of the first-parent history of {args.tip}, "
+                          f"asking git", file=sys.stderr)
 
-    sorted_authors = sorted(author_counts.items(), key=lambda x: (-x[1], x[0]))
-    max_width = max(len(a) for a in author_counts.keys()) if author_counts else 0
+            if span is not None:
+                author_stats = index.stats(*span)
+            elif args.lines:
+                author_stats = get_author_line_stats(start, end)
+            elif args.index:
+                with open_index(args.index, start, end) as commit_index:
+                    author_stats = {a: (n, None) for a, n in commit_index.author_counts(start, end).items()}
+            else:
+                author_counts = defaultdict(int)
+                for author in get_commit_authors(start, end):
+                    author_counts[author] += 1
+                author_stats = {a: (n, None) for a, n in author_counts.items()}
 
-    for author, count in sorted_authors:
-        print(f"{author:<{max_width}} : {count}")
+        if len(ranges) > 1:
+            if i:
+                print()
+            print(f"== {start or ''}..{end or ''} ==")
+        print_author_stats(author_stats, args.lines)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
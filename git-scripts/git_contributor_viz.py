@@ -6,96 +6,272 @@ Processes git commit data and generates JSON for the contributor visualization
 
 import subprocess
 import json
+import os
 import sys
-from datetime import datetime, timedelta
+from array import array
+from datetime import datetime, timedelta, timezone
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import argparse
 
-def check_commit_exists(commit):
-    """Check if a git commit exists in the repository"""
+from commit_index import open_index
+from git_file_changes import iter_nul_fields
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
+
+def is_ancestor(ancestor, commit):
+    """Check if a commit is reachable from another one"""
+    return subprocess.run(['git', 'merge-base', '--is-ancestor', ancestor, commit]).returncode == 0
+
+class CommitStore:
+    """Compact struct-of-arrays store of commits.
+
+    Dates are kept as epoch seconds plus the author's UTC offset in minutes,
+    authors are interned to integer ids and hashes are packed as raw bytes.
+    """
+
+    def __init__(self):
+        self.authors = []
+        self.author_ids = {}
+        self.hashes = bytearray()
+        self.dates = array('q')
+        self.tz_offsets = array('h')
+        self.author_col = array('I')
+        self.insertions = array('I')
+        self.deletions = array('I')
+
+    def __len__(self):
+        return len(self.dates)
+
+    def intern_author(self, author):
+        author_id = self.author_ids.get(author)
+        if author_id is None:
+            author_id = self.author_ids[author] = len(self.authors)
+            self.authors.append(author.decode().strip() if isinstance(author, bytes) else author)
+        return author_id
+
+    def append(self, commit_hash, author, timestamp, tz_offset, insertions, deletions):
+        self.hashes += bytes.fromhex(commit_hash.decode() if isinstance(commit_hash, bytes) else commit_hash)
+        self.dates.append(timestamp)
+        self.tz_offsets.append(tz_offset)
+        self.author_col.append(self.intern_author(author))
+        self.insertions.append(insertions)
+        self.deletions.append(deletions)
+
+    def hash(self, i):
+        return self.hashes[i * 20:(i + 1) * 20].hex()
+
+def parse_tz_offset(value):
+    """Convert a '+HHMM' offset to minutes"""
+    minutes = int(value[1:3]) * 60 + int(value[3:5])
+    return -minutes if value[:1] == b'-' else minutes
+
+# Time buckets of the output: timePoints are months, the others go to `rollups`
+GRANULARITIES = ['week', 'month', 'quarter']
+
+LOG_COMMAND = [
+    'git', 'log', '-z', '--numstat', '--date=format:%z',
+    '--format=%x00%H%x00%aN%x00%at%x00%ad'
+]
+
+# Fewest commits per shard of a parallel run. A shard costs a worker process
+# and a git process, about as much as diffing a hundred commits, so smaller
+# ranges are faster on the serial path
+MIN_SHARD_COMMITS = 1000
+
+def read_commits(cmd, revisions=None):
+    """Run a git log command and stream its output into a CommitStore.
+
+    When `revisions` is given it is fed to the command's stdin.
+    """
+    commits = CommitStore()
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE,
+        stdin=subprocess.PIPE if revisions is not None else None
+    )
     try:
-        subprocess.check_output(
-            ['git', 'cat-file', '-e', f'{commit}^{{commit}}'],
-            stderr=subprocess.STDOUT
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
-
-def get_commits_in_range(start_commit, end_commit):
-    """Get all commits between two commit hashes"""
+        if revisions is not None:
+            # git reads all of stdin before it starts writing
+            proc.stdin.write(''.join(f'{rev}\n' for rev in revisions).encode())
+            proc.stdin.close()
+        header = None
+        insertions = deletions = 0
+        fields = iter_nul_fields(proc.stdout)
+        for field in fields:
+            if not field:  # Commit info follows
+                if header is not None:
+                    commits.append(*header, insertions, deletions)
+                    header = None
+                while not field:
+                    field = next(fields, None)
+                if field is None:
+                    break
+                author, timestamp, tz_offset = next(fields), next(fields), next(fields)
+                header = (field, author, int(timestamp), parse_tz_offset(tz_offset))
+                insertions = deletions = 0
+            else:
+                # Numstat line "added\tdeleted\tpath"; renames put both paths in the next fields
+                added, deleted, path = field.split(b'\t', 2)
+                if not path:
+                    next(fields)
+                    next(fields)
+                if added != b'-':  # Binary files have no line counts
+                    insertions += int(added)
+                    deletions += int(deleted)
+        if header is not None:
+            commits.append(*header, insertions, deletions)
+        proc.wait()
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return commits
+
+def date_window_args(since=None, until=None):
+    """git options limiting a walk to the commits committed in the window"""
+    return ([f'--since={since}'] if since else []) + ([f'--until={until}'] if until else [])
+
+def index_date_window(since=None, until=None):
+    """[start, end) epoch seconds of a --since/--until window, parsed by git"""
+    if not since and not until:
+        return None, None
+    limits = dict(arg.lstrip('-').split('=') for arg in subprocess.check_output(
+        ['git', 'rev-parse', *date_window_args(since, until)], text=True
+    ).split())
+    end = limits.get('min-age')
+    return (int(limits['max-age']) if 'max-age' in limits else None), (int(end) + 1 if end else None)
+
+def get_commits_in_range(start_commit, end_commit, since=None, until=None):
+    """Get all commits between two commit hashes, optionally only those committed between `since` and `until`"""
+    # Stream commit info and per-file line counts; -z keeps authors and paths unambiguous.
+    # git applies the date window while walking, so it computes no diffs outside it
     try:
-        # Get commit list with author, date, and stats
-        cmd = [
-            'git', 'log', 
-            f'{start_commit}..{end_commit}',
-            '--pretty=format:%H|%aN|%aI',
-            '--shortstat'
-        ]
-        
-        output = subprocess.check_output(cmd, text=True)
-        lines = output.strip().split('\n')
-        
-        commits = []
-        i = 0
-        while i < len(lines):
-            if '|' in lines[i]:  # Commit info line
-                parts = lines[i].split('|')
-                if len(parts) == 3:
-                    commit_hash, author, date_str = parts
-                    
-                    # Parse the date
-                    commit_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    
-                    # Check if next line contains stats
-                    lines_changed = 0
-                    if i + 1 < len(lines) and ('insertion' in lines[i + 1] or 'deletion' in lines[i + 1]):
-                        stats_line = lines[i + 1]
-                        # Parse lines like " 5 files changed, 123 insertions(+), 45 deletions(-)"
-                        parts = stats_line.split(',')
-                        for part in parts:
-                            if 'insertion' in part:
-                                lines_changed += int(part.strip().split()[0])
-                            elif 'deletion' in part:
-                                lines_changed += int(part.strip().split()[0])
-                        i += 1  # Skip the stats line
-                    
-                    commits.append({
-                        'hash': commit_hash,
-                        'author': author.strip(),
-                        'date': commit_date,
-                        'lines_changed': lines_changed
-                    })
-            i += 1
-        
-        return commits
-        
+        return read_commits(LOG_COMMAND + date_window_args(since, until) + [f'{start_commit}..{end_commit}'])
     except subprocess.CalledProcessError as e:
         print(f"Error getting commits: {e}")
-        return []
+        return CommitStore()
 
-def generate_monthly_stats(commits, start_date=None, end_date=None):
-    """Generate monthly statistics from commit data"""
-    if not commits:
-        return {}
-    
-    # Determine date range
-    if start_date is None:
-        start_date = min(commit['date'] for commit in commits)
-    if end_date is None:
-        end_date = max(commit['date'] for commit in commits)
-    
-    # Generate monthly buckets
-    monthly_stats = defaultdict(lambda: defaultdict(lambda: {'commits': 0, 'lines_changed': 0}))
+def get_shard_stats(revisions, granularities):
+    """Rolled-up statistics of an explicit list of commits, as plain dicts for the process pool"""
+    commits = read_commits(LOG_COMMAND + ['--no-walk=unsorted', '--stdin'], revisions)
+    rollups = generate_rollups(commits, granularities)
+    return len(commits), {
+        granularity: {bucket: dict(bucket_data) for bucket, bucket_data in stats.items()}
+        for granularity, stats in rollups.items()
+    }
+
+def get_stats_parallel(start_commit, end_commit, jobs, granularities=GRANULARITIES, since=None, until=None,
+                       min_shard_commits=MIN_SHARD_COMMITS):
+    """Compute rolled-up statistics by sharding the range over a process pool.
+
+    The rev-list order is split into at most `jobs` contiguous shards of at
+    least `min_shard_commits` commits, each shard's diff statistics are
+    computed by its own git process, and the shard results are merged in
+    rev-list order, so the output is identical to the serial path. A range
+    too small for two shards is read serially. Returns (commit count, rollups).
+    """
+    revisions = subprocess.check_output(
+        ['git', 'rev-list', *date_window_args(since, until), f'{start_commit}..{end_commit}'],
+        text=True
+    ).split()
+    jobs = min(jobs, len(revisions) // max(min_shard_commits, 1))
+    if jobs < 2:
+        commits = read_commits(LOG_COMMAND + ['--no-walk=unsorted', '--stdin'], revisions)
+        return len(commits), generate_rollups(commits, granularities)
+    shard_size = -(-len(revisions) // jobs)
+    shards = [revisions[i:i + shard_size] for i in range(0, len(revisions), shard_size)]
+
+    commit_count = 0
+    rollups = {}
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for shard_count, shard_rollups in executor.map(get_shard_stats, shards, repeat(granularities)):
+            commit_count += shard_count
+            for granularity, shard_stats in shard_rollups.items():
+                merge_monthly_stats(rollups.setdefault(granularity, new_monthly_stats()), shard_stats)
+    return commit_count, rollups
+
+def get_commits_from_index(index_path, start_commit, end_commit, since=None, until=None):
+    """Get the same commit store as get_commits_in_range from the shared commit index"""
+    # Like git's --since/--until, the window applies to the commit date
+    start_date, end_date = index_date_window(since, until)
+    commits = CommitStore()
+    with open_index(index_path, start_commit, end_commit) as index:
+        for commit in index.commits_in_range(start_commit, end_commit):
+            if ((start_date is not None and commit['commit_date'] < start_date)
+                    or (end_date is not None and commit['commit_date'] >= end_date)):
+                continue
+            commits.append(
+                commit['hash'],
+                commit['author'],
+                int(commit['date'].timestamp()),
+                int(commit['date'].utcoffset().total_seconds()) // 60,
+                commit['insertions'],
+                commit['deletions']
+            )
+    return commits
+
+def day_month(day):
+    return datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%Y-%m')
+
+def day_week(day):
+    """ISO week of a day number, e.g. '2024-W07'"""
+    year, week, _ = datetime.fromtimestamp(day * 86400, timezone.utc).isocalendar()
+    return f'{year}-W{week:02d}'
+
+def month_quarter(month):
+    return f'{month[:4]}-Q{(int(month[5:7]) + 2) // 3}'
+
+def generate_daily_stats(commits, start_date=None, end_date=None):
+    """Per-day statistics of the commits authored in [start_date, end_date) (epoch seconds).
+
+    Days are numbered from the epoch in the author's local time.
+    """
+    counts = defaultdict(lambda: [0, 0])
     
-    for commit in commits:
-        month_key = commit['date'].strftime('%Y-%m')
-        author = commit['author']
-        
-        monthly_stats[month_key][author]['commits'] += 1
-        monthly_stats[month_key][author]['lines_changed'] += commit['lines_changed']
+    for timestamp, tz_offset, author_id, insertions, deletions in zip(
+        commits.dates, commits.tz_offsets, commits.author_col, commits.insertions, commits.deletions
+    ):
+        if (start_date is not None and timestamp < start_date) or (end_date is not None and timestamp >= end_date):
+            continue
+        stats = counts[(timestamp + tz_offset * 60) // 86400, author_id]
+        stats[0] += 1
+        stats[1] += insertions + deletions
     
-    return monthly_stats
+    daily_stats = new_monthly_stats()
+    for (day, author_id), (commit_count, lines_changed) in counts.items():
+        author_stats = daily_stats[day][commits.authors[author_id]]
+        author_stats['commits'] += commit_count
+        author_stats['lines_changed'] += lines_changed
+    return daily_stats
+
+def roll_up(stats, bucket_of):
+    """Sum per-bucket statistics into the coarser buckets `bucket_of(bucket)`"""
+    rolled = new_monthly_stats()
+    for bucket, bucket_data in stats.items():
+        merge_monthly_stats(rolled, {bucket_of(bucket): bucket_data})
+    return rolled
+
+def generate_rollups(commits, granularities=GRANULARITIES, start_date=None, end_date=None):
+    """Statistics per week, month and quarter from one pass over the commits.
+
+    Weeks and months are summed from the days, quarters from the months.
+    """
+    daily_stats = generate_daily_stats(commits, start_date, end_date)
+    rollups = {'month': roll_up(daily_stats, day_month)}
+    if 'week' in granularities:
+        rollups['week'] = roll_up(daily_stats, day_week)
+    if 'quarter' in granularities:
+        rollups['quarter'] = roll_up(rollups['month'], month_quarter)
+    return rollups
+
+def generate_monthly_stats(commits, start_date=None, end_date=None):
+    """Generate monthly statistics from commit data"""
+    return generate_rollups(commits, ['month'], start_date, end_date)['month']
 
 def create_visualization_data(monthly_stats, min_commits=5):
     """Create data structure suitable for the web visualization"""
@@ -113,11 +289,10 @@ def create_visualization_data(monthly_stats, min_commits=5):
         if totals['commits'] >= min_commits
     }
     
-    # Sort contributors by total commits
+    # Sort contributors by total commits, then by name, so ties do not depend on the order stats were merged in
     sorted_contributors = sorted(
         significant_contributors.items(),
-        key=lambda x: x[1]['commits'],
-        reverse=True
+        key=lambda x: (-x[1]['commits'], x[0])
     )
     
     # Generate time points (sorted months)
@@ -158,43 +333,339 @@ def create_visualization_data(monthly_stats, min_commits=5):
     
     return visualization_data
 
+def add_rollups(viz_data, rollups):
+    """Attach the non-monthly rollups, one sparse series per contributor in the order of `contributors`"""
+    viz_data['rollups'] = {}
+    for granularity, stats in rollups.items():
+        if granularity == 'month':
+            continue
+        time_points = sorted(stats)
+        series = []
+        for contributor in viz_data['contributors']:
+            points = {'index': [], 'commits': [], 'linesChanged': []}
+            for i, bucket in enumerate(time_points):
+                bucket_stats = stats[bucket].get(contributor['name'])
+                if bucket_stats:
+                    points['index'].append(i)
+                    points['commits'].append(bucket_stats['commits'])
+                    points['linesChanged'].append(bucket_stats['lines_changed'])
+            series.append(points)
+        viz_data['rollups'][granularity] = {'timePoints': time_points, 'contributors': series}
+    return viz_data
+
+BINARY_MAGIC = b'DCTB'
+
+def to_sparse_data(viz_data):
+    """Convert visualization data to the sparse format.
+
+    Each contributor keeps only the months with activity: `index` holds
+    positions into the shared `timePoints`, with the matching `commits` and
+    `linesChanged` values in parallel arrays.
+    """
+    sparse_data = {key: value for key, value in viz_data.items() if key != 'contributors'}
+    sparse_data['format'] = 'sparse'
+    sparse_data['contributors'] = []
+    
+    for contributor in viz_data['contributors']:
+        sparse_contributor = {key: value for key, value in contributor.items() if key != 'data'}
+        sparse_contributor.update({'index': [], 'commits': [], 'linesChanged': []})
+        for i, point in enumerate(contributor['data']):
+            if point['commits'] or point['linesChanged']:
+                sparse_contributor['index'].append(i)
+                sparse_contributor['commits'].append(point['commits'])
+                sparse_contributor['linesChanged'].append(point['linesChanged'])
+        sparse_data['contributors'].append(sparse_contributor)
+    
+    return sparse_data
+
+def to_dense_data(sparse_data):
+    """Convert sparse visualization data back to the dense format"""
+    time_points = sparse_data['timePoints']
+    viz_data = {key: value for key, value in sparse_data.items() if key not in ('format', 'contributors')}
+    viz_data['contributors'] = []
+    
+    for sparse_contributor in sparse_data['contributors']:
+        contributor = {
+            key: value for key, value in sparse_contributor.items()
+            if key not in ('index', 'commits', 'linesChanged', 'count')
+        }
+        contributor['data'] = [{'time': month, 'commits': 0, 'linesChanged': 0} for month in time_points]
+        for i, commits, lines_changed in zip(
+            sparse_contributor['index'], sparse_contributor['commits'], sparse_contributor['linesChanged']
+        ):
+            contributor['data'][i]['commits'] = commits
+            contributor['data'][i]['linesChanged'] = lines_changed
+        viz_data['contributors'].append(contributor)
+    
+    return viz_data
+
+def write_binary_data(sparse_data, f):
+    """Write sparse visualization data in the binary format.
+
+    Layout: the 4-byte magic, a little-endian uint32 header length, the UTF-8
+    JSON header padded to 4 bytes, then for each contributor `count` uint32
+    indices, commits and lines changed.
+    """
+    header = {key: value for key, value in sparse_data.items() if key != 'contributors'}
+    header['format'] = 'binary'
+    header['contributors'] = [
+        {
+            **{key: value for key, value in contributor.items() if key not in ('index', 'commits', 'linesChanged')},
+            'count': len(contributor['index'])
+        }
+        for contributor in sparse_data['contributors']
+    ]
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    header_bytes += b' ' * (-len(header_bytes) % 4)
+    
+    f.write(BINARY_MAGIC)
+    f.write(len(header_bytes).to_bytes(4, 'little'))
+    f.write(header_bytes)
+    for contributor in sparse_data['contributors']:
+        for column in ('index', 'commits', 'linesChanged'):
+            values = array('I', contributor[column])
+            if sys.byteorder == 'big':
+                values.byteswap()
+            f.write(values.tobytes())
+
+def read_binary_data(f):
+    """Read data written by write_binary_data back into the sparse format"""
+    if f.read(4) != BINARY_MAGIC:
+        raise ValueError("Not a binary contributor data file")
+    header_length = int.from_bytes(f.read(4), 'little')
+    sparse_data = json.loads(f.read(header_length))
+    sparse_data['format'] = 'sparse'
+    
+    for contributor in sparse_data['contributors']:
+        count = contributor.pop('count')
+        for column in ('index', 'commits', 'linesChanged'):
+            values = array('I')
+            values.frombytes(f.read(4 * count))
+            if sys.byteorder == 'big':
+                values.byteswap()
+            contributor[column] = values.tolist()
+    
+    return sparse_data
+
+def write_visualization_data(viz_data, output, output_format='dense'):
+    """Save visualization data as dense JSON, sparse JSON or binary"""
+    if output_format == 'binary':
+        with open(output, 'wb') as f:
+            write_binary_data(to_sparse_data(viz_data), f)
+    elif output_format == 'sparse':
+        with open(output, 'w') as f:
+            json.dump(to_sparse_data(viz_data), f, separators=(',', ':'))
+    else:
+        with open(output, 'w') as f:
+            json.dump(viz_data, f, indent=2)
+
+def read_visualization_data(output):
+    """Load visualization data written in any format, returned in the dense format"""
+    with open(output, 'rb') as f:
+        if f.read(4) == BINARY_MAGIC:
+            f.seek(0)
+            return to_dense_data(read_binary_data(f))
+        f.seek(0)
+        data = json.load(f)
+    return to_dense_data(data) if data.get('format') == 'sparse' else data
+
+def state_path(output):
+    """Path of the file holding the stats of contributors filtered out of `output`"""
+    root, ext = os.path.splitext(output)
+    return f"{root}.state{ext or '.json'}"
+
+def new_monthly_stats():
+    return defaultdict(lambda: defaultdict(lambda: {'commits': 0, 'lines_changed': 0}))
+
+def merge_monthly_stats(target, source):
+    """Add the per-month, per-author counts of `source` into `target`"""
+    for month, month_data in source.items():
+        target_month = target[month]
+        for author, stats in month_data.items():
+            target_month[author]['commits'] += stats['commits']
+            target_month[author]['lines_changed'] += stats['lines_changed']
+    return target
+
+def load_previous_stats(output, start_commit, min_commits, granularities=GRANULARITIES):
+    """Rebuild the statistics of every granularity from a previous output and its state file.
+
+    Returns (last_commit, rollups), or (None, None) when there is no usable
+    previous run, including one that started at another commit, used another
+    --min-commits or was written without some of `granularities`.
+    """
+    try:
+        viz_data = read_visualization_data(output)
+        with open(state_path(output)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+
+    last_commit = viz_data.get('lastCommit')
+    if not last_commit or state.get('lastCommit') != last_commit:
+        return None, None
+    if state.get('startCommit') != start_commit or state.get('minCommits') != min_commits:
+        return None, None
+    previous_rollups = viz_data.get('rollups', {})
+    if any(granularity not in previous_rollups for granularity in granularities if granularity != 'month'):
+        return None, None
+
+    monthly_stats = new_monthly_stats()
+    for month in viz_data['timePoints']:
+        monthly_stats[month]
+    for contributor in viz_data['contributors']:
+        for point in contributor['data']:
+            if point['commits'] or point['linesChanged']:
+                stats = monthly_stats[point['time']][contributor['name']]
+                stats['commits'] += point['commits']
+                stats['lines_changed'] += point['linesChanged']
+    rollups = {'month': monthly_stats}
+    filtered = {'month': state['filteredContributors'], **state.get('filteredRollups', {})}
+    for granularity in granularities:
+        if granularity == 'month':
+            continue
+        stats = rollups[granularity] = new_monthly_stats()
+        time_points = previous_rollups[granularity]['timePoints']
+        for contributor, series in zip(viz_data['contributors'], previous_rollups[granularity]['contributors']):
+            for i, commits, lines_changed in zip(series['index'], series['commits'], series['linesChanged']):
+                bucket_stats = stats[time_points[i]][contributor['name']]
+                bucket_stats['commits'] += commits
+                bucket_stats['lines_changed'] += lines_changed
+    for granularity, stats in rollups.items():
+        for bucket, bucket_data in filtered.get(granularity, {}).items():
+            for author, (commits, lines_changed) in bucket_data.items():
+                bucket_stats = stats[bucket][author]
+                bucket_stats['commits'] += commits
+                bucket_stats['lines_changed'] += lines_changed
+
+    return last_commit, rollups
+
+def save_state(output, start_commit, last_commit, min_commits, rollups, viz_data):
+    """Save the range, the --min-commits threshold and the stats of contributors below it next to `output`"""
+    included = {contributor['name'] for contributor in viz_data['contributors']}
+    filtered = {}
+    for granularity, stats in rollups.items():
+        filtered[granularity] = {}
+        for bucket, bucket_data in stats.items():
+            bucket_filtered = {
+                author: [author_stats['commits'], author_stats['lines_changed']]
+                for author, author_stats in bucket_data.items()
+                if author not in included
+            }
+            if bucket_filtered:
+                filtered[granularity][bucket] = bucket_filtered
+
+    state = {
+        'startCommit': start_commit,
+        'lastCommit': last_commit,
+        'minCommits': min_commits,
+        'filteredContributors': filtered.pop('month')
+    }
+    if filtered:
+        state['filteredRollups'] = filtered
+    with open(state_path(output), 'w') as f:
+        json.dump(state, f)
+
 def main():
     parser = argparse.ArgumentParser(description='Generate contributor statistics for visualization')
     parser.add_argument('start_commit', help='Starting commit hash')
     parser.add_argument('end_commit', help='Ending commit hash')
     parser.add_argument('--output', '-o', default='contributors_data.json', help='Output JSON file')
     parser.add_argument('--min-commits', type=int, default=5, help='Minimum commits to include contributor')
+    parser.add_argument('--index', help='Read commits from the shared commit index at this path')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Number of processes computing diff statistics in parallel')
+    parser.add_argument('--min-shard-commits', type=int, default=MIN_SHARD_COMMITS,
+                        help='Fewest commits per parallel shard; smaller ranges are processed serially')
+    parser.add_argument('--format', choices=['dense', 'sparse', 'binary'], default='dense',
+                        help='Output layout: dense JSON, sparse per-contributor arrays, or binary sparse columns')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only process commits added since the previous run that wrote --output')
+    parser.add_argument('--since', help='Only count commits committed after this date (any date git accepts)')
+    parser.add_argument('--until', help='Only count commits committed before this date')
+    parser.add_argument('--rollups', nargs='*', choices=[g for g in GRANULARITIES if g != 'month'],
+                        default=[g for g in GRANULARITIES if g != 'month'],
+                        help='Extra granularities stored next to the monthly data (none: only months)')
+    add_profile_argument(parser)
     
     args = parser.parse_args()
+    start_profile(args, 'git_contributor_viz')
+
+    if args.incremental and (args.since or args.until):
+        print("Error: --incremental cannot be combined with --since/--until")
+        sys.exit(1)
+    if args.index and args.jobs > 1:
+        print("Error: --index cannot be combined with --jobs; the index already has the diff statistics")
+        sys.exit(1)
     
     # Validate commits exist
-    for commit in [args.start_commit, args.end_commit]:
-        if not check_commit_exists(commit):
-            print(f"Error: Commit '{commit}' does not exist.")
-            sys.exit(1)
+    with phase('check commits'), GitSession() as git:
+        resolved = git.resolve_all([args.start_commit, args.end_commit])
+        for commit, full_hash in zip([args.start_commit, args.end_commit], resolved):
+            if full_hash is None:
+                print(f"Error: Commit '{commit}' does not exist.")
+                sys.exit(1)
+        first_commit, end_commit = resolved
+    
+    start_commit = args.start_commit
+    previous_stats = None
+
+    if args.incremental:
+        with phase('load previous run'):
+            last_commit, previous_stats = load_previous_stats(args.output, first_commit, args.min_commits,
+                                                              args.rollups)
+        if last_commit is None:
+            print(f"No previous run from {args.start_commit} with --min-commits {args.min_commits} "
+                  f"found in {args.output}, processing the full range")
+        elif not is_ancestor(last_commit, end_commit):
+            print(f"Previous end commit {last_commit} is not an ancestor of {args.end_commit}, processing the full range")
+            previous_stats = None
+        else:
+            start_commit = last_commit
     
-    print(f"Processing commits from {args.start_commit} to {args.end_commit}...")
+    print(f"Processing commits from {start_commit} to {args.end_commit}...")
     
     # Get commit data
-    commits = get_commits_in_range(args.start_commit, args.end_commit)
+    with phase('read commits'):
+        if args.index:
+            commits = get_commits_from_index(args.index, start_commit, end_commit, args.since, args.until)
+        elif args.jobs > 1:
+            commits = None
+            commit_count, rollups = get_stats_parallel(start_commit, end_commit, args.jobs, args.rollups,
+                                                       args.since, args.until, args.min_shard_commits)
+        else:
+            commits = get_commits_in_range(start_commit, end_commit, args.since, args.until)
+    if commits is not None:
+        commit_count = len(commits)
     
-    if not commits:
+    if not commit_count and previous_stats is None:
         print("No commits found in the specified range.")
         sys.exit(1)
     
-    print(f"Found {len(commits)} commits")
+    print(f"Found {commit_count} commits")
     
-    # Generate monthly statistics
-    monthly_stats = generate_monthly_stats(commits)
-    print(f"Generated statistics for {len(monthly_stats)} months")
+    # Generate daily statistics and roll them up
+    with phase('rollups'):
+        if commits is not None:
+            rollups = generate_rollups(commits, args.rollups)
+        if previous_stats is not None:
+            rollups = {granularity: merge_monthly_stats(previous_stats[granularity], stats)
+                       for granularity, stats in rollups.items()}
+    monthly_stats = rollups['month']
+    print(f"Generated statistics for {len(monthly_stats)} months"
+          + "".join(f", {len(rollups[g])} {g}s" for g in args.rollups))
     
     # Create visualization data
-    viz_data = create_visualization_data(monthly_stats, args.min_commits)
+    with phase('visualization data'):
+        viz_data = create_visualization_data(monthly_stats, args.min_commits)
+        if args.rollups:
+            add_rollups(viz_data, rollups)
+    viz_data['lastCommit'] = end_commit
     print(f"Included {len(viz_data['contributors'])} contributors with >= {args.min_commits} commits")
     
     # Save to JSON file
-    with open(args.output, 'w') as f:
-        json.dump(viz_data, f, indent=2)
+    with phase('write output'):
+        write_visualization_data(viz_data, args.output, args.format)
+        save_state(args.output, first_commit, end_commit, args.min_commits, rollups, viz_data)
     
     print(f"Data saved to {args.output}")
     
@@ -1,48 +1,116 @@
+import argparse
 import subprocess
 import sys
 from collections import defaultdict
 
-def check_commit_exists(commit):
+from git_session import GitSession
+from instrumentation import add_profile_argument, phase, start_profile
+
+def iter_nul_fields(stream, chunk_size=1 << 16):
+    """Yield NUL-separated fields from a byte stream without buffering it all"""
+    pending = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        fields = (pending + chunk).split(b'\0')
+        pending = fields.pop()
+        yield from fields
+    if pending:
+        yield pending
+
+def iter_log_records(cmd, header_size, parents_field=None):
+    """Yield (header, files) records from a `git log -z --name-only` stream.
+
+    The format passed in `cmd` must start with %x00 and emit `header_size`
+    NUL-separated fields, so every header is preceded by an empty field and
+    cannot be confused with a path. With --cc git puts one more empty field
+    between a merge's header and its files; commands using it must include
+    %P in the format and pass its position as `parents_field`.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
     try:
-        subprocess.check_output(
-            ['git', 'cat-file', '-e', f'{commit}^{{commit}}'],
-            stderr=subprocess.STDOUT
-        )
-        return True
-    except subprocess.CalledProcessError:
-        return False
+        header, files = None, []
+        fields = iter_nul_fields(proc.stdout)
+        for field in fields:
+            if not field:
+                if header is not None:
+                    yield header, files
+                # Commits without a diff leave extra empty fields behind
+                while not field:
+                    field = next(fields, None)
+                if field is None:
+                    header = None
+                    break
+                header = [field.decode()]
+                header.extend(next(fields).decode() for _ in range(header_size - 1))
+                files = []
+                if parents_field is not None and len(header[parents_field].split()) > 1:
+                    if next(fields, b'') != b'':
+                        raise ValueError(f"Expected an empty field after merge {header[0]}")
+            else:
+                # The first path of each commit follows the header's newline
+                if not files and field.startswith(b'\n'):
+                    field = field[1:]
+                files.append(field.decode())
+        if header is not None:
+            yield header, files
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
 
-def get_file_modification_counts(commit1, commit2):
-    revs = subprocess.check_output(
-        ['git', 'rev-list', f'{commit1}..{commit2}'],
-        text=True
-    ).splitlines()
+def iter_commit_files(commit1, commit2):
+    """Yield (commit, files) for every commit in commit1..commit2 from a single git log stream.
+
+    Rename detection and root diffs are turned off to report the same paths
+    as `git diff-tree -r <rev>`.
+    """
+    cmd = [
+        'git', '-c', 'log.showRoot=false', 'log',
+        '-z', '--no-renames', '--name-only', '--format=%x00%H',
+        f'{commit1}..{commit2}'
+    ]
+    for (commit,), files in iter_log_records(cmd, 1):
+        yield commit, files
 
+def get_file_modification_counts(commit1, commit2):
     file_counts = defaultdict(int)
 
-    for rev in revs:
-        files = subprocess.check_output(
-            ['git', 'diff-tree', '--no-commit-id', '--name-only', '-r', rev],
-            text=True
-        ).splitlines()
+    for _, files in iter_commit_files(commit1, commit2):
         for file in files:
             file_counts[file] += 1
 
     return file_counts
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python git_file_changes.py commit1 commit2")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Count commits touching each file between two commits')
+    parser.add_argument('commit1')
+    parser.add_argument('commit2')
+    parser.add_argument('--index', help='Answer from the shared commit index at this path')
+    add_profile_argument(parser)
 
-    commit1, commit2 = sys.argv[1], sys.argv[2]
+    args = parser.parse_args()
+    start_profile(args, 'git_file_changes')
+    commit1, commit2 = args.commit1, args.commit2
 
-    for commit in [commit1, commit2]:
-        if not check_commit_exists(commit):
-            print(f"Error: Commit '{commit}' does not exist.")
-            sys.exit(1)
+    with phase('check commits'), GitSession() as git:
+        for commit, resolved in zip([commit1, commit2], git.resolve_all([commit1, commit2])):
+            if resolved is None:
+                print(f"Error: Commit '{commit}' does not exist.")
+                sys.exit(1)
 
-    counts = get_file_modification_counts(commit1, commit2)
+    with phase('count files'):
+        if args.index:
+            # Not imported at the top: commit_index imports this module
+            from commit_index import open_index
+            with open_index(args.index, commit1, commit2) as index:
+                counts = index.file_counts(commit1, commit2)
+        else:
+            counts = get_file_modification_counts(commit1, commit2)
 
     sorted_files = sorted(counts.items(), key=lambda x: (-x[1], x[0]))
     max_width = max(len(f) for f in counts.keys()) if counts else 0
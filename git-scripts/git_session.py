@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Git Session
+Keeps one `git cat-file --batch-check` and one `git cat-file --batch`
+process open and pipelines object lookups through them, so validating or
+resolving revisions and reading commits and trees costs a line of I/O
+instead of a process per object.
+
+Requests are written in chunks small enough to fit the pipe buffer before
+their answers are read, so a chunk never blocks on git's output.
+"""
+
+import subprocess
+from collections import namedtuple
+
+# Requests written before reading their answers; small enough for the pipe buffers
+CHUNK_SIZE = 64
+
+ObjectInfo = namedtuple('ObjectInfo', 'oid type size')
+# author and committer are (name, email, epoch seconds, UTC offset) tuples
+Commit = namedtuple('Commit', 'oid tree parents author committer message')
+TreeEntry = namedtuple('TreeEntry', 'mode name oid')
+
+class GitSession:
+    """Long-lived cat-file processes of one repository; use as a context manager"""
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self._processes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for proc in self._processes.values():
+            proc.stdin.close()
+            proc.stdout.close()
+            proc.wait()
+        self._processes.clear()
+
+    def _process(self, mode):
+        if mode not in self._processes:
+            self._processes[mode] = subprocess.Popen(
+                ['git', 'cat-file', mode], cwd=self.cwd,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        return self._processes[mode]
+
+    def _request(self, mode, names, read_answer):
+        """Send `names` through the `mode` process and return the answers in order"""
+        proc = self._process(mode)
+        answers = []
+        for i in range(0, len(names), CHUNK_SIZE):
+            chunk = names[i:i + CHUNK_SIZE]
+            for name in chunk:
+                if '\n' in name:
+                    raise ValueError(f"Invalid object name {name!r}")
+            proc.stdin.write(''.join(f'{name}\n' for name in chunk).encode())
+            proc.stdin.flush()
+            for _ in chunk:
+                answers.append(read_answer(proc.stdout))
+        return answers
+
+    @staticmethod
+    def _read_header(stdout):
+        header = stdout.readline()
+        if not header:
+            raise subprocess.CalledProcessError(1, ['git', 'cat-file'], 'cat-file exited unexpectedly')
+        fields = header.decode().split()
+        # "<name> missing" or "<name> ambiguous"
+        if len(fields) != 3:
+            return None
+        return ObjectInfo(fields[0], fields[1], int(fields[2]))
+
+    def info(self, names):
+        """ObjectInfo (or None if it does not exist) for every object name or revision"""
+        return self._request('--batch-check', list(names), self._read_header)
+
+    def resolve_all(self, revisions, object_type='commit'):
+        """Full hash of every revision peeled to `object_type`, or None where there is no such object"""
+        infos = self.info([f'{rev}^{{{object_type}}}' for rev in revisions])
+        return [info.oid if info else None for info in infos]
+
+    def resolve(self, revision, object_type='commit'):
+        return self.resolve_all([revision], object_type)[0]
+
+    def read_all(self, names):
+        """(ObjectInfo, raw content) or None for every object name or revision"""
+        def read_object(stdout):
+            info = self._read_header(stdout)
+            if info is None:
+                return None
+            data = stdout.read(info.size)
+            stdout.read(1)  # Newline after the content
+            return info, data
+        return self._request('--batch', list(names), read_object)
+
+    def read_commits(self, revisions):
+        """Parsed Commit (or None) for every revision"""
+        objects = self.read_all([f'{rev}^{{commit}}' for rev in revisions])
+        return [parse_commit(obj[0].oid, obj[1]) if obj else None for obj in objects]
+
+    def read_commit(self, revision):
+        return self.read_commits([revision])[0]
+
+    def read_trees(self, names):
+        """TreeEntry lists (or None) for every tree, or commit whose tree is wanted"""
+        objects = self.read_all([f'{name}^{{tree}}' for name in names])
+        return [parse_tree(obj[1], len(obj[0].oid) // 2) if obj else None for obj in objects]
+
+    def read_tree(self, name):
+        return self.read_trees([name])[0]
+
+def parse_tree(data, hash_size):
+    """TreeEntry list of a raw tree object: `<mode> <name>\\0<binary id>` records"""
+    entries = []
+    i = 0
+    while i < len(data):
+        space = data.index(b' ', i)
+        nul = data.index(b'\0', space)
+        end = nul + 1 + hash_size
+        entries.append(TreeEntry(data[i:space].decode(), data[space + 1:nul].decode(errors='surrogateescape'),
+                                 data[nul + 1:end].hex()))
+        i = end
+    return entries
+
+def parse_signature(value):
+    """(name, email, epoch seconds, UTC offset) of an author or committer header"""
+    identity, timestamp, tz_offset = value.rsplit(' ', 2)
+    name, _, email = identity.partition(' <')
+    return name, email.rstrip('>'), int(timestamp), tz_offset
+
+def parse_commit(oid, data):
+    """Commit of a raw commit object"""
+    header, _, message = data.partition(b'\n\n')
+    tree, parents, author, committer = None, [], None, None
+    for line in header.decode(errors='replace').split('\n'):
+        key, _, value = line.partition(' ')
+        if key == 'tree':
+            tree = value
+        elif key == 'parent':
+            parents.append(value)
+        elif key == 'author':
+            author = parse_signature(value)
+        elif key == 'committer':
+            committer = parse_signature(value)
+    return Commit(oid, tree, parents, author, committer, message.decode(errors='replace'))
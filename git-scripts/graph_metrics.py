@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Reference Graph Metrics
+Computes per release of the reference graph the weighted in/out-degree,
+PageRank and strongly connected components of every file, plus a ranking
+of the most central files. Results are cached by the content hash of each
+`<version>.csv`, so re-running only recomputes versions whose file changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from instrumentation import add_profile_argument, phase, start_profile
+from reference_graph import find_reference_csvs, read_reference_csv
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bump when the metrics change so cached results are recomputed
+METRICS_VERSION = 1
+DAMPING = 0.85
+CENTRAL_FILES = 20
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return f'{METRICS_VERSION}:{digest.hexdigest()}'
+
+def load_edges(path):
+    """Paths of a version plus its edges as (source, target, weight) arrays over them"""
+    rows = list(read_reference_csv(path))
+    paths = sorted({p for source, target, _ in rows for p in (source, target)})
+    ids = {p: i for i, p in enumerate(paths)}
+    sources = np.array([ids[source] for source, _, _ in rows], dtype=np.int64)
+    targets = np.array([ids[target] for _, target, _ in rows], dtype=np.int64)
+    weights = np.array([weight for _, _, weight in rows], dtype=np.float64)
+    return paths, sources, targets, weights
+
+def pagerank(n, sources, targets, weights, damping=DAMPING, tol=1e-10, max_iter=200):
+    """Weighted PageRank by power iteration; dangling files spread their rank evenly"""
+    out_weight = np.bincount(sources, weights=weights, minlength=n)
+    transition = weights / out_weight[sources]
+    dangling = out_weight == 0
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = np.bincount(targets, weights=rank[sources] * transition, minlength=n)
+        new_rank = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+        if np.abs(new_rank - rank).sum() < tol:
+            return new_rank
+        rank = new_rank
+    return rank
+
+def strongly_connected_components(n, sources, targets):
+    """Component id per node (iterative Tarjan over the CSR adjacency)"""
+    order = np.argsort(sources, kind='stable')
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(sources, minlength=n)))).tolist()
+    adjacency = targets[order].tolist()
+
+    index = [-1] * n
+    lowlink = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    components = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, indptr[root])]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, k = work[-1]
+            if k < indptr[node + 1]:
+                work[-1] = (node, k + 1)
+                successor = adjacency[k]
+                if index[successor] == -1:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, indptr[successor]))
+                elif on_stack[successor]:
+                    lowlink[node] = min(lowlink[node], index[successor])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+    return np.array(component, dtype=np.int64)
+
+def compute_metrics(path):
+    """All metrics of one version, keyed by file path"""
+    paths, sources, targets, weights = load_edges(path)
+    n = len(paths)
+    in_degree = np.bincount(targets, weights=weights, minlength=n)
+    out_degree = np.bincount(sources, weights=weights, minlength=n)
+    rank = pagerank(n, sources, targets, weights)
+    component = strongly_connected_components(n, sources, targets)
+    sizes = np.bincount(component)
+    central = np.argsort(-rank, kind='stable')[:CENTRAL_FILES]
+    return {
+        'paths': paths,
+        'inDegree': in_degree.astype(np.int64).tolist(),
+        'outDegree': out_degree.astype(np.int64).tolist(),
+        'pagerank': np.round(rank, 8).tolist(),
+        'component': component.tolist(),
+        'components': int(len(sizes)),
+        'cyclicComponents': int((sizes > 1).sum()),
+        'largestComponent': int(sizes.max()) if len(sizes) else 0,
+        'central': [paths[i] for i in central]
+    }
+
+def load_metrics(path):
+    """Read a metrics file back into per-version results keyed by path names"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ignoring unreadable metrics file {path}: {e}")
+        return {}
+    nodes = data.get('nodes', [])
+    results = {}
+    for version, metrics in data.get('versions', {}).items():
+        metrics = dict(metrics)
+        metrics['paths'] = [nodes[i] for i in metrics.pop('nodes')]
+        metrics['central'] = [nodes[i] for i in metrics['central']]
+        results[version] = metrics
+    return results
+
+def save_metrics(path, results):
+    """Write every version's metrics with file paths replaced by ids into one shared node table"""
+    nodes = sorted({p for metrics in results.values() for p in metrics['paths']})
+    ids = {p: i for i, p in enumerate(nodes)}
+    versions = {}
+    for version, metrics in results.items():
+        metrics = dict(metrics)
+        metrics['nodes'] = [ids[p] for p in metrics.pop('paths')]
+        metrics['central'] = [ids[p] for p in metrics['central']]
+        versions[version] = metrics
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'nodes': nodes, 'versions': versions}, f, separators=(',', ':'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute per-version metrics of the reference graphs')
+    parser.add_argument('--references', default='data/references', help='Directory holding the <version>.csv files')
+    parser.add_argument('--output', '-o', default='data/references/graph/metrics.json',
+                        help='Metrics file, also used as the cache of unchanged versions')
+    parser.add_argument('--force', action='store_true', help='Recompute every version')
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+    start_profile(args, 'graph_metrics')
+
+    if np is None:
+        print("Error: graph metrics require NumPy (pip install numpy)")
+        sys.exit(1)
+
+    cached = {} if args.force else load_metrics(args.output)
+    results = {}
+    recomputed = 0
+    for version, path in find_reference_csvs(args.references).items():
+        content_hash = file_hash(path)
+        if cached.get(version, {}).get('hash') == content_hash:
+            results[version] = cached[version]
+            continue
+        with phase('compute'):
+            results[version] = compute_metrics(path)
+        results[version]['hash'] = content_hash
+        recomputed += 1
+        print(f"{version}: {len(results[version]['paths'])} files, "
+              f"{results[version]['cyclicComponents']} reference cycles, "
+              f"most central {results[version]['central'][0]}")
+
+    with phase('save'):
+        save_metrics(args.output, results)
+    print(f"Recomputed {recomputed} of {len(results)} versions, saved {args.output}")
+
+if __name__ == "__main__":
+    main()
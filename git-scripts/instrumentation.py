@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for the git-scripts
+Counts and times every subprocess (git, gh) a script starts, together with
+the bytes read from its output, and the named phases of the script's own
+work. `--profile` (see add_profile_argument) writes the result as a JSON
+report plus a collapsed-stack file that flamegraph.pl or speedscope render.
+
+Nothing is recorded unless profiling was enabled; phase() is then a no-op.
+Subprocesses started inside worker processes (git_contributor_viz --jobs)
+are not visible to the parent and are not reported.
+"""
+
+import atexit
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+_Popen = subprocess.Popen
+_profiler = None
+
+# Options taking a value before a git subcommand, e.g. `git -C repo log`
+GIT_VALUE_OPTIONS = {'-C', '-c', '--git-dir', '--work-tree', '--namespace'}
+
+def command_name(args):
+    """`git log`, `gh api`, ...: the program and its subcommand"""
+    if isinstance(args, (str, bytes)):
+        args = [args]
+    args = [os.fsdecode(arg) for arg in args]
+    program = os.path.basename(args[0])
+    i = 1
+    while i < len(args) and args[i].startswith('-'):
+        i += 2 if args[i] in GIT_VALUE_OPTIONS else 1
+    return f'{program} {args[i]}' if i < len(args) else ' '.join([program] + args[1:2])
+
+class CountingReader:
+    """File wrapper counting what is read from a subprocess pipe (characters for text pipes)"""
+
+    def __init__(self, f, proc):
+        self._f = f
+        self._proc = proc
+
+    def _count(self, data):
+        self._proc.bytes_read += len(data)
+        return data
+
+    def read(self, *args):
+        return self._count(self._f.read(*args))
+
+    def read1(self, *args):
+        return self._count(self._f.read1(*args))
+
+    def readline(self, *args):
+        return self._count(self._f.readline(*args))
+
+    def __iter__(self):
+        for line in self._f:
+            yield self._count(line)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+class ProfiledPopen(_Popen):
+    """Popen recording its latency (start to exit) and output size with the active profiler"""
+
+    def __init__(self, args, *popenargs, **kwargs):
+        self.profile_start = time.perf_counter()
+        self.profile_stack = _profiler.stack()
+        self.bytes_read = 0
+        self._recorded = self._communicating = False
+        super().__init__(args, *popenargs, **kwargs)
+        if self.stdout is not None:
+            self.stdout = CountingReader(self.stdout, self)
+
+    def _record(self):
+        if not self._recorded and not self._communicating and self.returncode is not None:
+            self._recorded = True
+            _profiler.record_command(command_name(self.args), self.profile_stack,
+                                     time.perf_counter() - self.profile_start, self.bytes_read, self.returncode)
+
+    def communicate(self, *args, **kwargs):
+        # communicate() may read the pipes directly, so count what it returns instead
+        self._communicating = True
+        try:
+            stdout, stderr = super().communicate(*args, **kwargs)
+        finally:
+            self._communicating = False
+        self.bytes_read = len(stdout or '') + len(stderr or '')
+        self._record()
+        return stdout, stderr
+
+    def wait(self, timeout=None):
+        returncode = super().wait(timeout)
+        self._record()
+        return returncode
+
+    def poll(self):
+        returncode = super().poll()
+        if returncode is not None:
+            self._record()
+        return returncode
+
+class Profiler:
+    """Subprocess and phase timings of one script run.
+
+    Phases nest per thread; other threads start below the main thread's
+    current phase, as thread pools are only used inside a phase.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.main_stack = (name,)
+        self.phases = defaultdict(lambda: [0, 0.0])  # phase stack -> [calls, seconds]
+        self.commands = defaultdict(lambda: {'calls': 0, 'failures': 0, 'seconds': 0.0, 'bytes_read': 0})
+        self.command_stacks = defaultdict(float)  # phase stack + (command,) -> seconds
+
+    def stack(self):
+        return getattr(self.local, 'stack', None) or self.main_stack
+
+    def _set_stack(self, stack):
+        self.local.stack = stack
+        if threading.current_thread() is threading.main_thread():
+            self.main_stack = stack
+
+    @contextmanager
+    def phase(self, name):
+        outer = self.stack()
+        self._set_stack(outer + (name,))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._set_stack(outer)
+            with self.lock:
+                totals = self.phases[outer + (name,)]
+                totals[0] += 1
+                totals[1] += elapsed
+
+    def record_command(self, name, stack, seconds, bytes_read, returncode):
+        with self.lock:
+            totals = self.commands[name]
+            totals['calls'] += 1
+            totals['failures'] += returncode != 0
+            totals['seconds'] += seconds
+            totals['bytes_read'] += bytes_read
+            self.command_stacks[stack + (name,)] += seconds
+
+    def report(self):
+        commands = sorted(self.commands.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        return {
+            'script': self.name,
+            'argv': sys.argv,
+            'wall_seconds': round(time.perf_counter() - self.start, 6),
+            'subprocesses': {
+                'calls': sum(totals['calls'] for totals in self.commands.values()),
+                'seconds': round(sum(totals['seconds'] for totals in self.commands.values()), 6),
+                'bytes_read': sum(totals['bytes_read'] for totals in self.commands.values())
+            },
+            'commands': {name: dict(totals, seconds=round(totals['seconds'], 6)) for name, totals in commands},
+            'phases': [
+                {'phase': ';'.join(stack[1:]), 'calls': calls, 'seconds': round(seconds, 6)}
+                for stack, (calls, seconds) in sorted(self.phases.items())
+            ]
+        }
+
+    def collapsed_stacks(self):
+        """`frame;frame;... microseconds` lines of self time; subprocesses are leaves below their phase.
+
+        Subprocess output is usually parsed while the process still runs, so
+        a phase's self time is clamped at zero when its subprocesses overlap it.
+        """
+        totals = {(self.name,): time.perf_counter() - self.start}
+        totals.update((stack, seconds) for stack, (_, seconds) in self.phases.items())
+        children = defaultdict(float)
+        for stack, seconds in list(totals.items()) + list(self.command_stacks.items()):
+            if len(stack) > 1:
+                children[stack[:-1]] += seconds
+        lines = []
+        for stack, seconds in sorted(totals.items()):
+            lines.append((stack, max(0.0, seconds - children[stack])))
+        lines.extend(sorted(self.command_stacks.items()))
+        return [f"{';'.join(stack)} {round(seconds * 1e6)}" for stack, seconds in lines if seconds > 0]
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        folded = os.path.splitext(path)[0] + '.folded'
+        with open(folded, 'w') as f:
+            f.write('\n'.join(self.collapsed_stacks()) + '\n')
+        print(f"Profile saved to {path} and {folded}", file=sys.stderr)
+
+def enable(name, path=None):
+    """Start recording; with `path` the report is written there when the script exits"""
+    global _profiler
+    _profiler = Profiler(name)
+    subprocess.Popen = ProfiledPopen
+    if path:
+        atexit.register(_profiler.write, path)
+    return _profiler
+
+def phase(name):
+    """Context manager timing a named phase of the running script"""
+    return _profiler.phase(name) if _profiler is not None else nullcontext()
+
+def add_profile_argument(parser):
+    parser.add_argument('--profile', nargs='?', const=True, metavar='PATH',
+                        help='Write subprocess and phase timings to PATH (default: <script>.profile.json in '
+                             'the system temporary directory) and a flamegraph collapsed-stack file next to it')
+
+def start_profile(args, name):
+    """Enable profiling if the script was run with --profile"""
+    if args.profile:
+        # Not the working directory: the git scripts run inside the checkout they analyze
+        default = os.path.join(tempfile.gettempdir(), f'{name}.profile.json')
+        enable(name, default if args.profile is True else args.profile)
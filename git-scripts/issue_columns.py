@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Columnar Issue and PR Tables
+Stores issues (processed or raw) and pull requests as NumPy columns so that
+the DataExplorer statistics can be computed with vectorized operations
+instead of slicing date strings record by record.
+
+NumPy is optional: `available()` tells whether the columnar backend can be
+used, and building a table without it raises ImportError.
+"""
+
+import argparse
+import calendar
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def available() -> bool:
+    return np is not None
+
+def require_numpy():
+    if np is None:
+        raise ImportError("the columnar backend requires NumPy (pip install numpy)")
+
+class Interner:
+    """Assign consecutive integer codes to strings in first-seen order."""
+
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+
+    def code(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+def label_name(label) -> str:
+    # Processed issues store label names, raw issues and PRs label objects
+    return label if isinstance(label, str) else label.get("name")
+
+def login(user) -> str:
+    return user if isinstance(user, str) else (user or {}).get("login")
+
+def parse_dates(values: List[str]):
+    """ISO 8601 UTC strings (or None) to a datetime64[s] array with NaT for missing dates."""
+    # Dropping the trailing "Z" avoids NumPy's timezone deprecation warning
+    return np.array([value[:19] if value else "NaT" for value in values], dtype="datetime64[s]")
+
+class IssueColumnsBuilder:
+    """Collect issue or PR records during a scan and turn them into IssueColumns.
+
+    Has the `add(record)` / `result()` interface of DataExplorer accumulators.
+    """
+
+    def __init__(self):
+        require_numpy()
+        self.numbers = []
+        self.created = []
+        self.closed = []
+        self.authors = Interner()
+        self.author_codes = []
+        self.assignees = Interner()
+        self.assignee_ids = []
+        self.assignee_ptr = [0]
+        self.labels = Interner()
+        self.label_ids = []
+        self.label_ptr = [0]
+        self.columns = None
+
+    def add(self, record: Dict):
+        self.numbers.append(record.get("number") or 0)
+        self.created.append(record.get("created_at"))
+        self.closed.append(record.get("closed_at"))
+        # Missing authors are interned as None
+        self.author_codes.append(self.authors.code(record.get("author") or login(record.get("user"))))
+        for assignee in record.get("assignees") or []:
+            self.assignee_ids.append(self.assignees.code(login(assignee)))
+        self.assignee_ptr.append(len(self.assignee_ids))
+        for label in record.get("labels") or []:
+            self.label_ids.append(self.labels.code(label_name(label)))
+        self.label_ptr.append(len(self.label_ids))
+
+    def result(self) -> "IssueColumns":
+        if self.columns is None:
+            self.columns = IssueColumns(
+                numbers=np.array(self.numbers, dtype=np.int64),
+                created=parse_dates(self.created),
+                closed=parse_dates(self.closed),
+                author_codes=np.array(self.author_codes, dtype=np.int32),
+                author_names=self.authors.names,
+                assignee_ptr=np.array(self.assignee_ptr, dtype=np.int64),
+                assignee_ids=np.array(self.assignee_ids, dtype=np.int32),
+                assignee_names=self.assignees.names,
+                label_ptr=np.array(self.label_ptr, dtype=np.int64),
+                label_ids=np.array(self.label_ids, dtype=np.int32),
+                label_names=self.labels.names
+            )
+        return self.columns
+
+class IssueColumns:
+    """Issues or PRs as parallel arrays; assignees and labels are CSR lists of ids per row."""
+
+    def __init__(self, numbers, created, closed, author_codes, author_names,
+                 assignee_ptr, assignee_ids, assignee_names, label_ptr, label_ids, label_names):
+        self.numbers = numbers
+        self.created = created
+        self.closed = closed
+        self.author_codes = author_codes
+        self.author_names = author_names
+        self.assignee_ptr = assignee_ptr
+        self.assignee_ids = assignee_ids
+        self.assignee_names = assignee_names
+        self.label_ptr = label_ptr
+        self.label_ids = label_ids
+        self.label_names = label_names
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "IssueColumns":
+        builder = IssueColumnsBuilder()
+        for record in records:
+            builder.add(record)
+        return builder.result()
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def monthly_counts(self, column) -> Dict[str, int]:
+        """Number of rows per YYYY-MM month of a date column, ignoring missing dates."""
+        months, counts = np.unique(column[~np.isnat(column)].astype("datetime64[M]"), return_counts=True)
+        return dict(zip(np.datetime_as_string(months, unit="M").tolist(), counts.tolist()))
+
+    def monthly_created(self) -> Dict[str, int]:
+        return self.monthly_counts(self.created)
+
+    def monthly_closed(self) -> Dict[str, int]:
+        return self.monthly_counts(self.closed)
+
+    def days_to_close(self):
+        """Days from creation to closing of every closed row (float array)."""
+        closed = ~np.isnat(self.closed) & ~np.isnat(self.created)
+        return (self.closed[closed] - self.created[closed]).astype(np.float64) / 86400
+
+    def close_time_percentiles(self, percentiles=(50, 75, 90, 99)) -> Dict[int, float]:
+        days = self.days_to_close()
+        if not len(days):
+            return {}
+        return dict(zip(percentiles, np.percentile(days, percentiles).tolist()))
+
+    @staticmethod
+    def ranked(counts, names: List[str], limit: int = None) -> List[Tuple[str, int]]:
+        """(name, count) pairs by decreasing count, ties in first-seen order like Counter.most_common."""
+        order = np.argsort(-counts, kind="stable")
+        order = order[counts[order] > 0][:limit]
+        return [(names[i], int(counts[i])) for i in order]
+
+    def label_counts(self):
+        return np.bincount(self.label_ids, minlength=len(self.label_names))
+
+    def author_counts(self):
+        return np.bincount(self.author_codes, minlength=len(self.author_names))
+
+    def assignee_counts(self):
+        return np.bincount(self.assignee_ids, minlength=len(self.assignee_names))
+
+    def label_rows(self):
+        """Row index of every entry of `label_ids`."""
+        return np.repeat(np.arange(len(self)), np.diff(self.label_ptr))
+
+    def label_breakdown(self, percentile: float = 50) -> List[Dict]:
+        """Per label: number of rows, closed rows and the given percentile of days to close."""
+        rows = self.label_rows()
+        closed = ~np.isnat(self.closed[rows]) & ~np.isnat(self.created[rows])
+        totals = np.bincount(self.label_ids, minlength=len(self.label_names))
+        closed_totals = np.bincount(self.label_ids[closed], minlength=len(self.label_names))
+
+        # Group the close times of every label into one sorted run per label
+        labels = self.label_ids[closed]
+        days = (self.closed[rows[closed]] - self.created[rows[closed]]).astype(np.float64) / 86400
+        order = np.lexsort((days, labels))
+        labels, days = labels[order], days[order]
+        bounds = np.searchsorted(labels, np.arange(len(self.label_names) + 1))
+
+        breakdown = []
+        for label_id, name in enumerate(self.label_names):
+            run = days[bounds[label_id]:bounds[label_id + 1]]
+            breakdown.append({
+                "label": name,
+                "count": int(totals[label_id]),
+                "closed": int(closed_totals[label_id]),
+                "days_to_close": float(np.percentile(run, percentile)) if len(run) else None
+            })
+        return breakdown
+
+def monthly_counts_loop(issues: List[Dict], field: str) -> Dict[str, int]:
+    """Reference dict-loop implementation (as in DataExplorer) for the benchmark."""
+    counts = defaultdict(int)
+    for issue in issues:
+        if issue.get(field):
+            counts[issue[field][:7]] += 1
+    return counts
+
+def synthetic_issues(count: int, seed: int = 0) -> List[Dict]:
+    """Processed-issue records with random dates, authors, assignees and labels."""
+    rng = random.Random(seed)
+    labels = [f"area:{i}" for i in range(60)] + [f"itype:{i}" for i in range(12)] + ["stat:needs triage"]
+    start = 1514764800  # 2018-01-01
+    issues = []
+    for number in range(count):
+        created = start + rng.randrange(8 * 365 * 86400)
+        closed = created + int(rng.expovariate(1 / (30 * 86400))) if rng.random() < 0.75 else None
+        issues.append({
+            "number": number,
+            "state": "closed" if closed else "open",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created)),
+            "closed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(closed)) if closed else None,
+            "author": f"user{rng.randrange(5000)}",
+            "assignees": [f"user{rng.randrange(300)}"] if rng.random() < 0.3 else [],
+            "labels": rng.sample(labels, rng.randrange(4))
+        })
+    return issues
+
+def benchmark(count: int):
+    """Compare the dict loops of DataExplorer with the columnar backend on synthetic issues."""
+    require_numpy()
+    issues = synthetic_issues(count)
+    timings = {}
+
+    def timed(name, function):
+        start = time.perf_counter()
+        result = function()
+        timings[name] = time.perf_counter() - start
+        return result
+
+    def loop_breakdown():
+        totals, closed_totals, days = Counter(), Counter(), defaultdict(list)
+        for issue in issues:
+            totals.update(issue["labels"])
+            if issue.get("closed_at"):
+                closed_totals.update(issue["labels"])
+                created = calendar.timegm(time.strptime(issue["created_at"], "%Y-%m-%dT%H:%M:%SZ"))
+                closed = calendar.timegm(time.strptime(issue["closed_at"], "%Y-%m-%dT%H:%M:%SZ"))
+                for label in issue["labels"]:
+                    days[label].append((closed - created) / 86400)
+        return totals, closed_totals, {label: sorted(values)[len(values) // 2] for label, values in days.items()}
+
+    created = timed("loop: monthly created+closed", lambda: (
+        monthly_counts_loop(issues, "created_at"), monthly_counts_loop(issues, "closed_at")))
+    label_counts = timed("loop: label counts", lambda: Counter(l for issue in issues for l in issue["labels"]))
+    timed("loop: label breakdown + median days", loop_breakdown)
+
+    columns = timed("columnar: build", lambda: IssueColumns.from_records(issues))
+    columnar_created = timed("columnar: monthly created+closed", lambda: (
+        columns.monthly_created(), columns.monthly_closed()))
+    columnar_labels = timed("columnar: label counts", lambda: columns.ranked(columns.label_counts(), columns.label_names))
+    timed("columnar: label breakdown + median days", columns.label_breakdown)
+    timed("columnar: close time percentiles", columns.close_time_percentiles)
+
+    assert dict(created[0]) == columnar_created[0] and dict(created[1]) == columnar_created[1]
+    assert label_counts.most_common() == columnar_labels
+
+    print(f"{count} synthetic issues")
+    for name, seconds in timings.items():
+        print(f"  {name:45} {seconds:8.3f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the columnar issue backend against the dict loops")
+    parser.add_argument("--issues", type=int, default=500000, help="Number of synthetic issues")
+    args = parser.parse_args()
+
+    try:
+        benchmark(args.issues)
+    except ImportError as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
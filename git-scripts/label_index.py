@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Label Index for Scala 3 Issues
+Interns label names to ids and keeps, per label, the rows of the issues that
+carry it, both as a posting list and as an integer bitmap. Totals, category
+roll-ups, label co-occurrence and AND/OR/NOT queries are answered from the
+index without rescanning the issues.
+"""
+
+import argparse
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from fetch_github_data import find_dataset, iter_dataset
+from instrumentation import add_profile_argument, phase, start_profile
+
+ISSUE_FILES = ["scala3_open_issues.json", "scala3_closed_issues.json"]
+
+def popcount(bitmap: int) -> int:
+    return bin(bitmap).count("1")
+
+def label_category(name: str) -> str:
+    """'area:typer' -> 'area'; labels without a prefix have no category (None)."""
+    prefix, separator, _ = name.partition(":")
+    return prefix if separator else None
+
+class LabelIndex:
+    """Label ids and per-label issue postings.
+
+    Issues are numbered by rows in the order they are added. Has the
+    `add(issue)` / `result()` interface of DataExplorer accumulators.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+        self.postings = []  # label id -> ascending issue rows
+        self.row_labels = []  # issue row -> label ids
+        self.numbers = []  # issue row -> issue number
+        self._bitmaps = None
+
+    def label_id(self, name: str) -> int:
+        label_id = self.ids.get(name)
+        if label_id is None:
+            label_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.postings.append([])
+        return label_id
+
+    def add(self, issue: Dict):
+        row = len(self.numbers)
+        self.numbers.append(issue.get("number"))
+        # Processed issues store label names, raw issues label objects; duplicates count once
+        label_ids = []
+        for label in issue.get("labels", []):
+            label_id = self.label_id(label if isinstance(label, str) else label.get("name"))
+            if label_id not in label_ids:
+                label_ids.append(label_id)
+                self.postings[label_id].append(row)
+        self.row_labels.append(tuple(label_ids))
+        self._bitmaps = None
+
+    def result(self) -> "LabelIndex":
+        return self
+
+    def __len__(self):
+        return len(self.numbers)
+
+    @property
+    def bitmaps(self) -> List[int]:
+        """Per label an int with bit `row` set for every issue row carrying the label."""
+        if self._bitmaps is None:
+            self._bitmaps = []
+            for rows in self.postings:
+                bits = bytearray((len(self.numbers) + 7) // 8)
+                for row in rows:
+                    bits[row >> 3] |= 1 << (row & 7)
+                self._bitmaps.append(int.from_bytes(bits, "little"))
+        return self._bitmaps
+
+    def totals(self) -> Counter:
+        """Number of issues per label, in first-seen label order."""
+        return Counter({name: len(rows) for name, rows in zip(self.names, self.postings)})
+
+    def category_rollup(self) -> Dict[str, Dict[str, int]]:
+        """Per label category: how many labels it has and how many issues carry at least one of them."""
+        categories = {}
+        for label_id, name in enumerate(self.names):
+            category = label_category(name)
+            if category is None:
+                continue
+            rollup = categories.setdefault(category, {"labels": 0, "issues": 0})
+            rollup["labels"] += 1
+            rollup["issues"] |= self.bitmaps[label_id]
+        for rollup in categories.values():
+            rollup["issues"] = popcount(rollup["issues"])
+        return categories
+
+    def cooccurrence(self) -> Dict[Tuple[int, int], int]:
+        """Sparse label x label co-occurrence counts {(i, j): issues} for i < j.
+
+        This is the upper triangle of A^T A for the issue x label incidence
+        matrix A, accumulated row by row so only label pairs that actually
+        occur together are touched.
+        """
+        counts = Counter()
+        for label_ids in self.row_labels:
+            for k, first in enumerate(label_ids):
+                for second in label_ids[k + 1:]:
+                    counts[(first, second) if first < second else (second, first)] += 1
+        return counts
+
+    def cooccurrence_matrix(self) -> List[List[int]]:
+        """Dense symmetric co-occurrence matrix; the diagonal holds the label totals."""
+        matrix = [[0] * len(self.names) for _ in self.names]
+        for label_id, rows in enumerate(self.postings):
+            matrix[label_id][label_id] = len(rows)
+        for (first, second), count in self.cooccurrence().items():
+            matrix[first][second] = matrix[second][first] = count
+        return matrix
+
+    def top_pairs(self, limit: int = 10) -> List[Tuple[str, str, int]]:
+        pairs = sorted(self.cooccurrence().items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self.names[first], self.names[second], count) for (first, second), count in pairs]
+
+    def select(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (), none_of: Iterable[str] = ()) -> int:
+        """Bitmap of the issue rows that have every `all_of`, at least one `any_of` and no `none_of` label."""
+        bitmaps = self.bitmaps
+        result = (1 << len(self.numbers)) - 1
+        for name in all_of:
+            if name not in self.ids:
+                return 0
+            result &= bitmaps[self.ids[name]]
+        if any_of:
+            selected = 0
+            for name in any_of:
+                if name in self.ids:
+                    selected |= bitmaps[self.ids[name]]
+            result &= selected
+        for name in none_of:
+            if name in self.ids:
+                result &= ~bitmaps[self.ids[name]]
+        return result
+
+    def query(self, all_of: Iterable[str] = (), any_of: Iterable[str] = (), none_of: Iterable[str] = ()) -> List[int]:
+        """Issue numbers matching `select`, in row order."""
+        bitmap = self.select(all_of, any_of, none_of)
+        numbers = []
+        for offset, byte in enumerate(bitmap.to_bytes((len(self.numbers) + 7) // 8, "little")):
+            while byte:
+                lowest = byte & -byte
+                numbers.append(self.numbers[offset * 8 + lowest.bit_length() - 1])
+                byte ^= lowest
+        return numbers
+
+def build_index(data_dir: str) -> LabelIndex:
+    """Index the labels of the processed open and closed issue files in `data_dir`."""
+    index = LabelIndex()
+    for filename in ISSUE_FILES:
+        filepath = find_dataset(os.path.join(data_dir, filename))
+        if filepath:
+            for issue in iter_dataset(filepath, "issues"):
+                index.add(issue)
+        else:
+            print(f"✗ File not found: {filename}")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Query issues by label combinations")
+    parser.add_argument("labels", nargs="*", help="Labels every matching issue must have")
+    parser.add_argument("--any", nargs="+", default=[], metavar="LABEL",
+                        help="Labels of which matching issues must have at least one")
+    parser.add_argument("--not", nargs="+", default=[], metavar="LABEL", dest="none",
+                        help="Labels matching issues must not have")
+    parser.add_argument("--data-dir", default="app", help="Directory holding the fetched data")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    start_profile(args, "label_index")
+
+    with phase("index"):
+        index = build_index(args.data_dir)
+    with phase("query"):
+        numbers = index.query(args.labels, args.any, args.none)
+    print(f"{len(numbers)} of {len(index)} issues match")
+    for number in numbers:
+        print(f"  #{number}")
+
+if __name__ == "__main__":
+    main()
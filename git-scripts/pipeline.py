@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Data Refresh Pipeline
+Runs the data refresh from the GitHub fetch to the files the site loads as a
+DAG of stages with declared inputs and outputs:
+
+    fetch -> analyze -> publish      (GitHub side)
+    contributors                     (git side, needs --repo)
+    references -> (base, deltas, pyramid)
+    metrics
+
+A stage is skipped when the content hashes of its inputs (and its command)
+match the previous run and its outputs are unchanged since then, so a stage
+downstream of one that rewrote identical files is skipped too. Independent
+stages run in parallel.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = 'git-scripts'
+STATE_DIR = '.pipeline'
+# First commit of the contributor statistics, as in git_contributor_viz.py
+DEFAULT_START_COMMIT = '848aedacca225ffd2e08219cfe1141b4382aaee5'
+# Visualization files the site imports from data/timeline; the per-event
+# visualization_timeline.json stays in app/
+PUBLISHED_FILES = [f'visualization_{name}.json' for name in ('backlog', 'issues', 'labels', 'contributors')]
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_files(patterns, root=ROOT):
+    """One digest over the relative paths and contents of every file matching `patterns`"""
+    digest = hashlib.sha256()
+    paths = sorted({path for pattern in patterns for path in glob.glob(os.path.join(root, pattern))
+                    if os.path.isfile(path)})
+    for path in paths:
+        digest.update(os.path.relpath(path, root).encode() + b'\0' + hash_file(path).encode() + b'\0')
+    return digest.hexdigest(), len(paths)
+
+def scripts(*names):
+    return [f'{SCRIPTS}/{name}.py' for name in names]
+
+class Stage:
+    """A step of the pipeline.
+
+    `run` is a command (list, run with `cwd`) or a function; `inputs` and
+    `outputs` are glob patterns relative to the repository root; `keys`
+    returns extra values the result depends on (e.g. resolved commits).
+    Stages without inputs, like the network fetch, always run.
+    """
+
+    def __init__(self, name, run, inputs=(), outputs=(), deps=(), cwd=ROOT, keys=None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.cwd = cwd
+        self.keys = keys
+
+    def input_hash(self):
+        digest = hashlib.sha256(json.dumps(self.run if isinstance(self.run, list) else self.run.__name__).encode())
+        digest.update(hash_files(self.inputs)[0].encode())
+        if self.keys:
+            digest.update(json.dumps(self.keys()).encode())
+        return digest.hexdigest()
+
+    def output_hash(self):
+        return hash_files(self.outputs)[0]
+
+def python(script, *args):
+    return [sys.executable, os.path.join(ROOT, SCRIPTS, f'{script}.py'), *args]
+
+def publish_timeline():
+    """Copy the visualization files the site imports from app/, where analyze_data.py writes them, to data/timeline"""
+    os.makedirs(os.path.join(ROOT, 'data', 'timeline'), exist_ok=True)
+    for name in PUBLISHED_FILES:
+        shutil.copyfile(os.path.join(ROOT, 'app', name), os.path.join(ROOT, 'data', 'timeline', name))
+
+def build_stages(args):
+    stages = []
+    if args.fetch != 'skip':
+        stages.append(Stage(
+            'fetch',
+            python('fetch_github_data', *(['--sync'] if args.fetch == 'sync' else [])),
+            outputs=['app/scala3_*']
+        ))
+    datasets = [f'app/{name}.*' for name in ('scala3_open_issues', 'scala3_closed_issues', 'scala3_contributors')]
+    stages.append(Stage(
+        'analyze',
+        python('analyze_data', 'visualization', '--data-dir', 'app'),
+        inputs=datasets + scripts('analyze_data', 'fetch_github_data', 'issue_columns', 'label_index', 'instrumentation'),
+        outputs=['app/visualization_*.json'],
+        deps=['fetch'] if args.fetch != 'skip' else []
+    ))
+    stages.append(Stage(
+        'publish',
+        publish_timeline,
+        inputs=[f'app/{name}' for name in PUBLISHED_FILES],
+        outputs=[f'data/timeline/{name}' for name in PUBLISHED_FILES],
+        deps=['analyze']
+    ))
+    if args.repo:
+        start, end = args.range
+        output = os.path.join(ROOT, 'data', 'contributors', 'contributors_data.json')
+        stages.append(Stage(
+            'contributors',
+            python('git_contributor_viz', start, end, '-o', output, '--format', 'sparse', '--incremental'),
+            inputs=scripts('git_contributor_viz', 'git_file_changes', 'git_session', 'commit_index', 'instrumentation'),
+            outputs=['data/contributors/contributors_data*.json'],
+            cwd=args.repo,
+            # The range is given by revisions, so what they point at is part of the input
+            keys=lambda: subprocess.check_output(
+                ['git', '-C', args.repo, 'rev-parse', f'{start}^{{commit}}', f'{end}^{{commit}}'],
+                text=True).split()
+        ))
+    references = ['data/references/*.csv']
+    stages.append(Stage(
+        'references',
+        python('reference_graph', '--references', 'data/references', '-o', 'data/references/graph'),
+        inputs=references + scripts('reference_graph', 'instrumentation'),
+        outputs=['data/references/graph/base.json', 'data/references/graph/deltas.json',
+                 'data/references/graph/pyramid.json']
+    ))
+    stages.append(Stage(
+        'metrics',
+        python('graph_metrics', '--references', 'data/references', '-o', 'data/references/graph/metrics.json'),
+        inputs=references + scripts('graph_metrics', 'reference_graph', 'instrumentation'),
+        outputs=['data/references/graph/metrics.json']
+    ))
+    check_stages(stages)
+    return stages
+
+def check_stages(stages):
+    """Raise ValueError if a stage depends on a stage that is not defined or on itself through others"""
+    deps = {stage.name: stage.deps for stage in stages}
+    for name, stage_deps in deps.items():
+        unknown = [dep for dep in stage_deps if dep not in deps]
+        if unknown:
+            raise ValueError(f"stage {name} depends on unknown stage: {', '.join(unknown)}")
+    done = set()
+    while len(done) < len(deps):
+        ready = [name for name, stage_deps in deps.items() if name not in done and done.issuperset(stage_deps)]
+        if not ready:
+            raise ValueError(f"dependency cycle between stages: {', '.join(sorted(deps.keys() - done))}")
+        done.update(ready)
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def run_stage(stage, state, force, log_dir):
+    """Run or skip one stage; return (status, seconds, state entry)"""
+    start = time.perf_counter()
+    previous = state.get(stage.name, {})
+    try:
+        inputs = stage.input_hash() if stage.inputs or stage.keys else None
+    except subprocess.CalledProcessError as e:
+        print(f"Error in stage {stage.name}: {e}")
+        return 'failed', time.perf_counter() - start, previous
+    if (not force and inputs is not None and previous.get('inputs') == inputs
+            and previous.get('outputs') == stage.output_hash()):
+        return 'skipped', time.perf_counter() - start, previous
+
+    if isinstance(stage.run, list):
+        with open(os.path.join(log_dir, f'{stage.name}.log'), 'w') as log:
+            returncode = subprocess.run(stage.run, cwd=stage.cwd, stdout=log, stderr=subprocess.STDOUT).returncode
+        if returncode != 0:
+            return 'failed', time.perf_counter() - start, previous
+    else:
+        try:
+            stage.run()
+        except OSError as e:
+            print(f"Error in stage {stage.name}: {e}")
+            return 'failed', time.perf_counter() - start, previous
+    return 'ran', time.perf_counter() - start, {'inputs': inputs, 'outputs': stage.output_hash()}
+
+def run_pipeline(stages, state, force=(), jobs=4, log_dir=STATE_DIR):
+    """Run every stage once its dependencies are done, up to `jobs` at a time; return stage -> (status, seconds)"""
+    names = {stage.name for stage in stages}
+    results = {}
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                deps = [dep for dep in stage.deps if dep in names]
+                if any(results.get(dep, ('',))[0] in ('failed', 'blocked') for dep in deps):
+                    results[name] = ('blocked', 0.0)
+                    del pending[name]
+                elif all(dep in results for dep in deps):
+                    running[executor.submit(run_stage, stage, state, 'all' in force or name in force, log_dir)] = name
+                    del pending[name]
+            if not running:
+                # Only a dependency cycle leaves stages that can never start
+                raise ValueError(f"stages cannot start: {', '.join(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                status, seconds, entry = future.result()
+                state[name] = entry
+                results[name] = (status, seconds)
+                print(f"  {name:13} {status:8} {seconds:7.2f} s"
+                      + (f"  (see {os.path.join(log_dir, name + '.log')})" if status == 'failed' else ""))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh the site data, skipping stages whose inputs did not change')
+    parser.add_argument('--fetch', choices=['sync', 'full', 'skip'], default='sync',
+                        help='Fetch only changed GitHub items (default), everything, or use the stored data')
+    parser.add_argument('--repo', help='Local scala3 clone; enables the git contributor statistics stage')
+    parser.add_argument('--range', nargs=2, metavar=('START', 'END'), default=[DEFAULT_START_COMMIT, 'HEAD'],
+                        help='Commit range of the contributor statistics')
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help='Run these stages even if unchanged (no names: all of them)')
+    parser.add_argument('--only', nargs='+', metavar='STAGE', help='Only run these stages')
+    parser.add_argument('--jobs', '-j', type=int, default=4, help='Stages running at the same time')
+    parser.add_argument('--state-dir', default=os.path.join(ROOT, STATE_DIR),
+                        help='Where stage hashes and logs are kept')
+
+    args = parser.parse_args()
+    if args.force is None:
+        args.force = []
+    elif not args.force:
+        args.force = ['all']
+
+    try:
+        stages = build_stages(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    known = [stage.name for stage in stages]
+    unknown = [name for name in (args.only or []) + args.force if name not in known + ['all']]
+    if unknown:
+        parser.error(f"unknown stage: {', '.join(unknown)} (stages: {', '.join(known)})")
+    if args.only:
+        stages = [stage for stage in stages if stage.name in args.only]
+
+    os.makedirs(args.state_dir, exist_ok=True)
+    state_file = os.path.join(args.state_dir, 'state.json')
+    state = load_state(state_file)
+
+    start = time.perf_counter()
+    print(f"Running {len(stages)} stages: {', '.join(stage.name for stage in stages)}")
+    results = run_pipeline(stages, state, args.force, args.jobs, args.state_dir)
+    with open(state_file, 'w') as f:
+        json.dump(state, f, indent=2)
+
+    counts = {status: sum(1 for s, _ in results.values() if s == status) for status in ('ran', 'skipped', 'failed', 'blocked')}
+    print(f"Done in {time.perf_counter() - start:.2f} s: " + ", ".join(f"{n} {status}" for status, n in counts.items() if n))
+    if counts['failed'] or counts['blocked']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Reference Graph Store
+Loads the per-release `from,to,weight` reference CSVs into one interned node
+table with a CSR adjacency per version, and writes them back as the oldest
+version plus the edge changes between consecutive versions, which is what
+the site loads to rebuild any version. It also writes the edges collapsed to
+every directory level of the compiler tree, so the site can draw the graph
+for a set of expanded directories without touching every file-level edge.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+
+from instrumentation import add_profile_argument, phase, start_profile
+
+# Directory tree the site lets users expand and collapse
+PYRAMID_ROOT = 'compiler'
+
+def version_key(version):
+    return tuple(int(part) if part.isdigit() else part for part in version.split('.'))
+
+def read_reference_csv(path):
+    """Yield (from, to, weight) rows of a reference CSV"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # from,to,weight header
+        for source, target, weight in reader:
+            yield source, target, int(weight)
+
+def find_reference_csvs(directory):
+    """Map every version with a `<version>.csv` in `directory` to its path, oldest first"""
+    versions = [name[:-len('.csv')] for name in os.listdir(directory) if name.endswith('.csv')]
+    return {version: os.path.join(directory, f'{version}.csv') for version in sorted(versions, key=version_key)}
+
+class CSRGraph:
+    """Adjacency of one version: the targets of node i are indices[indptr[i]:indptr[i + 1]], ascending"""
+
+    def __init__(self, indptr, indices, weights):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, node_count, edges):
+        """Build from (source id, target id, weight) triples"""
+        edges = sorted(edges)
+        indptr = array('I', [0]) * (node_count + 1)
+        indices = array('I', (target for _, target, _ in edges))
+        weights = array('I', (weight for _, _, weight in edges))
+        for source, _, _ in edges:
+            indptr[source + 1] += 1
+        for i in range(node_count):
+            indptr[i + 1] += indptr[i]
+        return cls(indptr, indices, weights)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def row(self, source):
+        start, end = self.indptr[source], self.indptr[source + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def edges(self):
+        """Yield (source id, target id, weight) in (source, target) order"""
+        for source in range(len(self.indptr) - 1):
+            for k in range(self.indptr[source], self.indptr[source + 1]):
+                yield source, self.indices[k], self.weights[k]
+
+def diff_graphs(old, new):
+    """Added, removed and reweighted edges from `old` to `new`, merging the sorted rows of both"""
+    added, removed, reweighted = [], [], []
+    for source in range(len(new.indptr) - 1):
+        old_targets, old_weights = old.row(source)
+        new_targets, new_weights = new.row(source)
+        i = j = 0
+        while i < len(old_targets) or j < len(new_targets):
+            if j == len(new_targets) or (i < len(old_targets) and old_targets[i] < new_targets[j]):
+                removed.append((source, old_targets[i]))
+                i += 1
+            elif i == len(old_targets) or new_targets[j] < old_targets[i]:
+                added.append((source, new_targets[j], new_weights[j]))
+                j += 1
+            else:
+                if old_weights[i] != new_weights[j]:
+                    reweighted.append((source, new_targets[j], new_weights[j]))
+                i += 1
+                j += 1
+    return added, removed, reweighted
+
+def truncate(path, depth):
+    """The directory of `path` at `depth` path components, or the path itself if it is not deeper"""
+    return '/'.join(path.split('/')[:depth])
+
+def flatten(rows):
+    return [value for row in rows for value in row]
+
+class ReferenceGraphStore:
+    """All versions over one node table.
+
+    Nodes are the sorted union of every path in any version, so ordering
+    edges by (source id, target id) is the same as the CSV (from, to) order.
+    """
+
+    def __init__(self, nodes, graphs):
+        self.nodes = nodes
+        self.node_ids = {node: i for i, node in enumerate(nodes)}
+        self.graphs = graphs  # version -> CSRGraph, oldest first
+
+    @classmethod
+    def from_csv_dir(cls, directory):
+        rows = {version: list(read_reference_csv(path)) for version, path in find_reference_csvs(directory).items()}
+        nodes = sorted({path for edges in rows.values() for source, target, _ in edges for path in (source, target)})
+        node_ids = {node: i for i, node in enumerate(nodes)}
+        graphs = {
+            version: CSRGraph.from_edges(len(nodes), ((node_ids[s], node_ids[t], w) for s, t, w in edges))
+            for version, edges in rows.items()
+        }
+        return cls(nodes, graphs)
+
+    @property
+    def versions(self):
+        return list(self.graphs)
+
+    def rows(self, version):
+        """Yield (from, to, weight) of a version in CSV order"""
+        for source, target, weight in self.graphs[version].edges():
+            yield self.nodes[source], self.nodes[target], weight
+
+    def deltas(self):
+        """Edge changes of every version against the previous one"""
+        versions = self.versions
+        deltas = {}
+        for previous, version in zip(versions, versions[1:]):
+            added, removed, reweighted = diff_graphs(self.graphs[previous], self.graphs[version])
+            deltas[version] = {
+                'previous': previous,
+                'added': flatten(added),
+                'removed': flatten(removed),
+                'reweighted': flatten(reweighted)
+            }
+        return deltas
+
+    def snapshot(self):
+        """The oldest version as CSR over the node table"""
+        base = self.versions[0]
+        graph = self.graphs[base]
+        return {
+            'nodes': self.nodes,
+            'versions': self.versions,
+            'base': base,
+            'indptr': list(graph.indptr),
+            'indices': list(graph.indices),
+            'weights': list(graph.weights)
+        }
+
+    def pyramid(self, root=PYRAMID_ROOT):
+        """Every version's edges under `root` collapsed to each directory level.
+
+        Level d maps a path to its first d components, sums the weights of
+        the edges that fall onto the same pair and drops self-loops. Only
+        pairs with a directory end are stored: pairs of two files are
+        file-level edges, already in the snapshot and deltas. Directories
+        get ids after the node table, and an edge of level d has at least
+        one end of depth d, so the site indexes a directory's edges at its
+        own level by their ends.
+        """
+        prefix = root + '/'
+        dirs = sorted({
+            truncate(node, depth)
+            for node in self.nodes if node.startswith(prefix)
+            for depth in range(1, node.count('/') + 1)
+        })
+        ids = dict(self.node_ids)
+        ids.update((path, len(self.nodes) + i) for i, path in enumerate(dirs))
+
+        versions = {}
+        for version in self.versions:
+            levels = defaultdict(Counter)
+            for source, target, weight in self.rows(version):
+                if not (source.startswith(prefix) and target.startswith(prefix)):
+                    continue
+                # Below the depth of the deeper file at least one end is a directory
+                for depth in range(1, max(source.count('/'), target.count('/')) + 1):
+                    pair = truncate(source, depth), truncate(target, depth)
+                    if pair[0] != pair[1]:
+                        levels[depth][pair] += weight
+            versions[version] = [
+                flatten((ids[source], ids[target], weight) for (source, target), weight in sorted(
+                    levels[depth].items(), key=lambda item: (ids[item[0][0]], ids[item[0][1]])))
+                for depth in range(max(levels, default=0) + 1)
+            ]
+        return {'root': root, 'dirs': dirs, 'versions': versions}
+
+    def write(self, output_dir):
+        """Write base.json (node table and oldest version), deltas.json and pyramid.json; return their paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for name, data in (('base.json', self.snapshot()), ('deltas.json', self.deltas()),
+                           ('pyramid.json', self.pyramid())):
+            path = os.path.join(output_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            paths.append(path)
+        return paths
+
+def rebuild_versions(snapshot, deltas):
+    """Yield (version, {(source id, target id): weight}) for every version by applying the deltas in order"""
+    edges = {}
+    indptr, indices, weights = snapshot['indptr'], snapshot['indices'], snapshot['weights']
+    for source in range(len(indptr) - 1):
+        for k in range(indptr[source], indptr[source + 1]):
+            edges[(source, indices[k])] = weights[k]
+    yield snapshot['base'], edges
+    for version in snapshot['versions'][1:]:
+        delta = deltas[version]
+        edges = dict(edges)
+        removed = delta['removed']
+        for k in range(0, len(removed), 2):
+            del edges[(removed[k], removed[k + 1])]
+        for changes in (delta['added'], delta['reweighted']):
+            for k in range(0, len(changes), 3):
+                edges[(changes[k], changes[k + 1])] = changes[k + 2]
+        yield version, edges
+
+def main():
+    parser = argparse.ArgumentParser(description='Store the reference graphs as a base snapshot plus per-version deltas')
+    parser.add_argument('--references', default='data/references', help='Directory holding the <version>.csv files')
+    parser.add_argument('--output', '-o', default='data/references/graph', help='Directory for base.json, deltas.json and pyramid.json')
+    parser.add_argument('--verify', action='store_true',
+                        help='Rebuild every version from the written files and compare it with its CSV')
+    add_profile_argument(parser)
+
+    args = parser.parse_args()
+    start_profile(args, 'reference_graph')
+
+    with phase('load'):
+        store = ReferenceGraphStore.from_csv_dir(args.references)
+    if not store.graphs:
+        print(f"Error: no reference CSVs found in {args.references}")
+        sys.exit(1)
+    with phase('write'):
+        paths = store.write(args.output)
+
+    csv_size = sum(os.path.getsize(path) for path in find_reference_csvs(args.references).values())
+    store_size = sum(os.path.getsize(path) for path in paths[:2])
+    print(f"{len(store.versions)} versions, {len(store.nodes)} nodes, "
+          f"{sum(len(graph) for graph in store.graphs.values())} edges in total")
+    print(f"CSV files: {csv_size} bytes, base + deltas: {store_size} bytes, "
+          f"pyramid: {os.path.getsize(paths[2])} bytes")
+
+    if args.verify:
+        with open(paths[0], encoding='utf-8') as f:
+            snapshot = json.load(f)
+        with open(paths[1], encoding='utf-8') as f:
+            deltas = json.load(f)
+        start = time.perf_counter()
+        rebuilt = list(rebuild_versions(snapshot, deltas))
+        elapsed = time.perf_counter() - start
+        for version, edges in rebuilt:
+            expected = list(read_reference_csv(os.path.join(args.references, f'{version}.csv')))
+            actual = [(snapshot['nodes'][s], snapshot['nodes'][t], edges[(s, t)]) for s, t in sorted(edges)]
+            if actual != expected:
+                print(f"Error: version {version} does not match its CSV")
+                sys.exit(1)
+        print(f"Rebuilt all {len(rebuilt)} versions in {elapsed * 1000:.1f} ms, all match their CSVs")
+
+if __name__ == "__main__":
+    main()
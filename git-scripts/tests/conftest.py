@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import benchmark  # noqa: E402
+
+GIT_ENV = {'GIT_CONFIG_GLOBAL': os.devnull, 'GIT_CONFIG_NOSYSTEM': '1'}
+
+@pytest.fixture(autouse=True)
+def isolated_git(monkeypatch):
+    for key, value in GIT_ENV.items():
+        monkeypatch.setenv(key, value)
+
+def run_script(script, *args, cwd):
+    """Run one of the scripts in `cwd`; return its output"""
+    return subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, script), *args], cwd=cwd, check=True,
+                          capture_output=True, text=True, env=dict(os.environ, **GIT_ENV)).stdout
+
+def git(repo, *args):
+    return subprocess.run(['git', '-C', repo, *args], check=True, capture_output=True, text=True,
+                          env=dict(os.environ, **GIT_ENV)).stdout
+
+@pytest.fixture(scope='session')
+def synthetic_repo(tmp_path_factory):
+    """A benchmark repository small enough for tests, with merges and two authors tied on commits"""
+    path = str(tmp_path_factory.mktemp('synthetic') / 'repo')
+    benchmark.generate_repo(path, 150, 8, 40, 2, merge_every=10, tie_every=7)
+    return path
+
+@pytest.fixture(scope='session')
+def merge_repo(tmp_path_factory):
+    """A repository with an empty commit, a conflicted merge and a clean merge.
+
+    Returns (path, root commit); every other commit is reachable from HEAD.
+    """
+    path = str(tmp_path_factory.mktemp('merges') / 'repo')
+    env = dict(os.environ, **GIT_ENV, GIT_AUTHOR_NAME='Alice', GIT_AUTHOR_EMAIL='alice@example.com',
+               GIT_COMMITTER_NAME='Alice', GIT_COMMITTER_EMAIL='alice@example.com')
+
+    def run(*args, author='Alice'):
+        subprocess.run(['git', '-C', path, *args], check=True, capture_output=True,
+                       env=dict(env, GIT_AUTHOR_NAME=author))
+
+    def write(name, text):
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(text)
+
+    subprocess.run(['git', 'init', '-q', '-b', 'main', path], check=True)
+    write('f', 'base\n')
+    run('add', 'f')
+    run('commit', '-q', '-m', 'root')
+    run('commit', '-q', '--allow-empty', '-m', 'empty', author='Bob')
+    run('checkout', '-q', '-b', 'side')
+    write('f', 'side\n')
+    write('g', 'side\n')
+    run('commit', '-q', '-am', 'side', author='Carol')
+    run('add', 'g')
+    run('commit', '-q', '-m', 'add g', author='Carol')
+    run('checkout', '-q', 'main')
+    write('f', 'main\n')
+    run('commit', '-q', '-am', 'main', author='Bob')
+    subprocess.run(['git', '-C', path, 'merge', '-q', 'side'], capture_output=True, env=env)
+    write('f', 'resolved\n')
+    run('commit', '-q', '-am', 'conflicted merge')
+    run('checkout', '-q', '-b', 'other', 'HEAD~1')
+    write('h', 'other\n')
+    run('add', 'h')
+    run('commit', '-q', '-m', 'other', author='Dave')
+    run('checkout', '-q', 'main')
+    run('merge', '-q', '--no-ff', '-m', 'clean merge', 'other')
+    run('commit', '-q', '--allow-empty', '-m', 'empty again', author='Bob')
+    root = git(path, 'rev-list', '--max-parents=0', 'HEAD').strip()
+    return path, root
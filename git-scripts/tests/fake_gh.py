@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the GitHub CLI in tests.
+
+Serves `gh api` requests from the JSON file named by $FAKE_GH_API, which
+maps API paths to an object or a list of items. Lists are filtered by the
+state and since parameters and split into per_page pages with Link
+headers; every page has an ETag derived from its content, and requests
+with a matching If-None-Match get a 304. A path listed under "_fail"
+with a page count fails after writing that many pages. Requested URLs
+are appended to $FAKE_GH_LOG.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from urllib.parse import parse_qsl, urlencode
+
+API_ROOT = 'https://api.github.com/'
+
+def page_of(items, params):
+    if params.get('state', 'all') != 'all':
+        items = [item for item in items if item.get('state') == params['state']]
+    if 'since' in params:
+        items = [item for item in items if item.get('updated_at', '') >= params['since']]
+    per_page = int(params.get('per_page', 30))
+    page = int(params.get('page', 1))
+    last = max(1, -(-len(items) // per_page))
+    return items[(page - 1) * per_page:page * per_page], page < last
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--version'] or args[:2] == ['auth', 'status']:
+        print('gh version 0.0.0 (fake)')
+        return 0
+    if args[:1] != ['api']:
+        print(f'fake gh: unsupported command {args}', file=sys.stderr)
+        return 1
+    url = args[1]
+    headers = dict(value.split(': ', 1) for flag, value in zip(args, args[1:]) if flag == '-H')
+    with open(os.environ['FAKE_GH_LOG'], 'a') as log:
+        log.write(' '.join([url] + [flag for flag in args[2:] if flag.startswith('--')]) + '\n')
+    with open(os.environ['FAKE_GH_API']) as f:
+        api = json.load(f)
+
+    path, _, query = url[len(API_ROOT):].partition('?') if url.startswith(API_ROOT) else url.partition('?')
+    params = dict(parse_qsl(query))
+    if path not in api:
+        print('gh: Not Found (HTTP 404)', file=sys.stderr)
+        return 1
+
+    pages = []
+    while True:
+        if not isinstance(api[path], list):
+            pages.append((api[path], None))
+            break
+        body, has_next = page_of(api[path], params)
+        next_url = None
+        if has_next:
+            params = dict(params, page=int(params.get('page', 1)) + 1)
+            next_url = f'{API_ROOT}{path}?{urlencode(params)}'
+        pages.append((body, next_url))
+        if not (has_next and '--paginate' in args):
+            break
+
+    if '--include' in args:
+        body, next_url = pages[0]
+        text = json.dumps(body)
+        etag = '"' + hashlib.sha1(text.encode()).hexdigest() + '"'
+        lines = ['HTTP/2.0 304 Not Modified' if headers.get('If-None-Match') == etag else 'HTTP/2.0 200 OK',
+                 f'Etag: {etag}']
+        if next_url:
+            lines.append(f'Link: <{next_url}>; rel="next"')
+        sys.stdout.write('\r\n'.join(lines) + '\r\n\r\n')
+        if lines[0].endswith('Not Modified'):
+            return 1
+        sys.stdout.write(text)
+        return 0
+    fail_after = api.get('_fail', {}).get(path)
+    for body, _ in pages[:fail_after]:
+        sys.stdout.write(json.dumps(body))
+    if fail_after is not None:
+        print('gh: Server Error (HTTP 502)', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+import json
+
+import benchmark
+from analyze_data import DataExplorer
+
+def test_issue_spans_match_the_timeline_events(tmp_path):
+    benchmark.generate_github_data(str(tmp_path), 500)
+    DataExplorer(data_dir=str(tmp_path)).run_analysis(['visualization'])
+    with open(tmp_path / 'visualization_timeline.json') as f, open(tmp_path / 'visualization_issues.json') as g:
+        timeline, spans = json.load(f), json.load(g)
+
+    # What the issues page used to rebuild from the events: the first dates and every label of an issue
+    replayed = {}
+    for event in timeline:
+        issue = replayed.setdefault(event['number'], {'created': None, 'closed': None, 'labels': set()})
+        issue[event['type']] = issue[event['type']] or event['date']
+        issue['labels'].update(event['labels'])
+    assert replayed == {
+        number: {'created': created, 'closed': closed, 'labels': {spans['labels'][i] for i in label_ids}}
+        for number, created, closed, label_ids in zip(spans['number'], spans['created'], spans['closed'],
+                                                      spans['issueLabels'])
+    }
@@ -0,0 +1,31 @@
+import sqlite3
+
+import pytest
+
+from commit_index import SCHEMA_VERSION, open_index
+from conftest import git
+
+@pytest.mark.parametrize('commit1, commit2', [
+    ('bench-start', 'main'), ('main~40', 'main~3'), ('main~1', 'main'), ('main', 'main~5'),
+    ('MERGE^2', 'main'), ('MERGE^1', 'MERGE'), ('MERGE^2', 'MERGE^1')
+])
+def test_range_matches_rev_list(synthetic_repo, tmp_path, monkeypatch, commit1, commit2):
+    monkeypatch.chdir(synthetic_repo)
+    merge = git(synthetic_repo, 'rev-list', '--merges', '-n1', 'main~30').strip()
+    commit1, commit2 = commit1.replace('MERGE', merge), commit2.replace('MERGE', merge)
+    with open_index(str(tmp_path / 'index.sqlite'), commit1, commit2) as index:
+        commits = [commit['hash'] for commit in index.commits_in_range(commit1, commit2)]
+    assert sorted(commits) == sorted(git(synthetic_repo, 'rev-list', f'{commit1}..{commit2}').split())
+
+def test_old_layout_is_rebuilt(synthetic_repo, tmp_path, monkeypatch):
+    monkeypatch.chdir(synthetic_repo)
+    path = str(tmp_path / 'index.sqlite')
+    db = sqlite3.connect(path)
+    db.execute('CREATE TABLE commits (id INTEGER PRIMARY KEY, hash TEXT UNIQUE NOT NULL)')
+    db.execute("INSERT INTO commits (hash) VALUES ('stale')")
+    db.commit()
+    db.close()
+    with open_index(path, 'main') as index:
+        assert index.lookup('stale') is None
+        assert len(index) == len(git(synthetic_repo, 'rev-list', 'main').split())
+        assert index.db.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
@@ -0,0 +1,122 @@
+import json
+import os
+
+import pytest
+
+from fetch_github_data import PROJECTIONS, GitHubDataFetcher, find_dataset, read_dataset
+
+FAKE_GH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_gh.py')
+REPO = 'repos/scala/scala3'
+
+def make_api(contributors=250):
+    return {
+        REPO: {'full_name': 'scala/scala3'},
+        f'{REPO}/issues': [],
+        f'{REPO}/pulls': [],
+        f'{REPO}/contributors': [{'login': f'user{i}', 'contributions': 1000 - i} for i in range(contributors)],
+        f'{REPO}/releases': [{'name': '3.0.0', 'tag_name': '3.0.0'}],
+        f'{REPO}/labels': [{'name': 'itype:bug', 'color': 'f00'}]
+    }
+
+@pytest.fixture
+def fake_api(tmp_path, monkeypatch):
+    """Write the API the fake gh serves; returns a function replacing it and the request log"""
+    api_file, log_file = tmp_path / 'api.json', tmp_path / 'requests.log'
+    monkeypatch.setenv('FAKE_GH_API', str(api_file))
+    monkeypatch.setenv('FAKE_GH_LOG', str(log_file))
+
+    def serve(api):
+        api_file.write_text(json.dumps(api))
+        log_file.write_text('')
+        return log_file
+    return serve
+
+def contributor_requests(log):
+    return [line for line in log.read_text().splitlines() if '/contributors' in line]
+
+def sync(output_dir):
+    fetcher = GitHubDataFetcher(output_dir=str(output_dir), gh=FAKE_GH, sync=True)
+    counts = fetcher.sync_all()
+    return counts, read_dataset(find_dataset(os.path.join(str(output_dir), 'scala3_contributors.json')))
+
+def test_sync_revalidates_every_page(fake_api, tmp_path):
+    api = make_api()
+    fake_api(api)
+    counts, contributors = sync(tmp_path / 'app')
+    assert counts['contributors'] == 250 and contributors == api[f'{REPO}/contributors']
+
+    # Only the last page changes
+    api[f'{REPO}/contributors'][240]['contributions'] = 1
+    log = fake_api(api)
+    _, contributors = sync(tmp_path / 'app')
+    assert contributors == api[f'{REPO}/contributors']
+    assert len(contributor_requests(log)) == 3
+    assert not any('--paginate' in line for line in contributor_requests(log))
+
+    log = fake_api(api)
+    state_file = tmp_path / 'app' / 'scala3_sync_state.json'
+    pages = json.loads(state_file.read_text())['conditional']['contributors']['pages']
+    _, contributors = sync(tmp_path / 'app')
+    assert contributors == api[f'{REPO}/contributors']
+    assert len(contributor_requests(log)) == 3
+    assert json.loads(state_file.read_text())['conditional']['contributors']['pages'] == pages
+
+def test_sync_follows_added_and_removed_pages(fake_api, tmp_path):
+    fake_api(make_api(contributors=150))
+    sync(tmp_path / 'app')
+    api = make_api(contributors=250)
+    fake_api(api)
+    counts, contributors = sync(tmp_path / 'app')
+    assert counts['contributors'] == 250 and contributors == api[f'{REPO}/contributors']
+    api = make_api(contributors=120)
+    fake_api(api)
+    counts, contributors = sync(tmp_path / 'app')
+    assert counts['contributors'] == 120 and contributors == api[f'{REPO}/contributors']
+
+def make_issue(number, state, user):
+    return {
+        'id': number, 'number': number, 'title': f'Issue {number}', 'state': state,
+        'created_at': f'2024-{number % 12 + 1:02d}-01T00:00:00Z', 'updated_at': '2024-12-01T00:00:00Z',
+        'closed_at': '2024-12-01T00:00:00Z' if state == 'closed' else None,
+        'labels': [{'name': 'itype:bug', 'color': 'f00'}] if number % 3 else [],
+        'assignees': [{'login': 'alice', 'id': 1}] if number % 2 else [],
+        'user': user, 'comments': number % 5, 'body': 'x' * number,
+        'milestone': {'title': '3.4.0', 'number': 7} if number % 4 == 0 else None
+    }
+
+@pytest.mark.parametrize('options', [
+    {'stream': True},
+    {'stream': True, 'project': True, 'compression': 'gzip'}
+], ids=['streaming', 'gzip-projected'])
+def test_fetch_modes_agree(fake_api, tmp_path, options):
+    api = make_api()
+    # A deleted account shows up as a null user
+    api[f'{REPO}/issues'] = [make_issue(n, 'open' if n % 3 else 'closed', None if n == 5 else {'login': f'user{n}'})
+                             for n in range(1, 260)]
+    fake_api(api)
+    buffered = GitHubDataFetcher(output_dir=str(tmp_path / 'buffered'), gh=FAKE_GH)
+    other = GitHubDataFetcher(output_dir=str(tmp_path / 'other'), gh=FAKE_GH, **options)
+    assert buffered.fetch_all_buffered() == other.fetch_all_streaming()
+
+    for name in ('scala3_open_issues.json', 'scala3_closed_issues.json'):
+        with open(tmp_path / 'buffered' / name) as f, open(tmp_path / 'other' / name) as g:
+            assert json.load(f) == json.load(g)
+    for name, kind in (('scala3_open_issues_raw', 'issues'), ('scala3_contributors', 'contributors')):
+        records, other_records = [read_dataset(find_dataset(str(tmp_path / directory / f'{name}.json')))
+                                  for directory in ('buffered', 'other')]
+        if options.get('project'):
+            records = [PROJECTIONS[kind](record) for record in records]
+        assert records == other_records
+
+def test_failed_stream_keeps_last_dataset(fake_api, tmp_path):
+    api = make_api()
+    fake_api(api)
+    fetcher = GitHubDataFetcher(output_dir=str(tmp_path), gh=FAKE_GH, stream=True, compression='gzip')
+    assert fetcher.save_ndjson(fetcher.fetch_contributors(stream=True), 'scala3_contributors.ndjson') == 250
+
+    api['_fail'] = {f'{REPO}/contributors': 1}
+    fake_api(api)
+    assert fetcher.save_ndjson(fetcher.fetch_contributors(stream=True), 'scala3_contributors.ndjson') == 0
+    path = find_dataset(str(tmp_path / 'scala3_contributors.json'))
+    assert read_dataset(path) == api[f'{REPO}/contributors']
+    assert sorted(os.listdir(tmp_path)) == ['api.json', 'requests.log', 'scala3_contributors.ndjson.gz']
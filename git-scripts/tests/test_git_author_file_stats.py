@@ -0,0 +1,23 @@
+from conftest import git
+from git_author_file_stats import iter_commit_author_files
+
+def show_author_files(repo, start, end):
+    """(author, files) of every commit in start..end from one `git show` per commit"""
+    records = []
+    for commit in git(repo, 'rev-list', f'{start}..{end}').split():
+        lines = git(repo, 'show', '--pretty=format:%an', '--name-only', commit).splitlines()
+        records.append((lines[0].strip(), [line for line in lines[1:] if line]))
+    return records
+
+def test_merges_match_git_show(merge_repo, monkeypatch):
+    repo, root = merge_repo
+    monkeypatch.chdir(repo)
+    records = list(iter_commit_author_files(root, 'HEAD'))
+    assert records == show_author_files(repo, root, 'HEAD')
+    assert ('Alice', ['f']) in records  # The conflicted merge
+    assert ('Alice', []) in records  # The clean merge
+
+def test_synthetic_history_matches_git_show(synthetic_repo, monkeypatch):
+    monkeypatch.chdir(synthetic_repo)
+    records = list(iter_commit_author_files('bench-start', 'main'))
+    assert records == show_author_files(synthetic_repo, 'bench-start', 'main')
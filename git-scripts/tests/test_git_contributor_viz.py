@@ -0,0 +1,70 @@
+import subprocess
+
+import pytest
+
+from conftest import run_script
+from git_contributor_viz import create_visualization_data, state_path
+
+def test_tied_contributors_sort_by_name():
+    stats = {'2020-01': {'Bob': {'commits': 5, 'lines_changed': 1}, 'Alice': {'commits': 2, 'lines_changed': 9}},
+             '2020-02': {'Carol': {'commits': 6, 'lines_changed': 3}, 'Alice': {'commits': 3, 'lines_changed': 1}}}
+    reordered = {month: dict(reversed(list(authors.items()))) for month, authors in reversed(list(stats.items()))}
+    for monthly_stats in (stats, reordered):
+        viz_data = create_visualization_data(monthly_stats, min_commits=1)
+        assert [c['name'] for c in viz_data['contributors']] == ['Carol', 'Alice', 'Bob']
+
+@pytest.mark.parametrize('output_format', ['dense', 'sparse'])
+@pytest.mark.parametrize('previous_end', ['main~60', 'main~20'])
+def test_incremental_matches_full_run(synthetic_repo, tmp_path, output_format, previous_end):
+    full, incremental = str(tmp_path / 'full.json'), str(tmp_path / 'incremental.json')
+    run_script('git_contributor_viz.py', 'bench-start', 'main', '-o', full, '--format', output_format,
+               cwd=synthetic_repo)
+    run_script('git_contributor_viz.py', 'bench-start', previous_end, '-o', incremental, '--format', output_format,
+               cwd=synthetic_repo)
+    run_script('git_contributor_viz.py', 'bench-start', 'main', '-o', incremental, '--format', output_format,
+               '--incremental', cwd=synthetic_repo)
+    with open(full, 'rb') as f, open(incremental, 'rb') as g:
+        assert f.read() == g.read()
+
+@pytest.mark.parametrize('changed', [['main~100'], ['bench-start', '--min-commits', '2']],
+                         ids=['start-commit', 'min-commits'])
+def test_incremental_with_other_options_runs_full_range(synthetic_repo, tmp_path, changed):
+    full, incremental = str(tmp_path / 'full.json'), str(tmp_path / 'incremental.json')
+    run_script('git_contributor_viz.py', changed[0], 'main', '-o', full, *changed[1:], cwd=synthetic_repo)
+    run_script('git_contributor_viz.py', 'bench-start', 'main~20', '-o', incremental, cwd=synthetic_repo)
+    result = run_script('git_contributor_viz.py', changed[0], 'main', '-o', incremental, *changed[1:],
+                        '--incremental', cwd=synthetic_repo)
+    assert 'processing the full range' in result
+    with open(full, 'rb') as f, open(incremental, 'rb') as g:
+        assert f.read() == g.read()
+
+# 149 commits: three shards of 50, two of 75, or too few for a second shard of 100
+@pytest.mark.parametrize('jobs, min_shard_commits', [('3', '10'), ('2', '10'), ('3', '100')])
+def test_parallel_matches_serial_run(synthetic_repo, tmp_path, jobs, min_shard_commits):
+    serial, parallel = str(tmp_path / 'serial.json'), str(tmp_path / 'parallel.json')
+    run_script('git_contributor_viz.py', 'bench-start', 'main', '-o', serial, cwd=synthetic_repo)
+    run_script('git_contributor_viz.py', 'bench-start', 'main', '-o', parallel, '-j', jobs,
+               '--min-shard-commits', min_shard_commits, cwd=synthetic_repo)
+    with open(serial, 'rb') as f, open(parallel, 'rb') as g:
+        assert f.read() == g.read()
+    with open(state_path(serial), 'rb') as f, open(state_path(parallel), 'rb') as g:
+        assert f.read() == g.read()
+
+@pytest.mark.parametrize('window', [['--since', '2018-03-01'], ['--since', '2018-02-10', '--until', '2018-05-20T12:00']])
+def test_index_applies_the_same_date_window(synthetic_repo, tmp_path, window):
+    outputs = {}
+    for name, options in (('git', []), ('parallel', ['-j', '3', '--min-shard-commits', '10']), ('index', ['--index', str(tmp_path / 'index.sqlite')])):
+        outputs[name] = str(tmp_path / f'{name}.json')
+        run_script('git_contributor_viz.py', 'bench-start', 'main', '-o', outputs[name], *window, *options,
+                   cwd=synthetic_repo)
+    with open(outputs['git'], 'rb') as f:
+        expected = f.read()
+    for name in ('parallel', 'index'):
+        with open(outputs[name], 'rb') as f:
+            assert f.read() == expected, name
+
+def test_index_rejects_jobs(synthetic_repo, tmp_path):
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        run_script('git_contributor_viz.py', 'bench-start', 'main', '--index', str(tmp_path / 'index.sqlite'),
+                   '-j', '2', cwd=synthetic_repo)
+    assert '--index cannot be combined with --jobs' in error.value.stdout
@@ -0,0 +1,30 @@
+import argparse
+
+import pytest
+
+import pipeline
+from pipeline import PUBLISHED_FILES, Stage, build_stages, check_stages, publish_timeline, run_pipeline
+
+def test_stages_are_valid():
+    stages = build_stages(argparse.Namespace(fetch='sync', repo='.', range=['start', 'end']))
+    contributors = next(stage for stage in stages if stage.name == 'contributors')
+    assert contributors.run[contributors.run.index('--format') + 1] == 'sparse'
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match='unknown stage: missing'):
+        check_stages([Stage('a', ['true'], deps=['missing'])])
+
+def test_dependency_cycle_is_rejected(tmp_path):
+    stages = [Stage('a', ['true'], deps=['b']), Stage('b', ['true'], deps=['a']), Stage('c', ['true'])]
+    with pytest.raises(ValueError, match='cycle between stages: a, b'):
+        check_stages(stages)
+    with pytest.raises(ValueError, match='cannot start'):
+        run_pipeline(stages, {}, log_dir=str(tmp_path))
+
+def test_publish_copies_only_the_imported_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'ROOT', str(tmp_path))
+    (tmp_path / 'app').mkdir()
+    for name in PUBLISHED_FILES + ['visualization_timeline.json']:
+        (tmp_path / 'app' / name).write_text(name)
+    publish_timeline()
+    assert sorted(path.name for path in (tmp_path / 'data' / 'timeline').iterdir()) == sorted(PUBLISHED_FILES)